@@ -4,14 +4,13 @@
 # * Agents: Data Cleaning Agent
 
 # Libraries
-from typing import TypedDict, Annotated, Sequence, Literal
+from typing import TypedDict, Annotated, Sequence, Literal, Union
 import operator
 
 from langchain.prompts import PromptTemplate
 from langchain_core.messages import BaseMessage
 
 from langgraph.types import Command
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.types import Checkpointer
 
 import os
@@ -38,6 +37,10 @@ from ai_data_science_team.utils.regex import (
 )
 from ai_data_science_team.tools.dataframe import get_dataframe_summary
 from ai_data_science_team.utils.logging import log_ai_function
+from ai_data_science_team.utils.llm_cache import with_llm_cache
+from ai_data_science_team.utils.checkpoint import get_default_checkpointer
+from ai_data_science_team.utils.prompt_caching import prefix_cached_messages
+from ai_data_science_team.utils.dataset import DatasetHandle, to_dataframe, to_dataset
 
 # Setup
 AGENT_NAME = "data_cleaning_agent"
@@ -88,6 +91,15 @@ class DataCleaningAgent(BaseAgent):
         If True, skips the step that provides code explanations. Defaults to False.
     checkpointer : langgraph.types.Checkpointer, optional
         Checkpointer to save and load the agent's state. Defaults to None.
+    approximate : bool, optional
+        If True, datasets with more than 100,000 rows are summarized with approximate statistics
+        (HyperLogLog distinct counts, sampled quantiles and preview rows) to reduce latency on very
+        large data. Defaults to False.
+    llm_cache : bool or langchain_core.caches.BaseCache, optional
+        Caches the model's responses, so repeated prompts (e.g. the same question on the same data) are answered
+        without calling the model. True uses the process-wide `LLMResponseCache` (see
+        `ai_data_science_team.utils.llm_cache`); a cache instance, e.g. an `LLMResponseCache` persisted to SQLite, is
+        used as is. Defaults to None (no caching).
 
     Methods
     -------
@@ -163,7 +175,9 @@ class DataCleaningAgent(BaseAgent):
         human_in_the_loop=False, 
         bypass_recommended_steps=False, 
         bypass_explain_code=False,
-        checkpointer: Checkpointer = None
+        checkpointer: Checkpointer = None,
+        approximate=False,
+        llm_cache=None,
     ):
         self._params = {
             "model": model,
@@ -176,7 +190,9 @@ class DataCleaningAgent(BaseAgent):
             "human_in_the_loop": human_in_the_loop,
             "bypass_recommended_steps": bypass_recommended_steps,
             "bypass_explain_code": bypass_explain_code,
-            "checkpointer": checkpointer
+            "checkpointer": checkpointer,
+            "approximate": approximate,
+            "llm_cache": llm_cache,
         }
         self._compiled_graph = self._make_compiled_graph()
         self.response = None
@@ -211,7 +227,7 @@ class DataCleaningAgent(BaseAgent):
         """
         response = await self._compiled_graph.ainvoke({
             "user_instructions": user_instructions,
-            "data_raw": data_raw.to_dict(),
+            "data_raw": to_dataset(data_raw),
             "max_retries": max_retries,
             "retry_count": retry_count,
         }, **kwargs)
@@ -241,13 +257,115 @@ class DataCleaningAgent(BaseAgent):
         """
         response = self._compiled_graph.invoke({
             "user_instructions": user_instructions,
-            "data_raw": data_raw.to_dict(),
+            "data_raw": to_dataset(data_raw),
             "max_retries": max_retries,
             "retry_count": retry_count,
         },**kwargs)
         self.response = response
         return None
 
+    def replay(self, data_raw, function: str=None, chunk_size: int=None, executor=None):
+        """
+        Re-runs the data cleaner function on new data without calling the LLM.
+
+        The function is taken from `function` if given, else from the last response, else from
+        the logged file (`log_path` / `file_name`), so a function generated and logged once can be
+        reused by batch jobs from a fresh agent instance.
+
+        Parameters
+        ----------
+        data_raw : pd.DataFrame
+            The new dataset.
+        function : str, optional
+            The function's source code, or a path to a `.py` file containing it.
+        chunk_size : int, optional
+            If given, a single dataset is processed in chunks of this many rows and the results are
+            concatenated, bounding peak memory on large inputs. Only appropriate when the function
+            is row-wise (e.g. no dataset-level imputation, deduplication or encoding).
+        executor : SandboxExecutor, optional
+            Runs the function in a sandboxed worker process. Defaults to the default executor, if any.
+
+        Returns
+        -------
+        pd.DataFrame
+            The cleaned data.
+        """
+        return self._replay(
+            data_raw,
+            function=function,
+            code_key="data_cleaner_function",
+            path_key="data_cleaner_function_path",
+            log_path=self._params.get("log_path") or LOG_PATH,
+            chunk_size=chunk_size,
+            executor=executor,
+            error_message_prefix="An error occurred during data cleaning: ",
+        )
+
+    def invoke_agent_on_file(
+        self,
+        source: str,
+        output_path: str,
+        user_instructions: str=None,
+        sample_rows: int=10_000,
+        chunk_size: int=100_000,
+        non_row_local: str="raise",
+        max_retries: int=3,
+        retry_count: int=0,
+        read_kwargs: dict=None,
+        **kwargs
+    ):
+        """
+        Runs the agent on a CSV or Parquet file that may be larger than memory: the data_cleaner function
+        is generated on the first `sample_rows` rows, then streamed over the whole file in chunks,
+        writing the result to `output_path` as Parquet.
+
+        Returns the streaming statistics, or None if the function failed on the sample. See
+        `BaseAgent._invoke_agent_on_file()` for the parameters.
+        """
+        return self._invoke_agent_on_file(
+            source,
+            output_path,
+            error_key="data_cleaner_error",
+            sample_rows=sample_rows,
+            chunk_size=chunk_size,
+            non_row_local=non_row_local,
+            read_kwargs=read_kwargs,
+            user_instructions=user_instructions,
+            max_retries=max_retries,
+            retry_count=retry_count,
+            **kwargs
+        )
+
+    def replay_file(
+        self,
+        source: str,
+        output_path: str,
+        function: str=None,
+        chunk_size: int=100_000,
+        non_row_local: str="raise",
+        executor=None,
+        **read_kwargs
+    ):
+        """
+        Streams a CSV or Parquet file through the data_cleaner function in chunks without calling
+        the LLM, writing the result incrementally to a Parquet file.
+
+        Returns the streaming statistics. See `BaseAgent._replay_file()` for the parameters and how
+        functions that are not row-local are handled.
+        """
+        return self._replay_file(
+            source,
+            output_path,
+            function=function,
+            code_key="data_cleaner_function",
+            path_key="data_cleaner_function_path",
+            log_path=self._params.get("log_path") or LOG_PATH,
+            chunk_size=chunk_size,
+            non_row_local=non_row_local,
+            executor=executor,
+            **read_kwargs
+        )
+
     def get_workflow_summary(self, markdown=False):
         """
         Retrieves the agent's workflow summary, if logging is enabled.
@@ -282,14 +400,14 @@ Function Name: {self.response.get('data_cleaner_function_name')}
         Retrieves the cleaned data stored after running invoke_agent or clean_data methods.
         """
         if self.response:
-            return pd.DataFrame(self.response.get("data_cleaned"))
+            return to_dataframe(self.response.get("data_cleaned"))
         
     def get_data_raw(self):
         """
         Retrieves the raw data.
         """
         if self.response:
-            return pd.DataFrame(self.response.get("data_raw"))
+            return to_dataframe(self.response.get("data_raw"))
     
     def get_data_cleaner_function(self, markdown=False):
         """
@@ -326,7 +444,9 @@ def make_data_cleaning_agent(
     human_in_the_loop=False, 
     bypass_recommended_steps=False, 
     bypass_explain_code=False,
-    checkpointer: Checkpointer = None
+    checkpointer: Checkpointer = None,
+    approximate=False,
+    llm_cache=None,
 ):
     """
     Creates a data cleaning agent that can be run on a dataset. The agent can be used to clean a dataset in a variety of
@@ -377,11 +497,21 @@ def make_data_cleaning_agent(
         Bypass the code explanation step, by default False.
     checkpointer : langgraph.types.Checkpointer, optional
         Checkpointer to save and load the agent's state. Defaults to None.
+    approximate : bool, optional
+        If True, datasets with more than 100,000 rows are summarized with approximate statistics
+        (HyperLogLog distinct counts, sampled quantiles and preview rows) to reduce latency on very
+        large data. Defaults to False.
+    llm_cache : bool or langchain_core.caches.BaseCache, optional
+        Caches the model's responses, so repeated prompts (e.g. the same question on the same data) are answered
+        without calling the model. True uses the process-wide `LLMResponseCache` (see
+        `ai_data_science_team.utils.llm_cache`); a cache instance, e.g. an `LLMResponseCache` persisted to SQLite, is
+        used as is. Defaults to None (no caching).
         
     Examples
     -------
     ``` python
     import pandas as pd
+    from ai_data_science_team.utils.dataset import to_dataframe
     from langchain_openai import ChatOpenAI
     from ai_data_science_team.agents import data_cleaning_agent
 
@@ -398,7 +528,7 @@ def make_data_cleaning_agent(
         "retry_count":0
     })
 
-    pd.DataFrame(response['data_cleaned'])
+    to_dataframe(response['data_cleaned'])
     ```
 
     Returns
@@ -406,12 +536,12 @@ def make_data_cleaning_agent(
     app : langchain.graphs.CompiledStateGraph
         The data cleaning agent as a state graph.
     """
-    llm = model
+    llm = with_llm_cache(model, llm_cache)
     
     if human_in_the_loop:
         if checkpointer is None:
-            print("Human in the loop is enabled. A checkpointer is required. Setting to MemorySaver().")
-            checkpointer = MemorySaver()
+            checkpointer = get_default_checkpointer()
+            print(f"Human in the loop is enabled. A checkpointer is required. Setting to {type(checkpointer).__name__}().")
     
     # Human in th loop requires recommended steps
     if bypass_recommended_steps and human_in_the_loop:
@@ -425,13 +555,21 @@ def make_data_cleaning_agent(
         if not os.path.exists(log_path):
             os.makedirs(log_path)    
 
+    # Stable prompt prefix shared by the recommend, create and fix calls (provider prompt caching)
+    agent_context = """
+    You are a Data Cleaning Agent. You recommend data cleaning steps, write Python data cleaning functions and fix them when they fail, for the datasets summarized below.
+    """
+    
+    def prompt_prefix(all_datasets_summary):
+        return [agent_context, "Below are summaries of all datasets provided:\n\n" + (all_datasets_summary or "")]
+
     # Define GraphState for the router
     class GraphState(TypedDict):
         messages: Annotated[Sequence[BaseMessage], operator.add]
         user_instructions: str
         recommended_steps: str
-        data_raw: dict
-        data_cleaned: dict
+        data_raw: Union[dict, DatasetHandle]
+        data_cleaned: Union[dict, DatasetHandle]
         all_datasets_summary: str
         data_cleaner_function: str
         data_cleaner_function_path: str
@@ -453,7 +591,7 @@ def make_data_cleaning_agent(
         # Prompt to get recommended steps from the LLM
         recommend_steps_prompt = PromptTemplate(
             template="""
-            You are a Data Cleaning Expert. Given the following information about the data, 
+            You are a Data Cleaning Expert. Given the information about the data above, 
             recommend a series of numbered steps to take to clean and preprocess it. 
             The steps should be tailored to the data characteristics and should be helpful 
             for a data cleaning agent that will be implemented.
@@ -483,31 +621,30 @@ def make_data_cleaning_agent(
             Previously Recommended Steps (if any):
             {recommended_steps}
 
-            Below are summaries of all datasets provided:
-            {all_datasets_summary}
-
             Return steps as a numbered list. You can return short code snippets to demonstrate actions. But do not return a fully coded solution. The code will be generated separately by a Coding Agent.
             
             Avoid these:
             1. Do not include steps to save files.
             2. Do not include unrelated user instructions that are not related to the data cleaning.
             """,
-            input_variables=["user_instructions", "recommended_steps", "all_datasets_summary"]
+            input_variables=["user_instructions", "recommended_steps"]
         )
 
         data_raw = state.get("data_raw")
-        df = pd.DataFrame.from_dict(data_raw)
+        df = to_dataframe(data_raw)
 
-        all_datasets_summary = get_dataframe_summary([df], n_sample=n_samples)
+        all_datasets_summary = get_dataframe_summary([df], n_sample=n_samples, approximate=approximate)
         
         all_datasets_summary_str = "\n\n".join(all_datasets_summary)
 
-        steps_agent = recommend_steps_prompt | llm
-        recommended_steps = steps_agent.invoke({
-            "user_instructions": state.get("user_instructions"),
-            "recommended_steps": state.get("recommended_steps"),
-            "all_datasets_summary": all_datasets_summary_str
-        }) 
+        recommended_steps = llm.invoke(prefix_cached_messages(
+            llm,
+            prefix=prompt_prefix(all_datasets_summary_str),
+            suffix=recommend_steps_prompt.format(
+                user_instructions=state.get("user_instructions"),
+                recommended_steps=state.get("recommended_steps"),
+            ),
+        ))
         
         return {
             "recommended_steps": format_recommended_steps(recommended_steps.content.strip(), heading="# Recommended Data Cleaning Steps:"),
@@ -522,9 +659,9 @@ def make_data_cleaning_agent(
             print(format_agent_name(AGENT_NAME))
             
             data_raw = state.get("data_raw")
-            df = pd.DataFrame.from_dict(data_raw)
+            df = to_dataframe(data_raw)
 
-            all_datasets_summary = get_dataframe_summary([df], n_sample=n_samples)
+            all_datasets_summary = get_dataframe_summary([df], n_sample=n_samples, approximate=approximate)
             
             all_datasets_summary_str = "\n\n".join(all_datasets_summary)
         else:
@@ -540,9 +677,7 @@ def make_data_cleaning_agent(
 
             You can use Pandas, Numpy, and Scikit Learn libraries to clean the data.
 
-            Below are summaries of all datasets provided. Use this information about the data to help determine how to clean the data:
-
-            {all_datasets_summary}
+            Use the dataset summaries above to help determine how to clean the data.
 
             Return Python code in ```python``` format with a single function definition, {function_name}(data_raw), that includes all imports inside the function.
 
@@ -559,16 +694,19 @@ def make_data_cleaning_agent(
             Always ensure that when assigning the output of fit_transform() from SimpleImputer to a Pandas DataFrame column, you call .ravel() or flatten the array, because fit_transform() returns a 2D array while a DataFrame column is 1D.
             
             """,
-            input_variables=["recommended_steps", "all_datasets_summary", "function_name"]
+            input_variables=["recommended_steps", "function_name"]
         )
 
-        data_cleaning_agent = data_cleaning_prompt | llm | PythonOutputParser()
+        data_cleaning_agent = llm | PythonOutputParser()
         
-        response = data_cleaning_agent.invoke({
-            "recommended_steps": state.get("recommended_steps"),
-            "all_datasets_summary": all_datasets_summary_str,
-            "function_name": function_name
-        })
+        response = data_cleaning_agent.invoke(prefix_cached_messages(
+            llm,
+            prefix=prompt_prefix(all_datasets_summary_str),
+            suffix=data_cleaning_prompt.format(
+                recommended_steps=state.get("recommended_steps"),
+                function_name=function_name,
+            ),
+        ))
         
         response = relocate_imports_inside_function(response)
         response = add_comments_to_top(response, agent_name=AGENT_NAME)
@@ -625,8 +763,8 @@ def make_data_cleaning_agent(
             error_key="data_cleaner_error",
             code_snippet_key="data_cleaner_function",
             agent_function_name=state.get("data_cleaner_function_name"),
-            pre_processing=lambda data: pd.DataFrame.from_dict(data),
-            post_processing=lambda df: df.to_dict() if isinstance(df, pd.DataFrame) else df,
+            pre_processing=lambda data: to_dataframe(data, copy=True),
+            post_processing=lambda df: to_dataset(df) if isinstance(df, pd.DataFrame) else df,
             error_message_prefix="An error occurred during data cleaning: "
         )
         
@@ -655,6 +793,7 @@ def make_data_cleaning_agent(
             log=log,
             file_path=state.get("data_cleaner_function_path"),
             function_name=state.get("data_cleaner_function_name"),
+            prompt_prefix=prompt_prefix(state.get("all_datasets_summary")),
         )
     
     # Final reporting node
@@ -18,6 +18,8 @@ from langgraph.graph import START, END, StateGraph
 
 from ai_data_science_team.templates import BaseAgent
 from ai_data_science_team.utils.regex import format_agent_name
+from ai_data_science_team.utils.llm_cache import with_llm_cache
+from ai_data_science_team.utils.metrics import instrument_graph
 from ai_data_science_team.tools.data_loader import (
     load_directory,
     load_file,
@@ -53,6 +55,11 @@ class DataLoaderToolsAgent(BaseAgent):
         Additional keyword arguments to pass to the invoke method of the react agent.
     checkpointer : langgraph.types.Checkpointer
         A checkpointer to use for saving and loading the agent's state.
+    llm_cache : bool or langchain_core.caches.BaseCache, optional
+        Caches the model's responses, so repeated prompts (e.g. the same question on the same data) are answered
+        without calling the model. True uses the process-wide `LLMResponseCache` (see
+        `ai_data_science_team.utils.llm_cache`); a cache instance, e.g. an `LLMResponseCache` persisted to SQLite, is
+        used as is. Defaults to None (no caching).
         
     Methods:
     --------
@@ -77,12 +84,14 @@ class DataLoaderToolsAgent(BaseAgent):
         create_react_agent_kwargs: Optional[Dict]={},
         invoke_react_agent_kwargs: Optional[Dict]={},
         checkpointer: Optional[Checkpointer]=None,
+        llm_cache=None,
     ):
         self._params = {
             "model": model,
             "create_react_agent_kwargs": create_react_agent_kwargs,
             "invoke_react_agent_kwargs": invoke_react_agent_kwargs,
             "checkpointer": checkpointer,
+            "llm_cache": llm_cache,
         }
         self._compiled_graph = self._make_compiled_graph()
         self.response = None
@@ -194,6 +203,7 @@ def make_data_loader_tools_agent(
     create_react_agent_kwargs: Optional[Dict]={},
     invoke_react_agent_kwargs: Optional[Dict]={},
     checkpointer: Optional[Checkpointer]=None,
+    llm_cache=None,
 ):
     """
     Creates a Data Loader Agent that can interact with data loading tools.
@@ -208,6 +218,11 @@ def make_data_loader_tools_agent(
         Additional keyword arguments to pass to the invoke method of the react agent.
     checkpointer : langgraph.types.Checkpointer
         A checkpointer to use for saving and loading the agent's state.
+    llm_cache : bool or langchain_core.caches.BaseCache, optional
+        Caches the model's responses, so repeated prompts (e.g. the same question on the same data) are answered
+        without calling the model. True uses the process-wide `LLMResponseCache` (see
+        `ai_data_science_team.utils.llm_cache`); a cache instance, e.g. an `LLMResponseCache` persisted to SQLite, is
+        used as is. Defaults to None (no caching).
     
     Returns:
     --------
@@ -215,6 +230,8 @@ def make_data_loader_tools_agent(
         An agent that can interact with data loading tools.
     """
     
+    llm = with_llm_cache(model, llm_cache)
+    
     class GraphState(AgentState):
         internal_messages: Annotated[Sequence[BaseMessage], operator.add]
         user_instructions: str
@@ -233,7 +250,7 @@ def make_data_loader_tools_agent(
         )
         
         data_loader_agent = create_react_agent(
-            model, 
+            llm, 
             tools=tool_node, 
             state_schema=GraphState,
             checkpointer=checkpointer,
@@ -286,10 +303,10 @@ def make_data_loader_tools_agent(
     workflow.add_edge(START, "data_loader_agent")
     workflow.add_edge("data_loader_agent", END)
     
-    app = workflow.compile(
+    app = instrument_graph(workflow.compile(
         checkpointer=checkpointer,
         name=AGENT_NAME,
-    )
+    ))
 
     return app
 
@@ -6,14 +6,13 @@
 
 
 # Libraries
-from typing import TypedDict, Annotated, Sequence, Literal
+from typing import TypedDict, Annotated, Sequence, Literal, Union
 import operator
 
 from langchain.prompts import PromptTemplate
 from langchain_core.messages import BaseMessage
 
 from langgraph.types import Command
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.types import Checkpointer
 
 import os
@@ -40,7 +39,10 @@ from ai_data_science_team.utils.regex import (
 )
 from ai_data_science_team.tools.dataframe import get_dataframe_summary
 from ai_data_science_team.utils.logging import log_ai_function
+from ai_data_science_team.utils.llm_cache import with_llm_cache
+from ai_data_science_team.utils.checkpoint import get_default_checkpointer
 from ai_data_science_team.utils.plotly import plotly_from_dict
+from ai_data_science_team.utils.dataset import DatasetHandle, to_dataframe, to_dataset
 
 # Setup
 AGENT_NAME = "data_visualization_agent"
@@ -88,6 +90,15 @@ class DataVisualizationAgent(BaseAgent):
         If True, skips the step that provides code explanations. Defaults to False.
     checkpointer : langgraph.types.Checkpointer
         A checkpointer to use for saving and loading the agent
+    approximate : bool, optional
+        If True, datasets with more than 100,000 rows are summarized with approximate statistics
+        (HyperLogLog distinct counts, sampled quantiles and preview rows) to reduce latency on very
+        large data. Defaults to False.
+    llm_cache : bool or langchain_core.caches.BaseCache, optional
+        Caches the model's responses, so repeated prompts (e.g. the same question on the same data) are answered
+        without calling the model. True uses the process-wide `LLMResponseCache` (see
+        `ai_data_science_team.utils.llm_cache`); a cache instance, e.g. an `LLMResponseCache` persisted to SQLite, is
+        used as is. Defaults to None (no caching).
 
     Methods
     -------
@@ -166,6 +177,8 @@ class DataVisualizationAgent(BaseAgent):
         bypass_recommended_steps=False, 
         bypass_explain_code=False,
         checkpointer=None,
+        approximate=False,
+        llm_cache=None,
     ):
         self._params = {
             "model": model,
@@ -179,6 +192,8 @@ class DataVisualizationAgent(BaseAgent):
             "bypass_recommended_steps": bypass_recommended_steps,
             "bypass_explain_code": bypass_explain_code,
             "checkpointer": checkpointer,
+            "approximate": approximate,
+            "llm_cache": llm_cache,
         }
         self._compiled_graph = self._make_compiled_graph()
         self.response = None
@@ -225,7 +240,7 @@ class DataVisualizationAgent(BaseAgent):
         """
         response = await self._compiled_graph.ainvoke({
             "user_instructions": user_instructions,
-            "data_raw": data_raw.to_dict(),
+            "data_raw": to_dataset(data_raw),
             "max_retries": max_retries,
             "retry_count": retry_count,
         }, **kwargs)
@@ -256,13 +271,45 @@ class DataVisualizationAgent(BaseAgent):
         """
         response = self._compiled_graph.invoke({
             "user_instructions": user_instructions,
-            "data_raw": data_raw.to_dict(),
+            "data_raw": to_dataset(data_raw),
             "max_retries": max_retries,
             "retry_count": retry_count,
         }, **kwargs)
         self.response = response
         return None
 
+    def replay(self, data_raw, function: str=None, executor=None):
+        """
+        Re-runs the data visualization function on new data without calling the LLM.
+
+        The function is taken from `function` if given, else from the last response, else from
+        the logged file (`log_path` / `file_name`), so a function generated and logged once can be
+        reused by batch jobs from a fresh agent instance.
+
+        Parameters
+        ----------
+        data_raw : pd.DataFrame
+            The new dataset.
+        function : str, optional
+            The function's source code, or a path to a `.py` file containing it.
+        executor : SandboxExecutor, optional
+            Runs the function in a sandboxed worker process. Defaults to the default executor, if any.
+
+        Returns
+        -------
+        dict
+            The plotly figure as a dictionary.
+        """
+        return self._replay(
+            data_raw,
+            function=function,
+            code_key="data_visualization_function",
+            path_key="data_visualization_function_path",
+            log_path=self._params.get("log_path") or LOG_PATH,
+            executor=executor,
+            error_message_prefix="An error occurred during data visualization: ",
+        )
+
     def get_workflow_summary(self, markdown=False):
         """
         Retrieves the agent's workflow summary, if logging is enabled.
@@ -314,8 +361,8 @@ Function Name: {self.response.get('data_visualization_function_name')}
         pd.DataFrame or None
             The raw dataset as a DataFrame if available, otherwise None.
         """
-        if self.response and self.response.get("data_raw"):
-            return pd.DataFrame(self.response.get("data_raw"))
+        if self.response and self.response.get("data_raw") is not None:
+            return to_dataframe(self.response.get("data_raw"))
         return None
 
     def get_data_visualization_function(self, markdown=False):
@@ -392,6 +439,8 @@ def make_data_visualization_agent(
     bypass_recommended_steps=False, 
     bypass_explain_code=False,
     checkpointer=None,
+    approximate=False,
+    llm_cache=None,
 ):
     """
     Creates a data visualization agent that can generate Plotly charts based on user-defined instructions or
@@ -431,6 +480,15 @@ def make_data_visualization_agent(
         If True, skips the step that provides code explanations. Defaults to False.
     checkpointer : langgraph.types.Checkpointer
         A checkpointer to use for saving and loading the agent
+    approximate : bool, optional
+        If True, datasets with more than 100,000 rows are summarized with approximate statistics
+        (HyperLogLog distinct counts, sampled quantiles and preview rows) to reduce latency on very
+        large data. Defaults to False.
+    llm_cache : bool or langchain_core.caches.BaseCache, optional
+        Caches the model's responses, so repeated prompts (e.g. the same question on the same data) are answered
+        without calling the model. True uses the process-wide `LLMResponseCache` (see
+        `ai_data_science_team.utils.llm_cache`); a cache instance, e.g. an `LLMResponseCache` persisted to SQLite, is
+        used as is. Defaults to None (no caching).
 
     Examples
     --------
@@ -461,12 +519,12 @@ def make_data_visualization_agent(
         The data visualization agent as a state graph.
     """
     
-    llm = model
+    llm = with_llm_cache(model, llm_cache)
     
     if human_in_the_loop:
         if checkpointer is None:
-            print("Human in the loop is enabled. A checkpointer is required. Setting to MemorySaver().")
-            checkpointer = MemorySaver()
+            checkpointer = get_default_checkpointer()
+            print(f"Human in the loop is enabled. A checkpointer is required. Setting to {type(checkpointer).__name__}().")
     
     # Human in th loop requires recommended steps
     if bypass_recommended_steps and human_in_the_loop:
@@ -486,7 +544,7 @@ def make_data_visualization_agent(
         user_instructions: str
         user_instructions_processed: str
         recommended_steps: str
-        data_raw: dict
+        data_raw: Union[dict, DatasetHandle]
         plotly_graph: dict
         all_datasets_summary: str
         data_visualization_function: str
@@ -559,9 +617,9 @@ def make_data_visualization_agent(
         )
         
         data_raw = state.get("data_raw")
-        df = pd.DataFrame.from_dict(data_raw)
+        df = to_dataframe(data_raw)
 
-        all_datasets_summary = get_dataframe_summary([df], n_sample=n_samples, skip_stats=False)
+        all_datasets_summary = get_dataframe_summary([df], n_sample=n_samples, approximate=approximate, skip_stats=False)
         
         all_datasets_summary_str = "\n\n".join(all_datasets_summary)
 
@@ -587,9 +645,9 @@ def make_data_visualization_agent(
             print(format_agent_name(AGENT_NAME))
             
             data_raw = state.get("data_raw")
-            df = pd.DataFrame.from_dict(data_raw)
+            df = to_dataframe(data_raw)
 
-            all_datasets_summary = get_dataframe_summary([df], n_sample=n_samples, skip_stats=False)
+            all_datasets_summary = get_dataframe_summary([df], n_sample=n_samples, approximate=approximate, skip_stats=False)
             
             all_datasets_summary_str = "\n\n".join(all_datasets_summary)
             
@@ -707,7 +765,7 @@ def make_data_visualization_agent(
             error_key="data_visualization_error",
             code_snippet_key="data_visualization_function",
             agent_function_name=state.get("data_visualization_function_name"),
-            pre_processing=lambda data: pd.DataFrame.from_dict(data),
+            pre_processing=lambda data: to_dataframe(data, copy=True),
             # post_processing=lambda df: df.to_dict() if isinstance(df, pd.DataFrame) else df,
             error_message_prefix="An error occurred during data visualization: "
         )
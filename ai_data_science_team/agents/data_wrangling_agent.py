@@ -14,7 +14,6 @@ from IPython.display import Markdown
 from langchain.prompts import PromptTemplate
 from langchain_core.messages import BaseMessage
 from langgraph.types import Command, Checkpointer
-from langgraph.checkpoint.memory import MemorySaver
 
 from ai_data_science_team.templates import(
     node_func_execute_agent_code_on_data, 
@@ -34,6 +33,10 @@ from ai_data_science_team.utils.regex import (
 )
 from ai_data_science_team.tools.dataframe import get_dataframe_summary
 from ai_data_science_team.utils.logging import log_ai_function
+from ai_data_science_team.utils.llm_cache import with_llm_cache
+from ai_data_science_team.utils.checkpoint import get_default_checkpointer
+from ai_data_science_team.utils.prompt_caching import prefix_cached_messages
+from ai_data_science_team.utils.dataset import DatasetHandle, is_dataset, to_dataframe, to_dataset
 
 # Setup Logging Path
 AGENT_NAME = "data_wrangling_agent"
@@ -85,6 +88,15 @@ class DataWranglingAgent(BaseAgent):
         If True, skips the step that provides code explanations. Defaults to False.
     checkpointer : Checkpointer, optional
         A checkpointer object to save and load the agent's state. Defaults to None.
+    approximate : bool, optional
+        If True, datasets with more than 100,000 rows are summarized with approximate statistics
+        (HyperLogLog distinct counts, sampled quantiles and preview rows) to reduce latency on very
+        large data. Defaults to False.
+    llm_cache : bool or langchain_core.caches.BaseCache, optional
+        Caches the model's responses, so repeated prompts (e.g. the same question on the same data) are answered
+        without calling the model. True uses the process-wide `LLMResponseCache` (see
+        `ai_data_science_team.utils.llm_cache`); a cache instance, e.g. an `LLMResponseCache` persisted to SQLite, is
+        used as is. Defaults to None (no caching).
 
     Methods
     -------
@@ -184,6 +196,8 @@ class DataWranglingAgent(BaseAgent):
         bypass_recommended_steps=False,
         bypass_explain_code=False,
         checkpointer=None,
+        approximate=False,
+        llm_cache=None,
     ):
         self._params = {
             "model": model,
@@ -197,6 +211,8 @@ class DataWranglingAgent(BaseAgent):
             "bypass_recommended_steps": bypass_recommended_steps,
             "bypass_explain_code": bypass_explain_code,
             "checkpointer": checkpointer,
+            "approximate": approximate,
+            "llm_cache": llm_cache,
         }
         self._compiled_graph = self._make_compiled_graph()
         self.response = None
@@ -298,6 +314,43 @@ class DataWranglingAgent(BaseAgent):
         self.response = response
         return None
 
+    def replay(self, data_raw, function: str=None, chunk_size: int=None, executor=None):
+        """
+        Re-runs the data wrangler function on new data without calling the LLM.
+
+        The function is taken from `function` if given, else from the last response, else from
+        the logged file (`log_path` / `file_name`), so a function generated and logged once can be
+        reused by batch jobs from a fresh agent instance.
+
+        Parameters
+        ----------
+        data_raw : Union[pd.DataFrame, dict, list]
+            The new dataset(s), in any form accepted by `invoke_agent()`.
+        function : str, optional
+            The function's source code, or a path to a `.py` file containing it.
+        chunk_size : int, optional
+            If given, a single dataset is processed in chunks of this many rows and the results are
+            concatenated, bounding peak memory on large inputs. Only appropriate when the function
+            is row-wise (e.g. no dataset-level imputation, deduplication or encoding).
+        executor : SandboxExecutor, optional
+            Runs the function in a sandboxed worker process. Defaults to the default executor, if any.
+
+        Returns
+        -------
+        pd.DataFrame
+            The wrangled data.
+        """
+        return self._replay(
+            self._convert_data_input(data_raw),
+            function=function,
+            code_key="data_wrangler_function",
+            path_key="data_wrangler_function_path",
+            log_path=self._params.get("log_path") or LOG_PATH,
+            chunk_size=chunk_size,
+            executor=executor,
+            error_message_prefix="An error occurred during data wrangling: ",
+        )
+
     def get_workflow_summary(self, markdown=False):
         """
         Retrieves the agent's workflow summary, if logging is enabled.
@@ -337,20 +390,20 @@ Function Name: {self.response.get('data_wrangler_function_name')}
             The wrangled dataset as a pandas DataFrame (if available).
         """
         if self.response and "data_wrangled" in self.response:
-            return pd.DataFrame(self.response["data_wrangled"])
+            return to_dataframe(self.response["data_wrangled"])
         return None
 
-    def get_data_raw(self) -> Union[dict, list, None]:
+    def get_data_raw(self) -> Union[pd.DataFrame, list, None]:
         """
         Retrieves the original raw data from the last invocation.
 
         Returns
         -------
-        Union[dict, list, None]
-            The original dataset(s) as a single dict or a list of dicts, or None if not available.
+        Union[pd.DataFrame, list, None]
+            The original dataset(s) as a single DataFrame or a list of DataFrames, or None if not available.
         """
         if self.response and "data_raw" in self.response:
-            return self.response["data_raw"]
+            return to_dataframe(self.response["data_raw"])
         return None
 
     def get_data_wrangler_function(self, markdown=False) -> Optional[str]:
@@ -396,10 +449,10 @@ Function Name: {self.response.get('data_wrangler_function_name')}
         return None
 
     @staticmethod
-    def _convert_data_input(data_raw: Union[pd.DataFrame, dict, list]) -> Union[dict, list]:
+    def _convert_data_input(data_raw: Union[pd.DataFrame, dict, list]) -> Union[DatasetHandle, list]:
         """
-        Internal utility to convert data_raw (which could be a DataFrame, dict, or list of dicts)
-        into the format expected by the underlying agent (dict or list of dicts).
+        Internal utility to convert data_raw (which could be a DataFrame, dict, or list of dicts/DataFrames)
+        into the DatasetHandle (or list of DatasetHandles) stored in the agent state.
 
         Parameters
         ----------
@@ -408,29 +461,16 @@ Function Name: {self.response.get('data_wrangler_function_name')}
 
         Returns
         -------
-        Union[dict, list]
-            The data in a dictionary or list-of-dictionaries format.
+        Union[DatasetHandle, list]
+            A single DatasetHandle or a list of DatasetHandles.
         """
-        # If a single DataFrame, convert to dict
-        if isinstance(data_raw, pd.DataFrame):
-            return data_raw.to_dict()
-
-        # If it's already a dict (single dataset)
-        if isinstance(data_raw, dict):
-            return data_raw
+        if is_dataset(data_raw):
+            return to_dataset(data_raw)
 
-        # If it's already a list, check if it's a list of DataFrames or dicts
         if isinstance(data_raw, list):
-            # Convert any DataFrame item to dict
-            converted_list = []
-            for item in data_raw:
-                if isinstance(item, pd.DataFrame):
-                    converted_list.append(item.to_dict())
-                elif isinstance(item, dict):
-                    converted_list.append(item)
-                else:
-                    raise ValueError("List must contain only DataFrames or dictionaries.")
-            return converted_list
+            if not all(is_dataset(item) for item in data_raw):
+                raise ValueError("List must contain only DataFrames or dictionaries.")
+            return to_dataset(data_raw)
 
         raise ValueError("data_raw must be a DataFrame, a dict, or a list of dicts/DataFrames.")
 
@@ -449,6 +489,8 @@ def make_data_wrangling_agent(
     bypass_recommended_steps=False, 
     bypass_explain_code=False,
     checkpointer=None,
+    approximate=False,
+    llm_cache=None,
 ):
     """
     Creates a data wrangling agent that can be run on one or more datasets. The agent can be
@@ -495,12 +537,22 @@ def make_data_wrangling_agent(
         Bypass the code explanation step, by default False.
     checkpointer : Checkpointer, optional
         A checkpointer object to save and load the agent's state. Defaults to None.
+    approximate : bool, optional
+        If True, datasets with more than 100,000 rows are summarized with approximate statistics
+        (HyperLogLog distinct counts, sampled quantiles and preview rows) to reduce latency on very
+        large data. Defaults to False.
+    llm_cache : bool or langchain_core.caches.BaseCache, optional
+        Caches the model's responses, so repeated prompts (e.g. the same question on the same data) are answered
+        without calling the model. True uses the process-wide `LLMResponseCache` (see
+        `ai_data_science_team.utils.llm_cache`); a cache instance, e.g. an `LLMResponseCache` persisted to SQLite, is
+        used as is. Defaults to None (no caching).
 
     Example
     -------
     ``` python
     from langchain_openai import ChatOpenAI
     import pandas as pd
+    from ai_data_science_team.utils.dataset import to_dataframe
     
     df = pd.DataFrame({
         'category': ['A', 'B', 'A', 'C'],
@@ -517,7 +569,7 @@ def make_data_wrangling_agent(
         "max_retries":3, 
         "retry_count":0
     })
-    pd.DataFrame(response['data_wrangled'])
+    to_dataframe(response['data_wrangled'])
     ```
     
     Returns
@@ -525,12 +577,12 @@ def make_data_wrangling_agent(
     app : langchain.graphs.CompiledStateGraph
         The data wrangling agent as a state graph.
     """
-    llm = model
+    llm = with_llm_cache(model, llm_cache)
     
     if human_in_the_loop:
         if checkpointer is None:
-            print("Human in the loop is enabled. A checkpointer is required. Setting to MemorySaver().")
-            checkpointer = MemorySaver()
+            checkpointer = get_default_checkpointer()
+            print(f"Human in the loop is enabled. A checkpointer is required. Setting to {type(checkpointer).__name__}().")
     
     # Human in th loop requires recommended steps
     if bypass_recommended_steps and human_in_the_loop:
@@ -544,13 +596,21 @@ def make_data_wrangling_agent(
         if not os.path.exists(log_path):
             os.makedirs(log_path)    
     
+    # Stable prompt prefix shared by the recommend, create and fix calls (provider prompt caching)
+    agent_context = """
+    You are a Data Wrangling Agent. You recommend data wrangling steps, write Python data wrangling functions with Pandas and NumPy and fix them when they fail, for the datasets summarized below. If more than one dataset is provided, you may need to merge or join them.
+    """
+    
+    def prompt_prefix(all_datasets_summary):
+        return [agent_context, "Below are summaries of all datasets provided:\n\n" + (all_datasets_summary or "")]
+    
     class GraphState(TypedDict):
         messages: Annotated[Sequence[BaseMessage], operator.add]
         user_instructions: str
         recommended_steps: str
-        # data_raw should be a dict for a single dataset or a list of dicts for multiple datasets
-        data_raw: Union[dict, list]
-        data_wrangled: dict
+        # data_raw should be a single dataset or a list of datasets (dicts or DatasetHandles)
+        data_raw: Union[dict, DatasetHandle, list]
+        data_wrangled: Union[dict, DatasetHandle]
         all_datasets_summary: str
         data_wrangler_function: str
         data_wrangler_function_path: str
@@ -565,23 +625,23 @@ def make_data_wrangling_agent(
 
         data_raw = state.get("data_raw")
 
-        if isinstance(data_raw, dict):
+        if is_dataset(data_raw):
             # Single dataset scenario
             primary_dataset_name = "main"
             datasets = {primary_dataset_name: data_raw}
-        elif isinstance(data_raw, list) and all(isinstance(item, dict) for item in data_raw):
+        elif isinstance(data_raw, list) and all(is_dataset(item) for item in data_raw):
             # Multiple datasets scenario
             datasets = {f"dataset_{i}": d for i, d in enumerate(data_raw, start=1)}
             primary_dataset_name = "dataset_1"
         else:
-            raise ValueError("data_raw must be a dict or a list of dicts.")
+            raise ValueError("data_raw must be a dataset or a list of datasets.")
 
         # Convert all datasets to DataFrames for inspection
-        dataframes = {name: pd.DataFrame.from_dict(d) for name, d in datasets.items()}
+        dataframes = {name: to_dataframe(d) for name, d in datasets.items()}
 
         # Create a summary for all datasets
         # We'll include a short sample and info for each dataset
-        all_datasets_summary = get_dataframe_summary(dataframes, n_sample=n_samples, skip_stats=True)
+        all_datasets_summary = get_dataframe_summary(dataframes, n_sample=n_samples, approximate=approximate, skip_stats=True)
 
         # Join all datasets summaries into one big text block
         all_datasets_summary_str = "\n\n".join(all_datasets_summary)
@@ -591,7 +651,7 @@ def make_data_wrangling_agent(
         # The LLM can then use all this info to recommend steps that consider merging/joining.
         recommend_steps_prompt = PromptTemplate(
             template="""
-            You are a Data Wrangling Expert. Given the following data (one or multiple datasets) and user instructions, 
+            You are a Data Wrangling Expert. Given the data above (one or multiple datasets) and user instructions, 
             recommend a series of numbered steps to wrangle the data based on a user's needs. 
             
             You can use any common data wrangling techniques such as joining, reshaping, aggregating, encoding, etc. 
@@ -607,24 +667,23 @@ def make_data_wrangling_agent(
             Previously Recommended Steps (if any):
             {recommended_steps}
 
-            Below are summaries of all datasets provided:
-            {all_datasets_summary}
-
             Return steps as a numbered list. You can return short code snippets to demonstrate actions. But do not return a fully coded solution. The code will be generated separately by a Coding Agent.
             
             Avoid these:
             1. Do not include steps to save files.
             2. Do not include unrelated user instructions that are not related to the data wrangling.
             """,
-            input_variables=["user_instructions", "recommended_steps", "all_datasets_summary"]
+            input_variables=["user_instructions", "recommended_steps"]
         )
 
-        steps_agent = recommend_steps_prompt | llm
-        recommended_steps = steps_agent.invoke({
-            "user_instructions": state.get("user_instructions"),
-            "recommended_steps": state.get("recommended_steps"),
-            "all_datasets_summary": all_datasets_summary_str,
-        }) 
+        recommended_steps = llm.invoke(prefix_cached_messages(
+            llm,
+            prefix=prompt_prefix(all_datasets_summary_str),
+            suffix=recommend_steps_prompt.format(
+                user_instructions=state.get("user_instructions"),
+                recommended_steps=state.get("recommended_steps"),
+            ),
+        ))
 
         return {
             "recommended_steps": format_recommended_steps(recommended_steps.content.strip(), heading="# Recommended Data Wrangling Steps:"),
@@ -638,23 +697,23 @@ def make_data_wrangling_agent(
             
             data_raw = state.get("data_raw")
 
-            if isinstance(data_raw, dict):
+            if is_dataset(data_raw):
                 # Single dataset scenario
                 primary_dataset_name = "main"
                 datasets = {primary_dataset_name: data_raw}
-            elif isinstance(data_raw, list) and all(isinstance(item, dict) for item in data_raw):
+            elif isinstance(data_raw, list) and all(is_dataset(item) for item in data_raw):
                 # Multiple datasets scenario
                 datasets = {f"dataset_{i}": d for i, d in enumerate(data_raw, start=1)}
                 primary_dataset_name = "dataset_1"
             else:
-                raise ValueError("data_raw must be a dict or a list of dicts.")
+                raise ValueError("data_raw must be a dataset or a list of datasets.")
 
             # Convert all datasets to DataFrames for inspection
-            dataframes = {name: pd.DataFrame.from_dict(d) for name, d in datasets.items()}
+            dataframes = {name: to_dataframe(d) for name, d in datasets.items()}
 
             # Create a summary for all datasets
             # We'll include a short sample and info for each dataset
-            all_datasets_summary = get_dataframe_summary(dataframes, n_sample=n_samples, skip_stats=True)
+            all_datasets_summary = get_dataframe_summary(dataframes, n_sample=n_samples, approximate=approximate, skip_stats=True)
 
             # Join all datasets summaries into one big text block
             all_datasets_summary_str = "\n\n".join(all_datasets_summary)
@@ -676,9 +735,6 @@ def make_data_wrangling_agent(
             
             If multiple datasets are provided, you may need to merge or join them. Make sure to handle that scenario based on the recommended steps and user instructions.
             
-            Below are summaries of all datasets provided. If more than one dataset is provided, you may need to merge or join them.:
-            {all_datasets_summary}
-            
             Return Python code in ```python``` format with a single function definition, {function_name}(), that includes all imports inside the function. And returns a single pandas data frame.
 
             ```python
@@ -708,17 +764,20 @@ def make_data_wrangling_agent(
             
             
             """,
-            input_variables=["recommended_steps", "user_instructions", "all_datasets_summary", "function_name"]
+            input_variables=["recommended_steps", "user_instructions", "function_name"]
         )
 
-        data_wrangling_agent = data_wrangling_prompt | llm | PythonOutputParser()
-
-        response = data_wrangling_agent.invoke({
-            "recommended_steps": state.get("recommended_steps"),
-            "user_instructions": state.get("user_instructions"),
-            "all_datasets_summary": all_datasets_summary_str,
-            "function_name": function_name
-        })
+        data_wrangling_agent = llm | PythonOutputParser()
+
+        response = data_wrangling_agent.invoke(prefix_cached_messages(
+            llm,
+            prefix=prompt_prefix(all_datasets_summary_str),
+            suffix=data_wrangling_prompt.format(
+                recommended_steps=state.get("recommended_steps"),
+                user_instructions=state.get("user_instructions"),
+                function_name=function_name,
+            ),
+        ))
         
         response = relocate_imports_inside_function(response)
         response = add_comments_to_top(response, agent_name=AGENT_NAME)
@@ -787,7 +846,7 @@ def make_data_wrangling_agent(
             code_snippet_key="data_wrangler_function",
             agent_function_name=state.get("data_wrangler_function_name"),
             # pre_processing=pre_processing,
-            post_processing=lambda df: df.to_dict() if isinstance(df, pd.DataFrame) else df,
+            post_processing=lambda df: to_dataset(df) if isinstance(df, pd.DataFrame) else df,
             error_message_prefix="An error occurred during data wrangling: "
         )
         
@@ -816,6 +875,7 @@ def make_data_wrangling_agent(
             log=log,
             file_path=state.get("data_wrangler_function_path"),
             function_name=state.get("data_wrangler_function_name"),
+            prompt_prefix=prompt_prefix(state.get("all_datasets_summary")),
         )
     
     # Final reporting node
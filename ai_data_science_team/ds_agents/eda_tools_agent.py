@@ -1,6 +1,6 @@
 
 
-from typing import Any, Optional, Annotated, Sequence, Dict
+from typing import Any, Optional, Annotated, Sequence, Dict, Union
 import operator
 import pandas as pd
 
@@ -14,6 +14,9 @@ from langgraph.types import Checkpointer
 
 from ai_data_science_team.templates import BaseAgent
 from ai_data_science_team.utils.regex import format_agent_name
+from ai_data_science_team.utils.llm_cache import with_llm_cache
+from ai_data_science_team.utils.metrics import instrument_graph
+from ai_data_science_team.utils.dataset import DatasetHandle, to_dataset
 
 from ai_data_science_team.tools.eda import (
     explain_data,
@@ -51,6 +54,11 @@ class EDAToolsAgent(BaseAgent):
         Additional kwargs for agent invocation.
     checkpointer : Checkpointer, optional
         The checkpointer for the agent.
+    llm_cache : bool or langchain_core.caches.BaseCache, optional
+        Caches the model's responses, so repeated prompts (e.g. the same question on the same data) are answered
+        without calling the model. True uses the process-wide `LLMResponseCache` (see
+        `ai_data_science_team.utils.llm_cache`); a cache instance, e.g. an `LLMResponseCache` persisted to SQLite, is
+        used as is. Defaults to None (no caching).
     """
     
     def __init__(
@@ -59,12 +67,14 @@ class EDAToolsAgent(BaseAgent):
         create_react_agent_kwargs: Optional[Dict] = {},
         invoke_react_agent_kwargs: Optional[Dict] = {},
         checkpointer: Optional[Checkpointer] = None,
+        llm_cache=None,
     ):
         self._params = {
             "model": model,
             "create_react_agent_kwargs": create_react_agent_kwargs,
             "invoke_react_agent_kwargs": invoke_react_agent_kwargs,
-            "checkpointer": checkpointer
+            "checkpointer": checkpointer,
+            "llm_cache": llm_cache,
         }
         self._compiled_graph = self._make_compiled_graph()
         self.response = None
@@ -103,7 +113,7 @@ class EDAToolsAgent(BaseAgent):
         response = await self._compiled_graph.ainvoke(
             {
                 "user_instructions": user_instructions,
-                "data_raw": data_raw.to_dict() if data_raw is not None else None,
+                "data_raw": to_dataset(data_raw),
             },
             **kwargs
         )
@@ -129,7 +139,7 @@ class EDAToolsAgent(BaseAgent):
         response = self._compiled_graph.invoke(
             {
                 "user_instructions": user_instructions,
-                "data_raw": data_raw.to_dict() if data_raw is not None else None,
+                "data_raw": to_dataset(data_raw),
             },
             **kwargs
         )
@@ -178,6 +188,7 @@ def make_eda_tools_agent(
     create_react_agent_kwargs: Optional[Dict] = {},
     invoke_react_agent_kwargs: Optional[Dict] = {},
     checkpointer: Optional[Checkpointer] = None,
+    llm_cache=None,
 ):
     """
     Creates an Exploratory Data Analyst Agent that can interact with EDA tools.
@@ -192,6 +203,11 @@ def make_eda_tools_agent(
         Additional kwargs for agent invocation.
     checkpointer : Checkpointer, optional
         The checkpointer for the agent.
+    llm_cache : bool or langchain_core.caches.BaseCache, optional
+        Caches the model's responses, so repeated prompts (e.g. the same question on the same data) are answered
+        without calling the model. True uses the process-wide `LLMResponseCache` (see
+        `ai_data_science_team.utils.llm_cache`); a cache instance, e.g. an `LLMResponseCache` persisted to SQLite, is
+        used as is. Defaults to None (no caching).
     
     Returns:
     -------
@@ -199,10 +215,12 @@ def make_eda_tools_agent(
         The compiled state graph for the EDA agent.
     """
     
+    llm = with_llm_cache(model, llm_cache)
+    
     class GraphState(AgentState):
         internal_messages: Annotated[Sequence[BaseMessage], operator.add]
         user_instructions: str
-        data_raw: dict
+        data_raw: Union[dict, DatasetHandle]
         eda_artifacts: dict
         tool_calls: list
 
@@ -215,7 +233,7 @@ def make_eda_tools_agent(
         )
         
         eda_agent = create_react_agent(
-            model,
+            llm,
             tools=tool_node,
             state_schema=GraphState,
             **create_react_agent_kwargs,
@@ -259,9 +277,9 @@ def make_eda_tools_agent(
     workflow.add_edge(START, "exploratory_agent")
     workflow.add_edge("exploratory_agent", END)
     
-    app = workflow.compile(
+    app = instrument_graph(workflow.compile(
         checkpointer=checkpointer,
         name=AGENT_NAME,
-    )
+    ))
     
     return app
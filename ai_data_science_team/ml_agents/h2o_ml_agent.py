@@ -5,7 +5,7 @@
 
 import os
 import json
-from typing import TypedDict, Annotated, Sequence, Literal, Optional
+from typing import TypedDict, Annotated, Sequence, Literal, Optional, Union
 import operator
 
 import pandas as pd
@@ -15,7 +15,6 @@ from langchain.prompts import PromptTemplate
 from langchain_core.messages import BaseMessage
 
 from langgraph.types import Command, Checkpointer
-from langgraph.checkpoint.memory import MemorySaver
 
 from ai_data_science_team.templates import(
     node_func_execute_agent_code_on_data,
@@ -35,6 +34,10 @@ from ai_data_science_team.utils.regex import (
 )
 from ai_data_science_team.tools.dataframe import get_dataframe_summary
 from ai_data_science_team.utils.logging import log_ai_function
+from ai_data_science_team.utils.llm_cache import with_llm_cache
+from ai_data_science_team.utils.checkpoint import get_default_checkpointer
+from ai_data_science_team.utils.prompt_caching import prefix_cached_messages
+from ai_data_science_team.utils.dataset import DatasetHandle, to_dataframe, to_dataset
 from ai_data_science_team.tools.h2o import H2O_AUTOML_DOCUMENTATION
 
 AGENT_NAME = "h2o_ml_agent"
@@ -81,6 +84,15 @@ class H2OMLAgent(BaseAgent):
         A custom name for the MLflow run.
     checkpointer : langgraph.checkpoint.memory.MemorySaver, optional
         A checkpointer object for saving the agent's state. Defaults to None.
+    approximate : bool, optional
+        If True, datasets with more than 100,000 rows are summarized with approximate statistics
+        (HyperLogLog distinct counts, sampled quantiles and preview rows) to reduce latency on very
+        large data. Defaults to False.
+    llm_cache : bool or langchain_core.caches.BaseCache, optional
+        Caches the model's responses, so repeated prompts (e.g. the same question on the same data) are answered
+        without calling the model. True uses the process-wide `LLMResponseCache` (see
+        `ai_data_science_team.utils.llm_cache`); a cache instance, e.g. an `LLMResponseCache` persisted to SQLite, is
+        used as is. Defaults to None (no caching).
     
     
     Methods
@@ -179,6 +191,8 @@ class H2OMLAgent(BaseAgent):
         mlflow_experiment_name="H2O AutoML",
         mlflow_run_name=None,
         checkpointer: Optional[Checkpointer]=None,
+        approximate=False,
+        llm_cache=None,
     ):
         self._params = {
             "model": model,
@@ -197,6 +211,8 @@ class H2OMLAgent(BaseAgent):
             "mlflow_experiment_name": mlflow_experiment_name,
             "mlflow_run_name": mlflow_run_name,
             "checkpointer": checkpointer,
+            "approximate": approximate,
+            "llm_cache": llm_cache,
         }
         self._compiled_graph = self._make_compiled_graph()
         self.response = None
@@ -231,7 +247,7 @@ class H2OMLAgent(BaseAgent):
         """
         response = await self._compiled_graph.ainvoke({
             "user_instructions": user_instructions,
-            "data_raw": data_raw.to_dict(),
+            "data_raw": to_dataset(data_raw),
             "target_variable": target_variable,
             "max_retries": max_retries,
             "retry_count": retry_count
@@ -254,7 +270,7 @@ class H2OMLAgent(BaseAgent):
         """
         response = self._compiled_graph.invoke({
             "user_instructions": user_instructions,
-            "data_raw": data_raw.to_dict(),
+            "data_raw": to_dataset(data_raw),
             "target_variable": target_variable,
             "max_retries": max_retries,
             "retry_count": retry_count
@@ -283,7 +299,7 @@ class H2OMLAgent(BaseAgent):
     def get_data_raw(self):
         """Retrieves the raw data as a DataFrame from the response."""
         if self.response and "data_raw" in self.response:
-            return pd.DataFrame(self.response["data_raw"])
+            return to_dataframe(self.response["data_raw"])
         return None
 
     def get_h2o_train_function(self, markdown=False):
@@ -355,6 +371,8 @@ def make_h2o_ml_agent(
     mlflow_experiment_name="H2O AutoML",
     mlflow_run_name=None,
     checkpointer=None,
+    approximate=False,
+    llm_cache=None,
 ):
     """
     Creates a machine learning agent that uses H2O for AutoML. 
@@ -370,7 +388,7 @@ def make_h2o_ml_agent(
                     If both are None, skip saving.
     """
 
-    llm = model
+    llm = with_llm_cache(model, llm_cache)
 
     # Handle logging directory
     if log:
@@ -392,16 +410,28 @@ def make_h2o_ml_agent(
         
     if human_in_the_loop:
         if checkpointer is None:
-            print("Human in the loop is enabled. A checkpointer is required. Setting to MemorySaver().")
-            checkpointer = MemorySaver()
+            checkpointer = get_default_checkpointer()
+            print(f"Human in the loop is enabled. A checkpointer is required. Setting to {type(checkpointer).__name__}().")
         
+    # Stable prompt prefix shared by the recommend, create and fix calls (provider prompt caching).
+    # The H2O AutoML documentation goes first since it is the same for every run.
+    agent_context = """
+    You are an H2O AutoML agent. You recommend H2O AutoML steps, write Python functions that run H2OAutoML and fix them when they fail, for the dataset summarized below.
+    """
+    
+    def prompt_prefix(all_datasets_summary):
+        return [
+            agent_context,
+            "H2O AutoML Documentation:\n\n" + H2O_AUTOML_DOCUMENTATION,
+            "Data Summary:\n\n" + (all_datasets_summary or ""),
+        ]
 
     # Define GraphState
     class GraphState(TypedDict):
         messages: Annotated[Sequence[BaseMessage], operator.add]
         user_instructions: str
         recommended_steps: str
-        data_raw: dict
+        data_raw: Union[dict, DatasetHandle]
         leaderboard: dict
         best_model_id: str
         model_path: str
@@ -425,17 +455,11 @@ def make_h2o_ml_agent(
             template="""
                 You are an AutoML Expert using H2O. 
                 
-                We have the following dataset summary, user instructions, and H2O AutoML documentation:
+                We have the dataset summary and H2O AutoML documentation above, and the following user instructions:
 
                 User instructions:
                     {user_instructions}
 
-                Data Summary:
-                    {all_datasets_summary}
-                    
-                H2O AutoML Documentation:
-                    {h2o_automl_documentation}
-
                 Please recommend a short list of steps or considerations for performing H2OAutoML on this data. Specifically focus on maximizing model accuracy while remaining flexible to user instructions and the dataset.
                 
                 - Recommend any paramters and values that might improve performance (predictive accuracy).
@@ -450,20 +474,21 @@ def make_h2o_ml_agent(
                 
                 Return as a numbered list. You can return short code snippets to demonstrate actions. But do not return a fully coded solution. The H2O AutoML code will be generated separately by a Coding Agent.
             """,
-            input_variables=["user_instructions", "all_datasets_summary", "h2o_automl_documentation"]
+            input_variables=["user_instructions"]
         )
 
         data_raw = state.get("data_raw")
-        df = pd.DataFrame.from_dict(data_raw)
-        all_datasets_summary = get_dataframe_summary([df], n_sample=n_samples)
+        df = to_dataframe(data_raw)
+        all_datasets_summary = get_dataframe_summary([df], n_sample=n_samples, approximate=approximate)
         all_datasets_summary_str = "\n\n".join(all_datasets_summary)
 
-        steps_agent = recommend_steps_prompt | llm
-        recommended_steps = steps_agent.invoke({
-            "user_instructions": state.get("user_instructions"),
-            "all_datasets_summary": all_datasets_summary_str,
-            "h2o_automl_documentation": H2O_AUTOML_DOCUMENTATION
-        })
+        recommended_steps = llm.invoke(prefix_cached_messages(
+            llm,
+            prefix=prompt_prefix(all_datasets_summary_str),
+            suffix=recommend_steps_prompt.format(
+                user_instructions=state.get("user_instructions"),
+            ),
+        ))
 
         return {
             "recommended_steps": format_recommended_steps(
@@ -479,8 +504,8 @@ def make_h2o_ml_agent(
             print(format_agent_name(AGENT_NAME))
             
             data_raw = state.get("data_raw")
-            df = pd.DataFrame.from_dict(data_raw)
-            all_datasets_summary = get_dataframe_summary([df], n_sample=n_samples)
+            df = to_dataframe(data_raw)
+            all_datasets_summary = get_dataframe_summary([df], n_sample=n_samples, approximate=approximate)
             all_datasets_summary_str = "\n\n".join(all_datasets_summary)
         else:
             all_datasets_summary_str = state.get("all_datasets_summary")
@@ -525,8 +550,7 @@ def make_h2o_ml_agent(
             Recommended Steps:
                 {recommended_steps}
 
-            Data summary for reference:
-                {all_datasets_summary}
+            Use the data summary above for reference.
 
             Return only code in ```python``` with a single function definition. Use this as an example starting template:
             ```python
@@ -690,7 +714,6 @@ def make_h2o_ml_agent(
                 "function_name", 
                 "target_variable",
                 "recommended_steps",
-                "all_datasets_summary",
                 "model_directory",
                 "log_path",
                 "enable_mlflow",
@@ -701,21 +724,24 @@ def make_h2o_ml_agent(
         )
 
         recommended_steps = state.get("recommended_steps", "")
-        h2o_code_agent = code_prompt | llm | PythonOutputParser()
-
-        resp = h2o_code_agent.invoke({
-            "user_instructions": state.get("user_instructions"),
-            "function_name": function_name,
-            "target_variable": state.get("target_variable"),
-            "recommended_steps": recommended_steps,
-            "all_datasets_summary": all_datasets_summary_str,
-            "model_directory": model_directory,
-            "log_path": log_path,
-            "enable_mlflow": enable_mlflow,
-            "mlflow_tracking_uri": mlflow_tracking_uri,
-            "mlflow_experiment_name": mlflow_experiment_name,
-            "mlflow_run_name": mlflow_run_name,
-        })
+        h2o_code_agent = llm | PythonOutputParser()
+
+        resp = h2o_code_agent.invoke(prefix_cached_messages(
+            llm,
+            prefix=prompt_prefix(all_datasets_summary_str),
+            suffix=code_prompt.format(
+                user_instructions=state.get("user_instructions"),
+                function_name=function_name,
+                target_variable=state.get("target_variable"),
+                recommended_steps=recommended_steps,
+                model_directory=model_directory,
+                log_path=log_path,
+                enable_mlflow=enable_mlflow,
+                mlflow_tracking_uri=mlflow_tracking_uri,
+                mlflow_experiment_name=mlflow_experiment_name,
+                mlflow_run_name=mlflow_run_name,
+            ),
+        ))
 
         resp = relocate_imports_inside_function(resp)
         resp = add_comments_to_top(resp, agent_name=AGENT_NAME)
@@ -734,6 +760,7 @@ def make_h2o_ml_agent(
             "h2o_train_function_path": file_path,
             "h2o_train_file_name": f_name,
             "h2o_train_function_name": function_name,
+            "all_datasets_summary": all_datasets_summary_str,
         }
         
     # Human Review
@@ -771,7 +798,7 @@ def make_h2o_ml_agent(
             result_key="h2o_train_result",
             error_key="h2o_train_error",
             agent_function_name=state.get("h2o_train_function_name"),
-            pre_processing=lambda data: pd.DataFrame.from_dict(data),
+            pre_processing=lambda data: to_dataframe(data, copy=True),
             post_processing=lambda x: x,
             error_message_prefix="Error occurred during H2O AutoML: "
         )
@@ -812,7 +839,8 @@ def make_h2o_ml_agent(
             agent_name=AGENT_NAME,
             file_path=state.get("h2o_train_function_path"),
             function_name=state.get("h2o_train_function_name"),
-            log=log
+            log=log,
+            prompt_prefix=prompt_prefix(state.get("all_datasets_summary")),
         )
 
     # 5) Final reporting node
@@ -1,5 +1,5 @@
 
-from typing import Any, Optional, Annotated, Sequence, Dict
+from typing import Any, Optional, Annotated, Sequence, Dict, Union
 import operator
 
 import pandas as pd
@@ -15,6 +15,9 @@ from langgraph.graph import START, END, StateGraph
 
 from ai_data_science_team.templates import BaseAgent
 from ai_data_science_team.utils.regex import format_agent_name
+from ai_data_science_team.utils.llm_cache import with_llm_cache
+from ai_data_science_team.utils.metrics import instrument_graph
+from ai_data_science_team.utils.dataset import DatasetHandle, to_dataset
 from ai_data_science_team.tools.mlflow import (
     mlflow_search_experiments, 
     mlflow_search_runs,
@@ -71,6 +74,11 @@ class MLflowToolsAgent(BaseAgent):
         Additional keyword arguments to pass to the invoke method of the react agent.
     checkpointer : langchain.checkpointing.Checkpointer, optional
         A checkpointer to use for saving and loading the agent's state. Defaults to None.
+    llm_cache : bool or langchain_core.caches.BaseCache, optional
+        Caches the model's responses, so repeated prompts (e.g. the same question on the same data) are answered
+        without calling the model. True uses the process-wide `LLMResponseCache` (see
+        `ai_data_science_team.utils.llm_cache`); a cache instance, e.g. an `LLMResponseCache` persisted to SQLite, is
+        used as is. Defaults to None (no caching).
     
     Methods:
     --------
@@ -123,6 +131,7 @@ class MLflowToolsAgent(BaseAgent):
         create_react_agent_kwargs: Optional[Dict]={},
         invoke_react_agent_kwargs: Optional[Dict]={},
         checkpointer: Optional[Checkpointer]=None,
+        llm_cache=None,
     ):
         self._params = {
             "model": model,
@@ -130,7 +139,8 @@ class MLflowToolsAgent(BaseAgent):
             "mlflow_registry_uri": mlflow_registry_uri,
             "create_react_agent_kwargs": create_react_agent_kwargs,
             "invoke_react_agent_kwargs": invoke_react_agent_kwargs,
-            "checkpointer": checkpointer,            
+            "checkpointer": checkpointer,
+            "llm_cache": llm_cache,
         }
         self._compiled_graph = self._make_compiled_graph()
         self.response = None
@@ -173,7 +183,7 @@ class MLflowToolsAgent(BaseAgent):
         response = await self._compiled_graph.ainvoke(
             {
                 "user_instructions": user_instructions,
-                "data_raw": data_raw.to_dict() if data_raw is not None else None,
+                "data_raw": to_dataset(data_raw),
             }, 
             **kwargs
         )
@@ -200,7 +210,7 @@ class MLflowToolsAgent(BaseAgent):
         response = self._compiled_graph.invoke(
             {
                 "user_instructions": user_instructions,
-                "data_raw": data_raw.to_dict() if data_raw is not None else None,
+                "data_raw": to_dataset(data_raw),
             },
             **kwargs
         )
@@ -251,6 +261,7 @@ def make_mlflow_tools_agent(
     create_react_agent_kwargs: Optional[Dict]={},
     invoke_react_agent_kwargs: Optional[Dict]={},
     checkpointer: Optional[Checkpointer]=None,
+    llm_cache=None,
 ):
     """
     MLflow Tool Calling Agent
@@ -269,6 +280,11 @@ def make_mlflow_tools_agent(
         Additional keyword arguments to pass to the agent's invoke method.
     checkpointer : langchain.checkpointing.Checkpointer, optional
         A checkpointer to use for saving and loading the agent's state. Defaults to None.
+    llm_cache : bool or langchain_core.caches.BaseCache, optional
+        Caches the model's responses, so repeated prompts (e.g. the same question on the same data) are answered
+        without calling the model. True uses the process-wide `LLMResponseCache` (see
+        `ai_data_science_team.utils.llm_cache`); a cache instance, e.g. an `LLMResponseCache` persisted to SQLite, is
+        used as is. Defaults to None (no caching).
         
     Returns
     -------
@@ -288,10 +304,12 @@ def make_mlflow_tools_agent(
     if mlflow_registry_uri is not None:
         mlflow.set_registry_uri(mlflow_registry_uri)
     
+    llm = with_llm_cache(model, llm_cache)
+    
     class GraphState(AgentState):
         internal_messages: Annotated[Sequence[BaseMessage], operator.add]
         user_instructions: str
-        data_raw: dict
+        data_raw: Union[dict, DatasetHandle]
         mlflow_artifacts: dict
 
     
@@ -308,7 +326,7 @@ def make_mlflow_tools_agent(
         )
         
         mlflow_agent = create_react_agent(
-            model, 
+            llm, 
             tools=tool_node, 
             state_schema=GraphState,
             checkpointer=checkpointer,
@@ -363,10 +381,10 @@ def make_mlflow_tools_agent(
     workflow.add_edge(START, "mlflow_tools_agent")
     workflow.add_edge("mlflow_tools_agent", END)
     
-    app = workflow.compile(
+    app = instrument_graph(workflow.compile(
         checkpointer=checkpointer,
         name=AGENT_NAME,
-    )
+    ))
 
     return app
     
\ No newline at end of file
@@ -15,6 +15,9 @@ from IPython.display import Markdown
 from ai_data_science_team.templates import BaseAgent
 from ai_data_science_team.agents import DataWranglingAgent, DataVisualizationAgent
 from ai_data_science_team.utils.plotly import plotly_from_dict
+from ai_data_science_team.utils.llm_cache import with_llm_cache
+from ai_data_science_team.utils.metrics import instrument_graph
+from ai_data_science_team.utils.dataset import DatasetRef, is_dataset, to_dataframe, to_dataset_ref
 from ai_data_science_team.utils.regex import remove_consecutive_duplicates, get_generic_summary
 
 AGENT_NAME = "pandas_data_analyst"
@@ -33,6 +36,13 @@ class PandasDataAnalyst(BaseAgent):
         The Data Visualization Agent for generating plots.
     checkpointer: Checkpointer (optional)
         The checkpointer to save the state of the multi-agent system.
+    llm_cache: bool or BaseCache (optional)
+        Caches the routing model's responses (see `ai_data_science_team.utils.llm_cache`). The sub-agents use
+        their own `llm_cache` setting.
+    speculative: bool (optional)
+        If True, the routing model call and the data wrangling agent run concurrently instead of one after the
+        other, and the data wrangling agent works from the original question. This cuts the wall time of the
+        routing call from every run. Defaults to False.
 
     Methods:
     --------
@@ -56,12 +66,16 @@ class PandasDataAnalyst(BaseAgent):
         data_wrangling_agent: DataWranglingAgent,
         data_visualization_agent: DataVisualizationAgent,
         checkpointer: Checkpointer = None,
+        llm_cache=None,
+        speculative: bool = False,
     ):
         self._params = {
             "model": model,
             "data_wrangling_agent": data_wrangling_agent,
             "data_visualization_agent": data_visualization_agent,
             "checkpointer": checkpointer,
+            "llm_cache": llm_cache,
+            "speculative": speculative,
         }
         self._compiled_graph = self._make_compiled_graph()
         self.response = None
@@ -74,6 +88,8 @@ class PandasDataAnalyst(BaseAgent):
             data_wrangling_agent=self._params["data_wrangling_agent"]._compiled_graph,
             data_visualization_agent=self._params["data_visualization_agent"]._compiled_graph,
             checkpointer=self._params["checkpointer"],
+            llm_cache=self._params["llm_cache"],
+            speculative=self._params["speculative"],
         )
 
     def update_params(self, **kwargs):
@@ -109,7 +125,7 @@ class PandasDataAnalyst(BaseAgent):
     def get_data_wrangled(self):
         """Returns the wrangled data as a Pandas DataFrame."""
         if self.response and self.response.get("data_wrangled"):
-            return pd.DataFrame(self.response.get("data_wrangled"))
+            return to_dataframe(self.response.get("data_wrangled"))
 
     def get_plotly_graph(self):
         """Returns the Plotly graph as a Plotly object."""
@@ -139,21 +155,19 @@ class PandasDataAnalyst(BaseAgent):
             return Markdown(summary) if markdown else summary
 
     @staticmethod
-    def _convert_data_input(data_raw: Union[pd.DataFrame, dict, list]) -> Union[dict, list]:
-        """Converts input data to the expected format (dict or list of dicts)."""
-        if isinstance(data_raw, pd.DataFrame):
-            return data_raw.to_dict()
-        if isinstance(data_raw, dict):
-            return data_raw
-        if isinstance(data_raw, list):
-            return [item.to_dict() if isinstance(item, pd.DataFrame) else item for item in data_raw]
+    def _convert_data_input(data_raw: Union[pd.DataFrame, dict, list]) -> Union[DatasetRef, list]:
+        """Registers input data in the DatasetStore and returns a DatasetRef (or list of DatasetRefs)."""
+        if is_dataset(data_raw) or isinstance(data_raw, list):
+            return to_dataset_ref(data_raw)
         raise ValueError("data_raw must be a DataFrame, dict, or list of DataFrames/dicts")
 
 def make_pandas_data_analyst(
     model,
     data_wrangling_agent: CompiledStateGraph,
     data_visualization_agent: CompiledStateGraph,
-    checkpointer: Checkpointer = None
+    checkpointer: Checkpointer = None,
+    llm_cache=None,
+    speculative: bool = False,
 ):
     """
     Creates a multi-agent system that wrangles data and optionally visualizes it.
@@ -167,13 +181,20 @@ def make_pandas_data_analyst(
         The Data Visualization Agent.
     checkpointer: Checkpointer (optional)
         The checkpointer to save the state.
+    llm_cache: bool or BaseCache (optional)
+        Caches the routing model's responses (see `ai_data_science_team.utils.llm_cache`). The sub-agents use
+        their own `llm_cache` setting.
+    speculative: bool (optional)
+        If True, the routing model call and the data wrangling agent run concurrently instead of one after the
+        other, and the data wrangling agent works from the original question. This cuts the wall time of the
+        routing call from every run. Defaults to False.
 
     Returns:
     --------
     CompiledStateGraph: The compiled multi-agent system.
     """
     
-    llm = model
+    llm = with_llm_cache(model, llm_cache)
     
     routing_preprocessor_prompt = PromptTemplate(
         template="""
@@ -206,8 +227,8 @@ def make_pandas_data_analyst(
         user_instructions_data_wrangling: str
         user_instructions_data_visualization: str
         routing_preprocessor_decision: str
-        data_raw: Union[dict, list]
-        data_wrangled: dict
+        data_raw: Union[dict, DatasetRef, list]
+        data_wrangled: Union[dict, DatasetRef]
         data_wrangler_function: str
         data_visualization_function: str
         plotly_graph: dict
@@ -239,7 +260,7 @@ def make_pandas_data_analyst(
     def invoke_data_wrangling_agent(state: PrimaryState):
         
         response = data_wrangling_agent.invoke({
-            "user_instructions": state.get("user_instructions_data_wrangling"),
+            "user_instructions": state.get("user_instructions_data_wrangling") or state.get("user_instructions"),
             "data_raw": state.get("data_raw"),
             "max_retries": state.get("max_retries"),
             "retry_count": state.get("retry_count"),
@@ -247,7 +268,7 @@ def make_pandas_data_analyst(
 
         return {
             "messages": response.get("messages"),
-            "data_wrangled": response.get("data_wrangled"),
+            "data_wrangled": to_dataset_ref(response.get("data_wrangled")),
             "data_wrangler_function": response.get("data_wrangler_function"),
             "plotly_error": response.get("data_visualization_error"),
             
@@ -282,11 +303,20 @@ def make_pandas_data_analyst(
     workflow.add_node("data_visualization_agent", invoke_data_visualization_agent)
     workflow.add_node("route_printer", route_printer)
 
-    workflow.add_edge(START, "routing_preprocessor")
-    workflow.add_edge("routing_preprocessor", "data_wrangling_agent")
+    if speculative:
+        # Routing and the data agent start together and meet at the join before the chart/table decision
+        workflow.add_node("routing_join", lambda state: {})
+        workflow.add_edge(START, "routing_preprocessor")
+        workflow.add_edge(START, "data_wrangling_agent")
+        workflow.add_edge(["routing_preprocessor", "data_wrangling_agent"], "routing_join")
+        route_source = "routing_join"
+    else:
+        workflow.add_edge(START, "routing_preprocessor")
+        workflow.add_edge("routing_preprocessor", "data_wrangling_agent")
+        route_source = "data_wrangling_agent"
     
     workflow.add_conditional_edges(
-        "data_wrangling_agent", 
+        route_source, 
         router_chart_or_table,
         {
             "chart": "data_visualization_agent",
@@ -297,9 +327,9 @@ def make_pandas_data_analyst(
     workflow.add_edge("data_visualization_agent", "route_printer")
     workflow.add_edge("route_printer", END)
 
-    app = workflow.compile(
+    app = instrument_graph(workflow.compile(
         checkpointer=checkpointer, 
         name=AGENT_NAME
-    )
+    ))
     
     return app
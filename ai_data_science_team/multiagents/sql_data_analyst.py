@@ -8,18 +8,20 @@ from langgraph.graph import START, END, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.types import Checkpointer
 
-from typing import TypedDict, Annotated, Sequence
+from typing import TypedDict, Annotated, Sequence, Union
 import operator
 
 from typing_extensions import TypedDict
 
-import pandas as pd
 import json
 from IPython.display import Markdown
 
 from ai_data_science_team.templates import BaseAgent
 from ai_data_science_team.agents import SQLDatabaseAgent, DataVisualizationAgent
 from ai_data_science_team.utils.plotly import plotly_from_dict
+from ai_data_science_team.utils.llm_cache import with_llm_cache
+from ai_data_science_team.utils.metrics import instrument_graph
+from ai_data_science_team.utils.dataset import DatasetRef, to_dataframe, to_dataset_ref
 from ai_data_science_team.utils.regex import remove_consecutive_duplicates, get_generic_summary
 
 AGENT_NAME = "sql_data_analyst"
@@ -38,6 +40,13 @@ class SQLDataAnalyst(BaseAgent):
         The Data Visualization Agent.
     checkpointer: Checkpointer (optional)
         The checkpointer to save the state of the multi-agent system.
+    llm_cache: bool or BaseCache (optional)
+        Caches the routing model's responses (see `ai_data_science_team.utils.llm_cache`). The sub-agents use
+        their own `llm_cache` setting.
+    speculative: bool (optional)
+        If True, the routing model call and the SQL database agent run concurrently instead of one after the
+        other, and the SQL database agent works from the original question. This cuts the wall time of the
+        routing call from every run. Defaults to False.
         
     Methods:
     --------
@@ -63,12 +72,16 @@ class SQLDataAnalyst(BaseAgent):
         sql_database_agent: SQLDatabaseAgent, 
         data_visualization_agent: DataVisualizationAgent,
         checkpointer: Checkpointer = None,
+        llm_cache=None,
+        speculative: bool = False,
     ):
         self._params = {
             "model": model,
             "sql_database_agent": sql_database_agent,
             "data_visualization_agent": data_visualization_agent,
             "checkpointer": checkpointer,
+            "llm_cache": llm_cache,
+            "speculative": speculative,
         }
         self._compiled_graph = self._make_compiled_graph()
         self.response = None
@@ -84,6 +97,8 @@ class SQLDataAnalyst(BaseAgent):
             sql_database_agent=self._params["sql_database_agent"]._compiled_graph,
             data_visualization_agent=self._params["data_visualization_agent"]._compiled_graph,
             checkpointer=self._params["checkpointer"],
+            llm_cache=self._params["llm_cache"],
+            speculative=self._params["speculative"],
         )
     
     def update_params(self, **kwargs):
@@ -234,7 +249,7 @@ class SQLDataAnalyst(BaseAgent):
         """
         if self.response:
             if self.response.get("data_sql"):
-                return pd.DataFrame(self.response.get("data_sql"))
+                return to_dataframe(self.response.get("data_sql"))
     
     def get_plotly_graph(self):
         """
@@ -315,7 +330,9 @@ def make_sql_data_analyst(
     model, 
     sql_database_agent: CompiledStateGraph,
     data_visualization_agent: CompiledStateGraph,
-    checkpointer: Checkpointer = None
+    checkpointer: Checkpointer = None,
+    llm_cache=None,
+    speculative: bool = False,
 ):
     """
     Creates a multi-agent system that takes in a SQL query and returns a plot or table.
@@ -334,6 +351,13 @@ def make_sql_data_analyst(
     checkpointer: Checkpointer (optional)
         The checkpointer to save the state of the multi-agent system.
         Default: None
+    llm_cache: bool or BaseCache (optional)
+        Caches the routing model's responses (see `ai_data_science_team.utils.llm_cache`). The sub-agents use
+        their own `llm_cache` setting.
+    speculative: bool (optional)
+        If True, the routing model call and the SQL database agent run concurrently instead of one after the
+        other, and the SQL database agent works from the original question. This cuts the wall time of the
+        routing call from every run. Defaults to False.
         
     Returns:
     -------
@@ -341,7 +365,7 @@ def make_sql_data_analyst(
         The compiled multi-agent system.
     """
     
-    llm = model
+    llm = with_llm_cache(model, llm_cache)
     
     
     routing_preprocessor_prompt = PromptTemplate(
@@ -377,8 +401,8 @@ def make_sql_data_analyst(
         routing_preprocessor_decision: str
         sql_query_code: str
         sql_database_function: str
-        data_sql: dict
-        data_raw: dict
+        data_sql: Union[dict, DatasetRef]
+        data_raw: Union[dict, DatasetRef]
         plot_required: bool
         data_visualization_function: str
         plotly_graph: dict
@@ -409,14 +433,14 @@ def make_sql_data_analyst(
     def invoke_sql_database_agent(state: PrimaryState):
         
         response = sql_database_agent.invoke({
-            "user_instructions": state.get("user_instructions_sql_database"),
+            "user_instructions": state.get("user_instructions_sql_database") or state.get("user_instructions"),
             "max_retries": state.get("max_retries"),
             "retry_count": state.get("retry_count"),
         })
 
         return {
             "messages": response.get("messages"),
-            "data_sql": response.get("data_sql"),
+            "data_sql": to_dataset_ref(response.get("data_sql")),
             "sql_query_code": response.get("sql_query_code"),
             "sql_database_function": response.get("sql_database_function"),
             
@@ -451,11 +475,20 @@ def make_sql_data_analyst(
     workflow.add_node("data_visualization_agent", invoke_data_visualization_agent)
     workflow.add_node("route_printer", route_printer)
 
-    workflow.add_edge(START, "routing_preprocessor")
-    workflow.add_edge("routing_preprocessor", "sql_database_agent")
+    if speculative:
+        # Routing and the data agent start together and meet at the join before the chart/table decision
+        workflow.add_node("routing_join", lambda state: {})
+        workflow.add_edge(START, "routing_preprocessor")
+        workflow.add_edge(START, "sql_database_agent")
+        workflow.add_edge(["routing_preprocessor", "sql_database_agent"], "routing_join")
+        route_source = "routing_join"
+    else:
+        workflow.add_edge(START, "routing_preprocessor")
+        workflow.add_edge("routing_preprocessor", "sql_database_agent")
+        route_source = "sql_database_agent"
     
     workflow.add_conditional_edges(
-        "sql_database_agent", 
+        route_source, 
         router_chart_or_table,
         {
             "chart": "data_visualization_agent",
@@ -466,10 +499,10 @@ def make_sql_data_analyst(
     workflow.add_edge("data_visualization_agent", "route_printer")
     workflow.add_edge("route_printer", END)
 
-    app = workflow.compile(
+    app = instrument_graph(workflow.compile(
         checkpointer=checkpointer, 
         name=AGENT_NAME
-    )
+    ))
 
     return app
 
@@ -5,6 +5,7 @@ from ai_data_science_team.templates.agent_templates import(
     node_func_explain_agent_code, 
     node_func_report_agent_outputs,
     node_func_execute_agent_from_sql_connection,
+    anode_func_execute_agent_from_sql_connection,
     create_coding_agent_graph,
     BaseAgent,
 )
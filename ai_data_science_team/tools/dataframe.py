@@ -1,11 +1,46 @@
 import io
+import hashlib
+import numpy as np
 import pandas as pd
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Tuple
+
+from ai_data_science_team.utils.cache import LRUCache
+
+# Summaries are cached by a sampled content fingerprint (see _dataframe_fingerprint)
+_SUMMARY_CACHE = LRUCache(max_entries=256, max_bytes=64 * 1024 ** 2, sizeof=len)
+_FINGERPRINT_BLOCKS = 16
+_FINGERPRINT_BLOCK_SIZE = 64
+
+# Approximate mode (see _profile_dataframe_approximate)
+_APPROX_MIN_ROWS = 100_000
+_APPROX_CHUNK_ROWS = 1_000_000
+_APPROX_SAMPLE_ROWS = 10_000
+_APPROX_SEED = 42
+_HLL_P = 14
+_HLL_M = 1 << _HLL_P
+_HLL_ERROR_95 = 2 * 1.04 / np.sqrt(_HLL_M)
+
+# Series.map returns these dtypes unchanged
+_MAP_PRESERVED_DTYPES = {
+    np.dtype("int64"), np.dtype("float64"), np.dtype("complex128"), np.dtype("bool"),
+    np.dtype("datetime64[ns]"), np.dtype("timedelta64[ns]"),
+}
+_MAP_PRESERVED_EXTENSION_DTYPES = (pd.DatetimeTZDtype, pd.PeriodDtype, pd.IntervalDtype)
+
+# Series.map upcasts these (kind, itemsize) numpy dtypes
+_MAP_UPCAST_DTYPES = {
+    ("i", 1): np.int64, ("i", 2): np.int64, ("i", 4): np.int64,
+    ("u", 1): np.int64, ("u", 2): np.int64, ("u", 4): np.int64,
+    ("f", 2): np.float64, ("f", 4): np.float64,
+    ("c", 8): np.complex128,
+}
 
 def get_dataframe_summary(
     dataframes: Union[pd.DataFrame, List[pd.DataFrame], Dict[str, pd.DataFrame]],
     n_sample: int = 30,
     skip_stats: bool = False,
+    use_cache: bool = True,
+    approximate: bool = False,
 ) -> List[str]:
     """
     Generate a summary for one or more DataFrames. Accepts a single DataFrame, a list of DataFrames,
@@ -21,6 +56,18 @@ def get_dataframe_summary(
         Number of rows to display in the "Data (first 30 rows)" section.
     skip_stats : bool, default False
         If True, skip the descriptive statistics and DataFrame info sections.
+    use_cache : bool, default True
+        If True, reuse a previously computed summary when the same data is summarized again.
+        Data is matched by a cheap fingerprint of its shape, column names, dtypes and a hashed
+        sample of row blocks (first, last and evenly spaced blocks). An in-place edit that
+        falls entirely between sampled blocks is not detected; pass False to force recomputation.
+        See `get_dataframe_summary_cache_info()` for hit/miss counters.
+    approximate : bool, default False
+        If True, use approximate statistics for frames with more than 100,000 rows, in bounded
+        memory regardless of row count: HyperLogLog distinct counts, quantiles from a uniform row
+        sample, and randomly sampled preview rows instead of the first rows. Missing value
+        percentages, counts, means, standard deviations, minimums and maximums remain exact.
+        Error bounds are reported in the summary text. Smaller frames are summarized exactly.
         
     Example:
     --------
@@ -50,21 +97,22 @@ def get_dataframe_summary(
     """
 
     summaries = []
+    summarize = _summarize_dataframe_cached if use_cache else _summarize_dataframe
 
     # --- Dictionary Case ---
     if isinstance(dataframes, dict):
         for dataset_name, df in dataframes.items():
-            summaries.append(_summarize_dataframe(df, dataset_name, n_sample, skip_stats))
+            summaries.append(summarize(df, dataset_name, n_sample, skip_stats, approximate))
 
     # --- Single DataFrame Case ---
     elif isinstance(dataframes, pd.DataFrame):
-        summaries.append(_summarize_dataframe(dataframes, "Single_Dataset", n_sample, skip_stats))
+        summaries.append(summarize(dataframes, "Single_Dataset", n_sample, skip_stats, approximate))
 
     # --- List of DataFrames Case ---
     elif isinstance(dataframes, list):
         for idx, df in enumerate(dataframes):
             dataset_name = f"Dataset_{idx}"
-            summaries.append(_summarize_dataframe(df, dataset_name, n_sample, skip_stats))
+            summaries.append(summarize(df, dataset_name, n_sample, skip_stats, approximate))
 
     else:
         raise TypeError(
@@ -74,35 +122,91 @@ def get_dataframe_summary(
     return summaries
 
 
+def get_dataframe_summary_cache_info() -> Dict[str, int]:
+    """
+    Returns hit/miss counters and usage of the `get_dataframe_summary` cache.
+    """
+    return _SUMMARY_CACHE.stats()
+
+
+def clear_dataframe_summary_cache() -> None:
+    """
+    Clears the `get_dataframe_summary` cache and resets its counters.
+    """
+    _SUMMARY_CACHE.clear()
+
+
+def _summarize_dataframe_cached(
+    df: pd.DataFrame, 
+    dataset_name: str, 
+    n_sample=30, 
+    skip_stats=False,
+    approximate=False,
+) -> str:
+    """Return a cached summary string for a single DataFrame, computing it on a miss."""
+    key = (_dataframe_fingerprint(df), dataset_name, n_sample, skip_stats, approximate)
+    summary = _SUMMARY_CACHE.get(key)
+    if summary is None:
+        summary = _summarize_dataframe(df, dataset_name, n_sample, skip_stats, approximate)
+        _SUMMARY_CACHE.put(key, summary)
+    return summary
+
+
+def _dataframe_fingerprint(
+    df: pd.DataFrame, 
+    n_blocks=_FINGERPRINT_BLOCKS, 
+    block_size=_FINGERPRINT_BLOCK_SIZE
+) -> str:
+    """Cheap content fingerprint: shape, columns, dtypes and a hash of sampled row blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    schema = [(str(col), str(dtype)) for col, dtype in df.dtypes.items()]
+    digest.update(repr((df.shape, schema, type(df.index).__name__)).encode())
+
+    # Hash evenly spaced blocks of rows (always including the first and last block)
+    n_rows = len(df)
+    if n_rows <= n_blocks * block_size:
+        positions = np.arange(n_rows)
+    else:
+        starts = np.linspace(0, n_rows - block_size, n_blocks).astype(np.int64)
+        positions = (starts[:, None] + np.arange(block_size)).ravel()
+    sample = df.iloc[positions]
+
+    try:
+        row_hashes = pd.util.hash_pandas_object(sample, index=True)
+    except TypeError:
+        # Unhashable cell values (e.g. dicts or lists)
+        row_hashes = pd.util.hash_pandas_object(sample.astype(str), index=True)
+    digest.update(row_hashes.values.tobytes())
+    return digest.hexdigest()
+
+
 def _summarize_dataframe(
     df: pd.DataFrame, 
     dataset_name: str, 
     n_sample=30, 
-    skip_stats=False
+    skip_stats=False,
+    approximate=False,
 ) -> str:
     """Generate a summary string for a single DataFrame."""
+    if approximate and len(df) > _APPROX_MIN_ROWS:
+        return _summarize_dataframe_approximate(df, dataset_name, n_sample, skip_stats)
+
     # 1. Convert dictionary-type cells to strings
     #    This prevents unhashable dict errors during df.nunique().
-    df = df.apply(lambda col: col.map(lambda x: str(x) if isinstance(x, dict) else x))
-    
-    # 2. Capture df.info() output
-    buffer = io.StringIO()
-    df.info(buf=buffer)
-    info_text = buffer.getvalue()
-
-    # 3. Calculate missing value stats
-    missing_stats = (df.isna().sum() / len(df) * 100).sort_values(ascending=False)
-    missing_summary = "\n".join([f"{col}: {val:.2f}%" for col, val in missing_stats.items()])
+    df = _stringify_dict_columns(df)
 
-    # 4. Get column data types
+    # 2. Generate the summary text
     column_types = "\n".join([f"{col}: {dtype}" for col, dtype in df.dtypes.items()])
 
-    # 5. Get unique value counts
-    unique_counts = df.nunique()  # Will no longer fail on unhashable dict
-    unique_counts_summary = "\n".join([f"{col}: {count}" for col, count in unique_counts.items()])
-
-    # 6. Generate the summary text
     if not skip_stats:
+        # Single pass over each column for nulls, distinct counts and numeric statistics
+        profile = _profile_dataframe(df)
+
+        missing_stats = (profile["null_counts"] / len(df) * 100).sort_values(ascending=False)
+        missing_summary = "\n".join([f"{col}: {val:.2f}%" for col, val in missing_stats.items()])
+
+        unique_counts_summary = "\n".join([f"{col}: {count}" for col, count in profile["unique_counts"].items()])
+
         summary_text = f"""
         Dataset Name: {dataset_name}
         ----------------------------
@@ -121,10 +225,10 @@ def _summarize_dataframe(
         {df.head(n_sample).to_string()}
 
         Data Description:
-        {df.describe().to_string()}
+        {profile["describe"].to_string()}
 
         Data Info:
-        {info_text}
+        {profile["info"]}
         """
     else:
         summary_text = f"""
@@ -142,3 +246,380 @@ def _summarize_dataframe(
     return summary_text.strip()
 
 
+def _summarize_dataframe_approximate(
+    df: pd.DataFrame, 
+    dataset_name: str, 
+    n_sample=30, 
+    skip_stats=False
+) -> str:
+    """Generate a summary string for a single large DataFrame using approximate statistics."""
+    column_types = "\n".join([f"{col}: {dtype}" for col, dtype in df.dtypes.items()])
+
+    profile = _profile_dataframe_approximate(df, n_sample, skip_stats)
+    preview = _stringify_dict_columns(df.iloc[profile["preview_positions"]])
+    preview_title = f"Data ({len(preview)} rows sampled uniformly at random)"
+
+    if skip_stats:
+        summary_text = f"""
+        Dataset Name: {dataset_name}
+        ----------------------------
+        Shape: {df.shape[0]} rows x {df.shape[1]} columns
+
+        Column Data Types:
+        {column_types}
+
+        {preview_title}:
+        {preview.to_string()}
+        """
+        return summary_text.strip()
+
+    missing_stats = (profile["null_counts"] / len(df) * 100).sort_values(ascending=False)
+    missing_summary = "\n".join([f"{col}: {val:.2f}%" for col, val in missing_stats.items()])
+
+    unique_counts_summary = "\n".join([f"{col}: ~{count}" for col, count in profile["unique_counts"].items()])
+    unique_counts_title = (
+        f"Unique Value Counts (approximate, HyperLogLog, ±{_HLL_ERROR_95 * 100:.1f}% at 95% confidence)"
+    )
+
+    sample_size = profile["sample_size"]
+    rank_error = np.sqrt(np.log(2 / 0.05) / (2 * sample_size))
+    description = profile["describe"]
+    description_text = description.to_string() if description is not None else "No numeric columns."
+    description_title = (
+        "Data Description (numeric columns; count, mean, std, min and max are exact; "
+        f"25%, 50% and 75% are estimated from a uniform sample of {sample_size} rows, "
+        f"rank error ±{rank_error * 100:.1f}% at 95% confidence)"
+    )
+
+    summary_text = f"""
+        Dataset Name: {dataset_name}
+        ----------------------------
+        Shape: {df.shape[0]} rows x {df.shape[1]} columns
+
+        Column Data Types:
+        {column_types}
+
+        Missing Value Percentage:
+        {missing_summary}
+
+        {unique_counts_title}:
+        {unique_counts_summary}
+
+        {preview_title}:
+        {preview.to_string()}
+
+        {description_title}:
+        {description_text}
+
+        Data Info:
+        {profile["info"]}
+        """
+    return summary_text.strip()
+
+
+def _profile_dataframe_approximate(df: pd.DataFrame, n_sample=30, skip_stats=False) -> Dict[str, object]:
+    """
+    Stream over a DataFrame in row chunks, keeping per-column state whose size does not depend on
+    the number of rows: exact null counts and moments (Chan et al. parallel update), HyperLogLog
+    registers for distinct counts, and a bottom-k uniform row sample for quantiles and previews.
+    """
+    n_rows, n_cols = df.shape
+    sample_size = max(_APPROX_SAMPLE_ROWS, n_sample)
+    rng = np.random.default_rng(_APPROX_SEED)
+
+    numeric = [
+        pd.api.types.is_numeric_dtype(dtype)
+        and not pd.api.types.is_bool_dtype(dtype)
+        and not pd.api.types.is_complex_dtype(dtype)
+        for dtype in df.dtypes
+    ]
+    null_counts = np.zeros(n_cols, dtype=np.int64)
+    registers = np.zeros((n_cols, _HLL_M), dtype=np.uint8)
+    moments = np.zeros((n_cols, 3))  # count, mean, M2
+    minimums = np.full(n_cols, np.inf)
+    maximums = np.full(n_cols, -np.inf)
+    sample_keys = np.empty(0)
+    sample_positions = np.empty(0, dtype=np.int64)
+
+    for start in range(0, n_rows, _APPROX_CHUNK_ROWS):
+        stop = min(start + _APPROX_CHUNK_ROWS, n_rows)
+
+        # Bottom-k sampling: keep the rows with the smallest random keys seen so far
+        keys = np.concatenate([sample_keys, rng.random(stop - start)])
+        positions = np.concatenate([sample_positions, np.arange(start, stop)])
+        if len(keys) > sample_size:
+            keep = np.argpartition(keys, sample_size - 1)[:sample_size]
+            keys, positions = keys[keep], positions[keep]
+        sample_keys, sample_positions = keys, positions
+
+        if skip_stats:
+            continue
+
+        chunk = df.iloc[start:stop]
+        for position in range(n_cols):
+            col = chunk.iloc[:, position]
+            if not numeric[position]:
+                hashes, n_null = _hash_distinct_values(col)
+                null_counts[position] += n_null
+                _hll_update(registers[position], hashes)
+                continue
+
+            values = col.to_numpy(dtype=np.float64, na_value=np.nan)
+            mask = np.isnan(values)
+            n_null = int(np.count_nonzero(mask))
+            null_counts[position] += n_null
+            valid = values[~mask] if n_null else values
+            if len(valid) == 0:
+                continue
+
+            _hll_update(registers[position], pd.util.hash_array(valid))
+
+            count, mean, m2 = moments[position]
+            chunk_count = len(valid)
+            chunk_mean = valid.mean()
+            chunk_m2 = ((valid - chunk_mean) ** 2).sum()
+            total = count + chunk_count
+            delta = chunk_mean - mean
+            moments[position] = (
+                total,
+                mean + delta * chunk_count / total,
+                m2 + chunk_m2 + delta ** 2 * count * chunk_count / total,
+            )
+            minimums[position] = min(minimums[position], valid.min())
+            maximums[position] = max(maximums[position], valid.max())
+
+    # Preview rows: a uniform subsample of the sample, shown in original row order
+    order = np.argsort(sample_keys)
+    preview_positions = np.sort(sample_positions[order[:n_sample]])
+    sample_positions = np.sort(sample_positions)
+
+    profile = {
+        "preview_positions": preview_positions,
+        "sample_size": len(sample_positions),
+    }
+    if skip_stats:
+        return profile
+
+    describe = None
+    numeric_positions = [position for position in range(n_cols) if numeric[position]]
+    if numeric_positions:
+        sample = df.iloc[sample_positions, numeric_positions]
+        stat_index = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+        columns = []
+        for i, position in enumerate(numeric_positions):
+            count, mean, m2 = moments[position]
+            sampled = sample.iloc[:, i].to_numpy(dtype=np.float64, na_value=np.nan)
+            sampled = sampled[~np.isnan(sampled)]
+            if count:
+                quantiles = np.percentile(sampled, [25.0, 50.0, 75.0]).tolist() if len(sampled) else [np.nan] * 3
+                stats = [count, mean, np.sqrt(m2 / (count - 1)) if count > 1 else np.nan, minimums[position]]
+                stats += quantiles + [maximums[position]]
+            else:
+                stats = [0.0] + [np.nan] * 7
+            columns.append(pd.Series(stats, index=stat_index, name=df.columns[position]))
+        describe = pd.concat(columns, axis=1, sort=False)
+        describe.columns = df.columns[numeric_positions]
+
+    null_counts = pd.Series(null_counts, index=df.columns, dtype=np.int64)
+    profile.update({
+        "null_counts": null_counts,
+        "unique_counts": pd.Series([_hll_estimate(r) for r in registers], index=df.columns, dtype=np.int64),
+        "describe": describe,
+        "info": _info(df, n_rows - null_counts),
+    })
+    return profile
+
+
+def _hash_distinct_values(col: pd.Series) -> Tuple[np.ndarray, int]:
+    """
+    64-bit hashes of a non-numeric column's values for `_hll_update`, and its null count. Hashes are
+    computed on the native representation (int64 for datetimes, timedeltas and periods, one hash
+    per distinct value otherwise) rather than on boxed Python objects.
+    """
+    array = col.array
+    if hasattr(array, "asi8"):
+        mask = np.asarray(array.isna())
+        return pd.util.hash_array(array.asi8[~mask]), int(np.count_nonzero(mask))
+
+    n_null = int(np.count_nonzero(array.isna()))
+    try:
+        uniques = pd.unique(array)
+    except TypeError:
+        # Dict cells (e.g. from JSON data) are unhashable; count them by their string form, as
+        # the exact summary does
+        uniques = pd.unique(col.map(_stringify_dict).array)
+    uniques = pd.Series(uniques, copy=False).dropna()
+    return pd.util.hash_pandas_object(uniques, index=False).to_numpy(), n_null
+
+
+def _hll_update(registers: np.ndarray, hashes: np.ndarray) -> None:
+    """Add 64-bit hashes to a HyperLogLog register array (in place)."""
+    index = (hashes >> np.uint64(64 - _HLL_P)).astype(np.intp)
+    remainder = hashes & np.uint64((1 << (64 - _HLL_P)) - 1)
+    # Rank = position of the leftmost 1-bit in the remaining bits. The remainder has fewer than
+    # 53 bits, so frexp's exponent is its exact bit length.
+    bit_length = np.frexp(remainder.astype(np.float64))[1]
+    rank = (64 - _HLL_P + 1 - bit_length).astype(np.uint8)
+    np.maximum.at(registers, index, rank)
+
+
+def _hll_estimate(registers: np.ndarray) -> int:
+    """HyperLogLog cardinality estimate, with linear counting for small cardinalities."""
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * np.log(m / zeros)
+    return int(round(estimate))
+
+
+def _stringify_dict(x):
+    return str(x) if isinstance(x, dict) else x
+
+
+def _stringify_dict_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Equivalent to `df.apply(lambda col: col.map(_stringify_dict))`, without the per-cell Python
+    call on columns that cannot hold dicts. Series.map also normalizes dtypes (e.g. int32 -> int64,
+    float32 -> float64), which is reproduced here with a vectorized astype.
+    """
+    if len(df) == 0:
+        # Series.map keeps the dtype of empty columns, and there are no cells to convert
+        return df.apply(lambda col: col.map(_stringify_dict))
+
+    result = None
+    for position, dtype in enumerate(df.dtypes):
+        if dtype in _MAP_PRESERVED_DTYPES or isinstance(dtype, _MAP_PRESERVED_EXTENSION_DTYPES):
+            continue
+
+        col = df.iloc[:, position]
+        if dtype == object and pd.api.types.infer_dtype(col.to_numpy(), skipna=True) == "string":
+            continue
+
+        if _is_string_extension_dtype(dtype):
+            # String columns cannot hold dicts, but Series.map may convert them to the default
+            # string dtype, so only that conversion is applied
+            target = col.iloc[:1].map(_stringify_dict).dtype
+            if target == dtype:
+                continue
+            new_col = col.astype(target)
+        elif isinstance(dtype, np.dtype) and (dtype.kind, dtype.itemsize) in _MAP_UPCAST_DTYPES:
+            new_col = col.astype(_MAP_UPCAST_DTYPES[(dtype.kind, dtype.itemsize)])
+        else:
+            # Includes categoricals, whose map() only maps the categories
+            new_col = col.map(_stringify_dict)
+
+        if result is None:
+            result = df.copy(deep=False)
+        result.isetitem(position, new_col)
+    return df if result is None else result
+
+
+def _is_string_extension_dtype(dtype) -> bool:
+    """Whether `dtype` is a pandas string dtype (`StringDtype` or an Arrow string type)."""
+    if isinstance(dtype, pd.StringDtype):
+        return True
+    return isinstance(dtype, getattr(pd, "ArrowDtype", ())) and dtype.kind == "U"
+
+
+def _profile_dataframe(df: pd.DataFrame) -> Dict[str, object]:
+    """
+    Compute null counts, distinct counts, `describe()` and `info()` output for a DataFrame,
+    visiting each column once. Numeric columns are sorted once and the sorted values are reused
+    for the distinct count and the quantiles. Results match the equivalent pandas calls.
+    """
+    n_rows = len(df)
+    null_counts = []
+    unique_counts = []
+    numeric_stats = {}
+
+    for position, dtype in enumerate(df.dtypes):
+        col = df.iloc[:, position]
+        if isinstance(dtype, np.dtype) and dtype.kind in "iuf" and n_rows > 0:
+            values = col.to_numpy()
+            if dtype.kind == "f":
+                mask = np.isnan(values)
+                n_null = int(np.count_nonzero(mask))
+                valid = values[~mask] if n_null else values
+            else:
+                n_null = 0
+                valid = values
+            sorted_values = np.sort(valid)
+            n_unique = int(np.count_nonzero(sorted_values[1:] != sorted_values[:-1])) + 1 if len(sorted_values) else 0
+            numeric_stats[position] = (col, sorted_values)
+        else:
+            n_null = int(col.isna().sum())
+            n_unique = int(col.nunique())
+        null_counts.append(n_null)
+        unique_counts.append(n_unique)
+
+    null_counts = pd.Series(null_counts, index=df.columns, dtype=np.int64)
+    unique_counts = pd.Series(unique_counts, index=df.columns, dtype=np.int64)
+
+    return {
+        "null_counts": null_counts,
+        "unique_counts": unique_counts,
+        "describe": _describe(df, numeric_stats, n_rows - null_counts),
+        "info": _info(df, n_rows - null_counts),
+    }
+
+
+def _describe(df: pd.DataFrame, numeric_stats: Dict[int, tuple], counts: pd.Series) -> pd.DataFrame:
+    """Same result as `df.describe()`, reusing the sorted numeric columns from `_profile_dataframe`."""
+    # describe() summarizes numeric and datetime columns (all columns if there are none)
+    selected = df.iloc[:0].select_dtypes(include=[np.number, "datetime"]).columns
+    positions = [position for position, col in enumerate(df.columns) if col in selected]
+    if (
+        len(selected) == 0
+        or not df.columns.is_unique
+        or any(position not in numeric_stats for position in positions)
+    ):
+        return df.describe()
+
+    stat_index = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+    columns = []
+    for position in positions:
+        col, sorted_values = numeric_stats[position]
+        if len(sorted_values):
+            quantiles = np.percentile(sorted_values, [25.0, 50.0, 75.0]).tolist()
+        else:
+            quantiles = [np.nan] * 3
+        if col.dtype.kind == "f":
+            col_min, col_max = col.min(), col.max()
+        else:
+            col_min, col_max = sorted_values[0], sorted_values[-1]
+        stats = [counts.iloc[position], col.mean(), col.std(), col_min] + quantiles + [col_max]
+        columns.append(pd.Series(stats, index=stat_index, name=col.name))
+
+    result = pd.concat(columns, axis=1, sort=False)
+    result.columns = selected.copy()
+    return result
+
+
+def _info(df: pd.DataFrame, counts: pd.Series) -> str:
+    """Same text as `df.info()`, reusing the non-null counts from `_profile_dataframe`."""
+    buffer = io.StringIO()
+    if _DataFrameInfo is None:
+        df.info(buf=buffer)
+    else:
+        _ProfiledDataFrameInfo(df, counts).render(buf=buffer, max_cols=None, verbose=None, show_counts=None)
+    return buffer.getvalue()
+
+
+try:
+    from pandas.io.formats.info import DataFrameInfo as _DataFrameInfo
+except ImportError:
+    _DataFrameInfo = None
+
+if _DataFrameInfo is not None:
+    class _ProfiledDataFrameInfo(_DataFrameInfo):
+        """DataFrame.info() renderer that uses precomputed non-null counts."""
+
+        def __init__(self, data: pd.DataFrame, non_null_counts: pd.Series):
+            super().__init__(data=data)
+            self._non_null_counts = non_null_counts
+
+        @property
+        def non_null_counts(self):
+            return self._non_null_counts
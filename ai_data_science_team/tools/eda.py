@@ -1,5 +1,5 @@
 
-from typing import Annotated, Dict, Tuple, Union
+from typing import Annotated, Any, Dict, Tuple, Union
 
 import os
 import tempfile
@@ -9,11 +9,12 @@ from langchain.tools import tool
 from langgraph.prebuilt import InjectedState  
 
 from ai_data_science_team.tools.dataframe import get_dataframe_summary
+from ai_data_science_team.utils.dataset import to_dataframe
 
 
 @tool(response_format='content')
 def explain_data(
-    data_raw: Annotated[dict, InjectedState("data_raw")],
+    data_raw: Annotated[Any, InjectedState("data_raw")],
     n_sample: int = 30,
     skip_stats: bool = False,
 ):
@@ -35,15 +36,14 @@ def explain_data(
         str: Detailed DataFrame summary.
     """
     print("    * Tool: explain_data")
-    import pandas as pd
     
-    result = get_dataframe_summary(pd.DataFrame(data_raw), n_sample=n_sample, skip_stats=skip_stats)
+    result = get_dataframe_summary(to_dataframe(data_raw), n_sample=n_sample, skip_stats=skip_stats)
     
     return result
 
 @tool(response_format='content_and_artifact')
 def describe_dataset(
-    data_raw: Annotated[dict, InjectedState("data_raw")]
+    data_raw: Annotated[Any, InjectedState("data_raw")]
 ) -> Tuple[str, Dict]:
     """
     Tool: describe_dataset
@@ -70,8 +70,7 @@ def describe_dataset(
         - artifact: A dictionary (derived from DataFrame.describe()) containing detailed statistical measures.
     """
     print("    * Tool: describe_dataset")
-    import pandas as pd
-    df = pd.DataFrame(data_raw)
+    df = to_dataframe(data_raw)
     description_df = df.describe(include='all')
     content = "Summary statistics computed using pandas describe()."
     artifact = {'describe_df': description_df.to_dict()}
@@ -80,7 +79,7 @@ def describe_dataset(
 
 @tool(response_format='content_and_artifact')
 def visualize_missing(
-    data_raw: Annotated[dict, InjectedState("data_raw")],
+    data_raw: Annotated[Any, InjectedState("data_raw")],
     n_sample: int = None
 ) -> Tuple[str, Dict]:
     """
@@ -109,13 +108,12 @@ def visualize_missing(
     except ImportError:
         raise ImportError("Please install the 'missingno' package to use this tool. pip install missingno")
     
-    import pandas as pd
     import base64
     from io import BytesIO
     import matplotlib.pyplot as plt
 
     # Create the DataFrame and sample if n_sample is provided.
-    df = pd.DataFrame(data_raw)
+    df = to_dataframe(data_raw)
     if n_sample is not None:
         df = df.sample(n=n_sample, random_state=42)
 
@@ -151,7 +149,7 @@ def visualize_missing(
 
 @tool(response_format='content_and_artifact')
 def correlation_funnel(
-    data_raw: Annotated[dict, InjectedState("data_raw")],
+    data_raw: Annotated[Any, InjectedState("data_raw")],
     target: str,
     target_bin_index: Union[int, str] = -1,
     corr_method: str = "pearson",
@@ -187,7 +185,6 @@ def correlation_funnel(
         import pytimetk as tk
     except ImportError:
         raise ImportError("Please install the 'pytimetk' package to use this tool. pip install pytimetk")
-    import pandas as pd
     import base64
     from io import BytesIO
     import matplotlib.pyplot as plt
@@ -197,7 +194,7 @@ def correlation_funnel(
     from typing import Union
 
     # Convert the raw injected state into a DataFrame.
-    df = pd.DataFrame(data_raw)
+    df = to_dataframe(data_raw)
     
     # Apply the binarization method.
     df_binarized = df.binarize(
@@ -270,7 +267,7 @@ def correlation_funnel(
 
 @tool(response_format='content_and_artifact')
 def generate_sweetviz_report(
-    data_raw: Annotated[dict, InjectedState("data_raw")],
+    data_raw: Annotated[Any, InjectedState("data_raw")],
     target: str = None,
     report_name: str = "sweetviz_report.html",
     report_directory: str = None,  # <-- Default to None
@@ -309,10 +306,9 @@ def generate_sweetviz_report(
     except ImportError:
         raise ImportError("Please install the 'sweetviz' package to use this tool. Run: pip install sweetviz")
     
-    import pandas as pd
     
     # Convert injected raw data to a DataFrame.
-    df = pd.DataFrame(data_raw)
+    df = to_dataframe(data_raw)
     
     # If no directory is specified, use a temporary directory.
     if not report_directory:
@@ -4,6 +4,8 @@ from typing import Optional, Dict, Any, Union, List, Annotated
 from langgraph.prebuilt import InjectedState
 from langchain.tools import tool
 
+from ai_data_science_team.utils.dataset import to_dataframe
+
 
 @tool(response_format='content_and_artifact')
 def mlflow_search_experiments(
@@ -163,7 +165,7 @@ def mlflow_create_experiment(experiment_name: str) -> str:
 @tool(response_format='content_and_artifact')
 def mlflow_predict_from_run_id(
     run_id: str, 
-    data_raw: Annotated[dict, InjectedState("data_raw")],
+    data_raw: Annotated[Any, InjectedState("data_raw")],
     tracking_uri: Optional[str] = None
 ) -> tuple:
     """
@@ -191,7 +193,7 @@ def mlflow_predict_from_run_id(
     # 1. Check if data is loaded
     if not data_raw:
         return "No data provided for prediction. Please use `data_raw` parameter inside of `invoke_agent()` or `ainvoke_agent()`.", {}
-    df = pd.DataFrame(data_raw)
+    df = to_dataframe(data_raw)
 
     # 2. Prepare model URI
     model_uri = f"runs:/{run_id}/model"
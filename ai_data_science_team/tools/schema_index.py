@@ -0,0 +1,251 @@
+# BUSINESS SCIENCE UNIVERSITY
+# AI DATA SCIENCE TEAM
+# ***
+# Schema Retrieval Index
+
+import hashlib
+import math
+import re
+import threading
+
+import numpy as np
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class SchemaIndex:
+    """
+    A local retrieval index over database tables, used to pick the tables relevant to a question
+    without sending the full database metadata to an LLM.
+
+    Each table is indexed as one document made of its schema and table name, column names, types,
+    comments and sample values. Tables are ranked with BM25 and, if an embedding model is given,
+    by cosine similarity of embeddings, with the two scores blended. The index is updated
+    incrementally: `update()` only re-tokenizes (and re-embeds) tables whose metadata changed.
+
+    Parameters
+    ----------
+    embeddings : langchain_core.embeddings.Embeddings, optional
+        An embedding model (e.g. a local `HuggingFaceEmbeddings`). If None, only BM25 is used.
+    embedding_weight : float, optional
+        Weight of the embedding similarity in the blended score, between 0 and 1. Defaults to 0.5.
+    k1 : float, optional
+        BM25 term-frequency saturation. Defaults to 1.5.
+    b : float, optional
+        BM25 document-length normalization. Defaults to 0.75.
+
+    Examples
+    --------
+    ``` python
+    import sqlalchemy as sql
+    from ai_data_science_team.tools.sql import get_database_metadata
+    from ai_data_science_team.tools.schema_index import SchemaIndex
+
+    engine = sql.create_engine("sqlite:///data/northwind.db")
+    metadata = get_database_metadata(engine, n_samples=5, use_cache=True)
+
+    index = SchemaIndex()
+    index.update(metadata)
+    index.search("Which customers placed the most orders?", k=3)
+
+    # Metadata for the top tables and their foreign-key neighbors
+    subset = index.select(metadata, "Which customers placed the most orders?", k=3)
+    ```
+    """
+
+    def __init__(
+        self,
+        embeddings: Optional[Any] = None,
+        embedding_weight: float = 0.5,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.embeddings = embeddings
+        self.embedding_weight = embedding_weight
+        self.k1 = k1
+        self.b = b
+        self._docs: Dict[Tuple[str, str], dict] = {}
+        self._df: Counter = Counter()
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def update(self, metadata: dict) -> Dict[str, int]:
+        """
+        Adds or refreshes the tables in `metadata` (as returned by `get_database_metadata`).
+        Tables of the schemas in `metadata` that are no longer present are removed. Tables whose
+        text is unchanged are skipped.
+
+        Returns
+        -------
+        dict
+            Counts of "added", "updated", "removed" and "unchanged" tables.
+        """
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        changed = []
+        with self._lock:
+            seen = set()
+            for schema_obj in metadata.get("schemas", []):
+                schema_name = schema_obj["schema_name"]
+                for table_info in schema_obj["tables"]:
+                    key = (schema_name, table_info["table_name"])
+                    seen.add(key)
+                    text = _table_text(schema_name, table_info)
+                    digest = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+                    existing = self._docs.get(key)
+                    if existing is not None and existing["digest"] == digest:
+                        counts["unchanged"] += 1
+                        continue
+                    counts["updated" if existing is not None else "added"] += 1
+                    if existing is not None:
+                        self._remove(key)
+                    self._add(key, text, digest)
+                    changed.append(key)
+
+            schema_names = {schema_obj["schema_name"] for schema_obj in metadata.get("schemas", [])}
+            for key in [key for key in self._docs if key[0] in schema_names and key not in seen]:
+                self._remove(key)
+                counts["removed"] += 1
+
+            pending = [(key, self._docs[key]["text"]) for key in changed]
+
+        if self.embeddings is not None and pending:
+            vectors = self.embeddings.embed_documents([text for _, text in pending])
+            with self._lock:
+                for (key, _), vector in zip(pending, vectors):
+                    if key in self._docs:
+                        self._docs[key]["vector"] = _normalize(vector)
+        return counts
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, str, float]]:
+        """
+        Returns the `k` tables most relevant to `query` as (schema_name, table_name, score),
+        best first. Tables with no matching terms (and, without embeddings, a zero score) are
+        not returned.
+        """
+        scores = self._bm25_scores(query)
+        if self.embeddings is not None and self._docs:
+            query_vector = _normalize(self.embeddings.embed_query(query))
+            max_bm25 = max(scores.values(), default=0.0) or 1.0
+            with self._lock:
+                docs = list(self._docs.items())
+            for key, doc in docs:
+                similarity = float(np.dot(query_vector, doc["vector"])) if doc["vector"] is not None else 0.0
+                scores[key] = (
+                    (1 - self.embedding_weight) * scores.get(key, 0.0) / max_bm25
+                    + self.embedding_weight * max(similarity, 0.0)
+                )
+        ranked = sorted(((score, key) for key, score in scores.items() if score > 0), key=lambda x: (-x[0], x[1]))
+        return [(key[0], key[1], score) for score, key in ranked[:k]]
+
+    def select(self, metadata: dict, query: str, k: int = 5, include_fk_neighbors: bool = True) -> dict:
+        """
+        Returns `metadata` restricted to the top-`k` tables for `query` and, optionally, the
+        tables they reference or are referenced by through foreign keys. Call `update()` with the
+        same metadata first. If nothing matches, `metadata` is returned unchanged.
+        """
+        selected = {(schema_name, table_name) for schema_name, table_name, _ in self.search(query, k=k)}
+        if not selected:
+            return metadata
+        if include_fk_neighbors:
+            selected |= _fk_neighbors(metadata, selected)
+
+        subset = {key: value for key, value in metadata.items() if key != "schemas"}
+        subset["schemas"] = []
+        for schema_obj in metadata.get("schemas", []):
+            tables = [
+                table_info for table_info in schema_obj["tables"]
+                if (schema_obj["schema_name"], table_info["table_name"]) in selected
+            ]
+            if tables:
+                subset["schemas"].append({**schema_obj, "tables": tables})
+        return subset
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._docs)
+
+    # BM25
+
+    def _add(self, key, text, digest):
+        terms = Counter(_tokenize(text))
+        length = sum(terms.values())
+        self._docs[key] = {"digest": digest, "text": text, "terms": terms, "length": length, "vector": None}
+        self._df.update(terms.keys())
+        self._total_length += length
+
+    def _remove(self, key):
+        doc = self._docs.pop(key)
+        for term in doc["terms"]:
+            self._df[term] -= 1
+            if self._df[term] <= 0:
+                del self._df[term]
+        self._total_length -= doc["length"]
+
+    def _bm25_scores(self, query: str) -> Dict[Tuple[str, str], float]:
+        query_terms = set(_tokenize(query))
+        scores = {}
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs or not query_terms:
+                return scores
+            avg_length = self._total_length / n_docs or 1.0
+            idf = {
+                term: math.log(1 + (n_docs - self._df[term] + 0.5) / (self._df[term] + 0.5))
+                for term in query_terms if self._df[term]
+            }
+            for key, doc in self._docs.items():
+                score = 0.0
+                norm = self.k1 * (1 - self.b + self.b * doc["length"] / avg_length)
+                for term, term_idf in idf.items():
+                    tf = doc["terms"].get(term, 0)
+                    if tf:
+                        score += term_idf * tf * (self.k1 + 1) / (tf + norm)
+                if score > 0:
+                    scores[key] = score
+        return scores
+
+
+def _table_text(schema_name: str, table_info: dict) -> str:
+    parts = [schema_name, table_info["table_name"], table_info.get("comment") or ""]
+    for column in table_info.get("columns", []):
+        parts.append(column["name"])
+        parts.append(column.get("type", ""))
+        parts.append(column.get("comment") or "")
+        parts.extend(str(value) for value in column.get("sample_values", [])[:5])
+    return " ".join(part for part in parts if part)
+
+
+_TOKEN_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def _tokenize(text: str) -> List[str]:
+    # Splits snake_case, camelCase and punctuation; light plural stemming so "orders" matches "order"
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text):
+        token = token.lower()
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _fk_neighbors(metadata: dict, selected: set) -> set:
+    neighbors = set()
+    for schema_obj in metadata.get("schemas", []):
+        schema_name = schema_obj["schema_name"]
+        for table_info in schema_obj["tables"]:
+            key = (schema_name, table_info["table_name"])
+            for fk in table_info.get("foreign_keys", []):
+                referred = (schema_name, fk["referred_table"])
+                if key in selected:
+                    neighbors.add(referred)
+                elif referred in selected:
+                    neighbors.add(key)
+    return neighbors
+
+
+def _normalize(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=float)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
@@ -1,10 +1,423 @@
 
+import asyncio
+import copy
+import hashlib
+import io
+import json
+import os
+import pickle
+import re
+import time
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from inspect import signature as inspect_signature
+
 import pandas as pd
 import sqlalchemy as sql
 from sqlalchemy import inspect
 
+from typing import Any, Dict, Optional
+
+from ai_data_science_team.utils.cache import LRUCache
+from ai_data_science_team.utils.dataset import _arrow_roundtrips
+
+
+class DatabaseMetadataCache:
+    """
+    A cache for `get_database_metadata` results, kept in memory and optionally persisted to disk, so repeat
+    questions against the same database do not re-inspect every table and re-query sample values.
+
+    Entries are stored per (connection URL, schema, n_samples). Each entry records a cheap schema
+    signature (the schema's tables with their column names and types, read in one reflection
+    query where the dialect supports it). An entry is reused only while the signature is unchanged
+    and it is younger than `ttl`, so added, dropped or altered tables trigger a rescan of that
+    schema only. Sample values are refreshed when the entry expires or on `refresh()`.
+
+    Parameters
+    ----------
+    cache_dir : str, optional
+        Directory for persisted entries, e.g. `~/.cache/ai_data_science_team/sql_metadata`. Entries
+        include sampled column values, so they are only written to disk when a directory is given.
+        Entries are stored as JSON files; sample values JSON cannot represent (e.g. timestamps or
+        decimals) are stored as text. Defaults to None (memory only). In-memory SQLite databases
+        are never persisted.
+    ttl : float, optional
+        Maximum age of an entry in seconds. None means entries never expire. Defaults to 24 hours.
+    max_entries : int, optional
+        Maximum number of entries kept in memory. Defaults to 256.
+    check_changes : bool, optional
+        Whether to compare the schema signature before reusing an entry. Defaults to True. When
+        False, entries are reused until they expire, saving the signature query.
+
+    Examples
+    --------
+    ``` python
+    import sqlalchemy as sql
+    from ai_data_science_team.tools.sql import (
+        DatabaseMetadataCache, get_database_metadata, get_metadata_cache, set_metadata_cache,
+    )
+
+    set_metadata_cache(DatabaseMetadataCache(cache_dir="~/.cache/ai_data_science_team/sql_metadata", ttl=3600))
+
+    engine = sql.create_engine("sqlite:///data/northwind.db")
+    metadata = get_database_metadata(engine, n_samples=10, use_cache=True)
+
+    # Force a rescan after loading new data
+    get_metadata_cache().refresh(engine)
+    ```
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttl: Optional[float] = 24 * 3600,
+        max_entries: int = 256,
+        check_changes: bool = True,
+    ):
+        self.cache_dir = None if cache_dir is None else os.path.expanduser(cache_dir)
+        self.ttl = ttl
+        self.check_changes = check_changes
+        self._cache = LRUCache(max_entries=max_entries)
+
+    def get(self, key: tuple, signature: Optional[str] = None) -> Optional[dict]:
+        """
+        Returns the cached schema metadata for `key`, or None if it is missing, expired or was
+        recorded with a different `signature`.
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            entry = self._load(key)
+            if entry is not None:
+                self._cache.put(key, entry)
+        if entry is None:
+            return None
+        if self.ttl is not None and time.time() - entry["created_at"] > self.ttl:
+            self._remove(key)
+            return None
+        if self.check_changes and signature is not None and entry["signature"] != signature:
+            self._remove(key)
+            return None
+        return copy.deepcopy(entry["schema"])
+
+    def put(self, key: tuple, signature: Optional[str], schema: dict) -> None:
+        """Stores schema metadata for `key`, in memory and (if enabled) on disk."""
+        entry = {"key": key, "signature": signature, "created_at": time.time(), "schema": schema}
+        self._cache.put(key, entry)
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                # Sample values such as timestamps or decimals are stored as text
+                json.dump(entry, f, default=str)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Read-only or missing cache directory: keep the entry in memory only
+            pass
+
+    def refresh(self, connection: Any = None) -> None:
+        """
+        Invalidates the cached metadata of one database, or of all databases if `connection` is
+        None, so the next `get_database_metadata(..., use_cache=True)` call rescans it.
+
+        Parameters
+        ----------
+        connection : Union[sql.engine.base.Connection, sql.engine.base.Engine, str], optional
+            The database to invalidate, as a connection, an engine or a URL.
+        """
+        url = None if connection is None else _metadata_cache_url(connection)
+        for key in self._cache.keys():
+            if url is None or key[0] == url:
+                self._remove(key)
+        if self.cache_dir is None or not os.path.isdir(self.cache_dir):
+            return
+        for file_name in os.listdir(self.cache_dir):
+            if not file_name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, file_name)
+            if url is not None:
+                entry = self._read(path)
+                if entry is not None and entry["key"][0] != url:
+                    continue
+            _remove_file(path)
+
+    def clear(self) -> None:
+        """Removes all entries, in memory and on disk."""
+        self.refresh()
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and usage of the in-memory layer."""
+        return self._cache.stats()
+
+    def _remove(self, key: tuple) -> None:
+        self._cache.pop(key)
+        path = self._path(key)
+        if path is not None:
+            _remove_file(path)
+
+    def _load(self, key: tuple) -> Optional[dict]:
+        path = self._path(key)
+        if path is None or not os.path.exists(path):
+            return None
+        entry = self._read(path)
+        return entry if entry is not None and entry["key"] == key else None
+
+    def _read(self, path: str) -> Optional[dict]:
+        # Entries are JSON, so a file placed in the cache directory cannot run code when loaded
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            entry["key"] = tuple(entry["key"])
+            return entry
+        except Exception:
+            return None
+
+    def _path(self, key: tuple) -> Optional[str]:
+        if self.cache_dir is None or _is_in_memory_sqlite(key[0]):
+            return None
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+
+_default_metadata_cache = None
+
+
+def get_metadata_cache() -> DatabaseMetadataCache:
+    """
+    Returns the process-wide `DatabaseMetadataCache` used by `get_database_metadata(..., use_cache=True)`,
+    creating it with default settings (in memory only) on first use.
+    """
+    global _default_metadata_cache
+    if _default_metadata_cache is None:
+        _default_metadata_cache = DatabaseMetadataCache()
+    return _default_metadata_cache
+
+
+def set_metadata_cache(cache: DatabaseMetadataCache) -> None:
+    """
+    Replaces the process-wide `DatabaseMetadataCache`, e.g. to change its directory or TTL.
+    """
+    global _default_metadata_cache
+    _default_metadata_cache = cache
+
+
+class SQLResultCache:
+    """
+    A cache for SQL query results, so repeated questions that produce the same query are answered
+    without a database round trip.
+
+    Entries are keyed by the normalized SQL text (see `normalize_sql`), the connection's database
+    URL, an optional data-version token and any fetch options that change the result (such as a
+    row cap). Pass a data-version token that changes whenever the underlying data changes (e.g. the
+    date of the last ETL load) to invalidate stale results without waiting for the TTL. Results are
+    stored as zstd-compressed Parquet (or pickle, for columns Parquet cannot represent exactly),
+    with least-recently-used eviction bounded by number of entries and compressed size.
+
+    Parameters
+    ----------
+    cache_dir : str, optional
+        Directory for persisted entries, so results survive restarts. Defaults to None (in memory
+        only). In-memory SQLite databases are never persisted.
+    ttl : float, optional
+        Maximum age of an entry in seconds. None means entries never expire. Defaults to 1 hour.
+    max_entries : int, optional
+        Maximum number of results kept in memory. Defaults to 128.
+    max_bytes : int, optional
+        Maximum total compressed size of the results kept in memory, in bytes. Defaults to 512 MB.
+    compression : str, optional
+        Parquet compression codec. Defaults to "zstd".
+
+    Examples
+    --------
+    ``` python
+    import pandas as pd
+    import sqlalchemy as sql
+    from ai_data_science_team.tools.sql import SQLResultCache
+
+    cache = SQLResultCache(ttl=600)
+    engine = sql.create_engine("sqlite:///data/northwind.db")
 
-def get_database_metadata(connection, n_samples=10) -> dict:
+    query = "SELECT * FROM orders"
+    key = cache.make_key(query, engine, data_version="2025-01-31")
+    if cache.get(key) is None:
+        cache.put(key, pd.read_sql(query, engine))
+    df, info = cache.get(key)
+    ```
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttl: Optional[float] = 3600,
+        max_entries: int = 128,
+        max_bytes: Optional[int] = 512 * 1024 ** 2,
+        compression: str = "zstd",
+    ):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.compression = compression
+        self._cache = LRUCache(max_entries=max_entries, max_bytes=max_bytes, sizeof=lambda entry: len(entry["payload"]))
+
+    def make_key(self, sql_query: str, connection: Any, data_version: Optional[str] = None, **options) -> str:
+        """
+        Returns the cache key for running `sql_query` on `connection`.
+
+        Parameters
+        ----------
+        sql_query : str
+            The SQL text. Comments, whitespace and trailing semicolons do not change the key.
+        connection : Union[sql.engine.base.Connection, sql.engine.base.Engine, str]
+            The database, as a connection, an engine or a URL.
+        data_version : str, optional
+            A token identifying the version of the data.
+        **options
+            Other settings the result depends on, e.g. `max_rows=1000`.
+        """
+        url = _metadata_cache_url(connection)
+        prefix = ""
+        if _is_in_memory_sqlite(url):
+            # Each in-memory database is private to its engine, and its results are never persisted
+            engine = connection if isinstance(connection, str) else getattr(connection, "engine", connection)
+            url = f"{url}#{id(engine)}"
+            prefix = "memory-"
+        key = repr((normalize_sql(sql_query), url, data_version, sorted(options.items())))
+        return prefix + hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[tuple]:
+        """
+        Returns `(DataFrame, info)` for `key`, or None if it is missing or expired. `info` is the
+        dict passed to `put()`.
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            entry = self._load(key)
+            if entry is not None:
+                self._cache.put(key, entry)
+        if entry is None:
+            return None
+        if self.ttl is not None and time.time() - entry["created_at"] > self.ttl:
+            self._remove(key)
+            return None
+        return _decode_frame(entry["payload"], entry["encoding"]), copy.deepcopy(entry["info"])
+
+    def put(self, key: str, df: pd.DataFrame, info: Optional[dict] = None) -> None:
+        """
+        Stores a query result for `key`, in memory and (if enabled) on disk.
+        """
+        payload, encoding = _encode_frame(df, self.compression)
+        entry = {"key": key, "created_at": time.time(), "payload": payload, "encoding": encoding, "info": info}
+        self._cache.put(key, entry)
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Read-only or missing cache directory: keep the entry in memory only
+            pass
+
+    def invalidate(self, key: str) -> None:
+        """Removes the entry for `key`, in memory and on disk."""
+        self._remove(key)
+
+    def clear(self) -> None:
+        """Removes all entries, in memory and on disk."""
+        self._cache.clear()
+        if self.cache_dir is None or not os.path.isdir(self.cache_dir):
+            return
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith(".pkl"):
+                _remove_file(os.path.join(self.cache_dir, file_name))
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and usage of the in-memory layer."""
+        return self._cache.stats()
+
+    def _remove(self, key: str) -> None:
+        self._cache.pop(key)
+        path = self._path(key)
+        if path is not None:
+            _remove_file(path)
+
+    def _load(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except Exception:
+            return None
+        return entry if entry.get("key") == key else None
+
+    def _path(self, key: str) -> Optional[str]:
+        if self.cache_dir is None or key.startswith("memory-"):
+            return None
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+
+_default_result_cache = None
+
+
+def get_result_cache() -> SQLResultCache:
+    """
+    Returns the process-wide `SQLResultCache` used by the SQL Database Agent, creating it with
+    default settings on first use.
+    """
+    global _default_result_cache
+    if _default_result_cache is None:
+        _default_result_cache = SQLResultCache()
+    return _default_result_cache
+
+
+def set_result_cache(cache: SQLResultCache) -> None:
+    """
+    Replaces the process-wide `SQLResultCache`, e.g. to persist results or change the TTL.
+    """
+    global _default_result_cache
+    _default_result_cache = cache
+
+
+_SQL_TOKEN_PATTERN = re.compile(
+    r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\])"""  # literals and quoted identifiers
+    r"""|((?:\s|--[^\n]*|/\*.*?\*/)+)""",  # whitespace and comments
+    re.DOTALL,
+)
+
+
+def normalize_sql(sql_query: str) -> str:
+    """
+    Normalizes SQL text for use as a cache key: removes comments, collapses whitespace outside
+    string literals and quoted identifiers, and strips trailing semicolons. Literals, identifiers
+    and keyword case are kept as written.
+
+    Parameters
+    ----------
+    sql_query : str
+        The SQL text.
+
+    Returns
+    -------
+    str
+        The normalized SQL.
+    """
+    def replace(match):
+        if match.group(1) is not None:
+            return match.group(1)
+        return " "
+
+    normalized = _SQL_TOKEN_PATTERN.sub(replace, sql_query)
+    return normalized.strip().rstrip(";").strip()
+
+
+def get_database_metadata(connection, n_samples=10, use_cache=False, refresh=False, max_workers=1, table_timeout=None) -> dict:
     """
     Collects metadata and sample data from a database, with safe identifier quoting and
     basic dialect-aware row limiting. Prevents issues with spaces/reserved words in identifiers.
@@ -15,6 +428,21 @@ def get_database_metadata(connection, n_samples=10) -> dict:
         An active SQLAlchemy connection or engine.
     n_samples : int
         Number of sample values to retrieve for each column.
+    use_cache : bool, optional
+        Whether to reuse per-schema metadata from the `DatabaseMetadataCache` returned by
+        `get_metadata_cache()`. Schemas whose tables or columns changed since they were cached,
+        and entries older than the cache's TTL, are rescanned. Defaults to False.
+    refresh : bool, optional
+        When using the cache, rescan every schema and replace the cached entries. Defaults to False.
+    max_workers : int, optional
+        Number of tables inspected and sampled concurrently, each on its own connection from the
+        engine's `QueuePool` (bounded by the pool's size plus overflow). Speeds up cold loads over
+        high-latency connections. Engines with other pools (e.g. in-memory SQLite) are scanned
+        serially. Defaults to 1 (serial, on the given connection).
+    table_timeout : float, optional
+        In concurrent mode, the maximum number of seconds spent on a single table. Tables that time
+        out (or fail) are returned with an "error" entry and no columns, and the rest of the
+        metadata is returned as usual. Schemas with such tables are not cached. Defaults to None.
 
     Returns
     -------
@@ -42,66 +470,41 @@ def get_database_metadata(connection, n_samples=10) -> dict:
         inspector = inspect(sql_engine)
         preparer = inspector.bind.dialect.identifier_preparer
 
-        # For each schema
-        for schema_name in inspector.get_schema_names():
-            schema_obj = {
-                "schema_name": schema_name,
-                "tables": []
+        cache = get_metadata_cache() if use_cache else None
+        cache_url = _metadata_cache_url(sql_engine) if use_cache else None
+
+        # Reuse cached schemas, then scan the rest
+        schema_names = inspector.get_schema_names()
+        cached, signatures = {}, {}
+        for schema_name in schema_names:
+            if cache is None:
+                continue
+            signature = _schema_signature(inspector, schema_name) if cache.check_changes else None
+            schema_obj = None if refresh else cache.get((cache_url, schema_name, n_samples), signature)
+            if schema_obj is not None:
+                cached[schema_name] = schema_obj
+            signatures[schema_name] = signature
+        to_scan = [schema_name for schema_name in schema_names if schema_name not in cached]
+
+        if max_workers > 1 and to_scan and _pool_capacity(sql_engine) > 1:
+            scanned = _get_schemas_metadata_concurrently(
+                sql_engine, inspector, to_scan, dialect_name, n_samples, max_workers, table_timeout
+            )
+        else:
+            scanned = {
+                schema_name: _get_schema_metadata(conn, inspector, preparer, schema_name, dialect_name, n_samples)
+                for schema_name in to_scan
             }
 
-            tables = inspector.get_table_names(schema=schema_name)
-            for table_name in tables:
-                table_info = {
-                    "table_name": table_name,
-                    "columns": [],
-                    "primary_key": [],
-                    "foreign_keys": [],
-                    "indexes": []
-                }
-                # Get columns
-                columns = inspector.get_columns(table_name, schema=schema_name)
-                for col in columns:
-                    col_name = col["name"]
-                    col_type = str(col["type"])
-                    table_name_quoted = f"{preparer.quote_identifier(schema_name)}.{preparer.quote_identifier(table_name)}"
-                    col_name_quoted = preparer.quote_identifier(col_name)
-
-                    # Build query for sample data
-                    query = build_query(col_name_quoted, table_name_quoted, n_samples, dialect_name)
-
-                    # Retrieve sample data
-                    try:
-                        df = pd.read_sql(query, conn)
-                        samples = df[col_name].head(n_samples).tolist()
-                    except Exception as e:
-                        samples = [f"Error retrieving data: {str(e)}"]
-
-                    table_info["columns"].append({
-                        "name": col_name,
-                        "type": col_type,
-                        "sample_values": samples
-                    })
-
-                # Primary keys
-                pk_constraint = inspector.get_pk_constraint(table_name, schema=schema_name)
-                table_info["primary_key"] = pk_constraint.get("constrained_columns", [])
-
-                # Foreign keys
-                fks = inspector.get_foreign_keys(table_name, schema=schema_name)
-                table_info["foreign_keys"] = [
-                    {
-                        "local_cols": fk["constrained_columns"],
-                        "referred_table": fk["referred_table"],
-                        "referred_cols": fk["referred_columns"]
-                    }
-                    for fk in fks
-                ]
-
-                # Indexes
-                idxs = inspector.get_indexes(table_name, schema=schema_name)
-                table_info["indexes"] = idxs
-
-                schema_obj["tables"].append(table_info)
+        # For each schema
+        for schema_name in schema_names:
+            if schema_name in cached:
+                schema_obj = cached[schema_name]
+            else:
+                schema_obj = scanned[schema_name]
+                complete = not any("error" in table_info for table_info in schema_obj["tables"])
+                if cache is not None and complete:
+                    cache.put((cache_url, schema_name, n_samples), signatures[schema_name], schema_obj)
             
             metadata["schemas"].append(schema_obj)
     
@@ -111,6 +514,1056 @@ def get_database_metadata(connection, n_samples=10) -> dict:
 
     return metadata
 
+def get_database_table_names(connection) -> dict:
+    """
+    Lists the tables of every schema, without inspecting columns or sampling data. This is the
+    cheap first step of lazy schema exploration (see `get_tables_metadata`).
+
+    Parameters
+    ----------
+    connection : Union[sql.engine.base.Connection, sql.engine.base.Engine]
+        An active SQLAlchemy connection or engine.
+
+    Returns
+    -------
+    dict
+        The dialect and a mapping of schema name to its list of table names, e.g.
+        `{"dialect": "sqlite", "schemas": {"main": ["customers", "orders"]}}`.
+    """
+    is_engine = isinstance(connection, sql.engine.base.Engine)
+    conn = connection.connect() if is_engine else connection
+    try:
+        inspector = inspect(conn.engine)
+        return {
+            "dialect": conn.engine.dialect.name,
+            "schemas": {
+                schema_name: inspector.get_table_names(schema=schema_name)
+                for schema_name in inspector.get_schema_names()
+            },
+        }
+    finally:
+        if is_engine:
+            conn.close()
+
+
+def get_tables_metadata(connection, table_names, n_samples=10, use_cache=False, max_workers=1, table_timeout=None) -> dict:
+    """
+    Collects metadata and sample data for selected tables only, in the same format as
+    `get_database_metadata`. Used for lazy schema exploration, where the model first sees the
+    table names and then requests details for the tables it needs.
+
+    Parameters
+    ----------
+    connection : Union[sql.engine.base.Connection, sql.engine.base.Engine]
+        An active SQLAlchemy connection or engine.
+    table_names : List[str]
+        Tables to describe, as "schema.table" or just "table" (looked up in every schema).
+        Unknown names are ignored.
+    n_samples : int
+        Number of sample values to retrieve for each column.
+    use_cache : bool, optional
+        Whether to reuse metadata from the `DatabaseMetadataCache`: tables of fully cached schemas
+        are taken from the schema entry, others are cached per table. Entries are invalidated when
+        their schema's tables or columns change. Defaults to False.
+    max_workers : int, optional
+        Number of tables described concurrently. See `get_database_metadata`. Defaults to 1.
+    table_timeout : float, optional
+        Per-table time limit in concurrent mode. See `get_database_metadata`. Defaults to None.
+
+    Returns
+    -------
+    dict
+        Database metadata limited to the requested tables. Schemas without requested tables are omitted.
+    """
+    is_engine = isinstance(connection, sql.engine.base.Engine)
+    conn = connection.connect() if is_engine else connection
+
+    metadata = {
+        "dialect": None,
+        "driver": None,
+        "connection_url": None,
+        "schemas": [],
+    }
+
+    try:
+        sql_engine = conn.engine
+        dialect_name = sql_engine.dialect.name.lower()
+
+        metadata["dialect"] = sql_engine.dialect.name
+        metadata["driver"] = sql_engine.driver
+        metadata["connection_url"] = str(sql_engine.url)
+
+        inspector = inspect(sql_engine)
+        preparer = inspector.bind.dialect.identifier_preparer
+        tables = _resolve_table_names(inspector, table_names)
+
+        cache = get_metadata_cache() if use_cache else None
+        cache_url = _metadata_cache_url(sql_engine) if use_cache else None
+
+        results, signatures = {}, {}
+        for schema_name in dict.fromkeys(schema_name for schema_name, _ in tables):
+            if cache is None:
+                continue
+            signature = _schema_signature(inspector, schema_name) if cache.check_changes else None
+            signatures[schema_name] = signature
+            schema_obj = cache.get((cache_url, schema_name, n_samples), signature)
+            if schema_obj is not None:
+                for table_info in schema_obj["tables"]:
+                    results[(schema_name, table_info["table_name"])] = table_info
+        for schema_name, table_name in tables:
+            if cache is not None and (schema_name, table_name) not in results:
+                table_info = cache.get((cache_url, schema_name, n_samples, table_name), signatures[schema_name])
+                if table_info is not None:
+                    results[(schema_name, table_name)] = table_info
+
+        to_scan = [table for table in tables if table not in results]
+        if max_workers > 1 and len(to_scan) > 1 and _pool_capacity(sql_engine) > 1:
+            scanned = _get_tables_metadata_concurrently(
+                sql_engine, to_scan, dialect_name, n_samples, max_workers, table_timeout
+            )
+        else:
+            scanned = {
+                (schema_name, table_name): _get_table_metadata(
+                    conn, inspector, preparer, schema_name, table_name, dialect_name, n_samples
+                )
+                for schema_name, table_name in to_scan
+            }
+        for (schema_name, table_name), table_info in scanned.items():
+            if cache is not None and "error" not in table_info:
+                cache.put((cache_url, schema_name, n_samples, table_name), signatures[schema_name], table_info)
+        results.update(scanned)
+
+        schemas = {}
+        for schema_name, table_name in tables:
+            schema_obj = schemas.setdefault(schema_name, {"schema_name": schema_name, "tables": []})
+            schema_obj["tables"].append(results[(schema_name, table_name)])
+        metadata["schemas"] = list(schemas.values())
+
+    finally:
+        if is_engine:
+            conn.close()
+
+    return metadata
+
+
+def fetch_query_result(pipeline, connection, chunksize=None, max_rows=None, max_bytes=None, output_path=None):
+    """
+    Runs a SQL pipeline function (e.g. the `sql_database_pipeline` generated by the SQL Database
+    Agent) and fetches its result in chunks, with optional row and size caps, so a broad query such
+    as `SELECT *` on a fact table cannot exhaust memory.
+
+    When `chunksize` (or any cap or `output_path`) is given and the pipeline accepts a `chunksize`
+    argument, it is called as `pipeline(connection, chunksize=...)` and expected to return an
+    iterator of DataFrames, e.g. `pd.read_sql(query, conn.execution_options(stream_results=True),
+    chunksize=chunksize)`, which fetches through a server-side cursor where the driver supports it.
+    Fetching stops as soon as a cap is reached. Pipelines without a `chunksize` argument are called
+    as `pipeline(connection)`; their DataFrame result is truncated after the fact.
+
+    Parameters
+    ----------
+    pipeline : Callable
+        The pipeline function. Called with the connection (and `chunksize`, if it accepts one).
+    connection : sqlalchemy.engine.base.Connection or sqlalchemy.engine.base.Engine
+        The connection passed to the pipeline.
+    chunksize : int, optional
+        Rows per fetched chunk. Defaults to None (no chunking), or to 50,000 when a cap or
+        `output_path` is given.
+    max_rows : int, optional
+        Maximum number of rows kept. Defaults to None (no limit).
+    max_bytes : int, optional
+        Maximum in-memory size of the rows kept, in bytes, estimated per chunk with
+        `DataFrame.memory_usage(deep=True)`. Defaults to None (no limit).
+    output_path : str, optional
+        If given, chunks are written to this Parquet file as they arrive instead of being
+        collected in memory, and the path is returned as the result.
+
+    Returns
+    -------
+    tuple
+        The result (a DataFrame, `output_path`, or the pipeline's return value if it is not a
+        DataFrame) and a dict of fetch metadata: "rows", "bytes", "chunks", "truncated",
+        "truncated_by" ("max_rows", "max_bytes" or None) and "output_path".
+
+    Examples
+    --------
+    ``` python
+    import sqlalchemy as sql
+    from ai_data_science_team.tools.sql import fetch_query_result
+
+    def sql_database_pipeline(connection, chunksize=None):
+        import pandas as pd
+        conn = connection.execution_options(stream_results=True) if chunksize else connection
+        return pd.read_sql("SELECT * FROM orders", conn, chunksize=chunksize)
+
+    conn = sql.create_engine("sqlite:///data/northwind.db").connect()
+    df, info = fetch_query_result(sql_database_pipeline, conn, max_rows=100_000)
+    info["truncated"]
+    ```
+    """
+    limited = max_rows is not None or max_bytes is not None or output_path is not None
+    if chunksize is None and limited:
+        chunksize = _DEFAULT_FETCH_CHUNKSIZE
+    if max_rows is not None:
+        chunksize = max(1, min(chunksize, max_rows + 1))
+
+    if chunksize and _accepts_chunksize(pipeline):
+        result = pipeline(connection, chunksize=chunksize)
+    else:
+        result = pipeline(connection)
+
+    info = {"rows": None, "bytes": None, "chunks": 0, "truncated": False, "truncated_by": None, "output_path": None}
+    if isinstance(result, pd.DataFrame):
+        chunks = iter([result])
+    elif chunksize and hasattr(result, "__next__"):
+        chunks = result
+    else:
+        return result, info
+
+    writer = None
+    kept = []
+    rows = 0
+    nbytes = 0
+    try:
+        for chunk in chunks:
+            if not isinstance(chunk, pd.DataFrame):
+                raise ValueError("The SQL pipeline must return a DataFrame or an iterator of DataFrames.")
+            chunk_bytes = int(chunk.memory_usage(deep=True).sum())
+            keep = len(chunk)
+            if max_rows is not None and rows + keep > max_rows:
+                keep = max_rows - rows
+                info["truncated_by"] = "max_rows"
+            if max_bytes is not None and len(chunk) and nbytes + chunk_bytes * keep / len(chunk) > max_bytes:
+                keep = min(keep, int((max_bytes - nbytes) * len(chunk) / chunk_bytes)) if chunk_bytes else keep
+                info["truncated_by"] = "max_bytes"
+            if keep < len(chunk):
+                chunk = chunk.iloc[:keep]
+                chunk_bytes = int(chunk.memory_usage(deep=True).sum())
+
+            if len(chunk) or not info["chunks"]:
+                if output_path is not None:
+                    writer = _write_parquet_chunk(writer, output_path, chunk)
+                else:
+                    kept.append(chunk)
+                info["chunks"] += 1
+            rows += len(chunk)
+            nbytes += chunk_bytes
+
+            if info["truncated_by"] is not None:
+                info["truncated"] = True
+                break
+            if max_rows is not None and rows >= max_rows:
+                # Stopped exactly at the cap: the query was truncated only if more rows follow
+                if any(len(extra) for extra in chunks):
+                    info.update(truncated=True, truncated_by="max_rows")
+                break
+    finally:
+        if writer is not None:
+            writer.close()
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+    info.update(rows=rows, bytes=nbytes)
+    if output_path is not None:
+        info["output_path"] = output_path
+        return output_path, info
+    if len(kept) == 1:
+        df = kept[0]
+    else:
+        df = pd.concat(kept, ignore_index=True) if kept else pd.DataFrame()
+    return df, info
+
+
+def explain_sql_query(connection, sql_query: str) -> dict:
+    """
+    Runs the dialect's EXPLAIN for a query, without executing it, and summarizes the plan: the
+    estimated result rows and cost where the database reports them, and the tables read with a
+    full scan together with their estimated size.
+
+    Supported dialects: SQLite (`EXPLAIN QUERY PLAN`; no row or cost estimates, table sizes from
+    `max(rowid)`), PostgreSQL (`EXPLAIN (FORMAT JSON)`) and MySQL/MariaDB (`EXPLAIN FORMAT=JSON`).
+    Other dialects return `supported=False`.
+
+    Parameters
+    ----------
+    connection : Union[sql.engine.base.Connection, sql.engine.base.Engine]
+        The database connection (or engine).
+    sql_query : str
+        The query to explain.
+
+    Returns
+    -------
+    dict
+        "dialect", "supported", "estimated_rows", "estimated_cost" (None where unknown),
+        "full_scans" (a list of {"table", "estimated_rows"}), "plan" (the plan as text lines) and
+        "error" (the EXPLAIN error message, if it failed).
+    """
+    is_engine = isinstance(connection, sql.engine.base.Engine)
+    conn = connection.connect() if is_engine else connection
+    dialect_name = conn.dialect.name.lower()
+    sql_query = sql_query.strip().rstrip(";")
+    explanation = {
+        "dialect": dialect_name,
+        "supported": True,
+        "estimated_rows": None,
+        "estimated_cost": None,
+        "full_scans": [],
+        "plan": [],
+        "error": None,
+    }
+    try:
+        if "sqlite" in dialect_name:
+            _explain_sqlite(conn, sql_query, explanation)
+        elif "postgres" in dialect_name:
+            _explain_postgres(conn, sql_query, explanation)
+        elif "mysql" in dialect_name or "mariadb" in dialect_name:
+            _explain_mysql(conn, sql_query, explanation)
+        else:
+            explanation["supported"] = False
+    except Exception as e:
+        _reset_failed_transaction(conn)
+        explanation["error"] = str(e)
+    finally:
+        if is_engine:
+            conn.close()
+    return explanation
+
+
+def check_sql_query_cost(connection, sql_query: str, max_rows=None, max_cost=None, full_scan_rows=None) -> dict:
+    """
+    A pre-flight check for a generated query: explains it (see `explain_sql_query`) and lists the
+    reasons it is too expensive to run.
+
+    Parameters
+    ----------
+    connection : Union[sql.engine.base.Connection, sql.engine.base.Engine]
+        The database connection (or engine).
+    sql_query : str
+        The query to check.
+    max_rows : int, optional
+        Maximum estimated number of result rows. Defaults to None (no limit).
+    max_cost : float, optional
+        Maximum estimated cost, in the database's planner units. Defaults to None (no limit).
+    full_scan_rows : int, optional
+        Full scans of tables estimated to have more rows than this are flagged, unless the rows the
+        scan feeds into the result are bounded: by a top-level LIMIT of at most this many rows, by
+        a top-level aggregate function without GROUP BY (one result row), by a GROUP BY whose
+        estimated result rows are at most `max_rows` (PostgreSQL, MySQL), or, on PostgreSQL, by a
+        plan estimate of at most this many rows on the scan or a plan node above it. Defaults to
+        None.
+
+    Returns
+    -------
+    dict
+        The `explain_sql_query` result plus "issues" (a list of messages), "issue_types" (the type
+        of each issue: "max_rows", "max_cost" or "full_scan") and "ok" (True if there are no
+        issues). Queries that cannot be explained pass the check.
+
+    Examples
+    --------
+    ``` python
+    import sqlalchemy as sql
+    from ai_data_science_team.tools.sql import check_sql_query_cost
+
+    engine = sql.create_engine("sqlite:///data/northwind.db")
+    check = check_sql_query_cost(engine, "SELECT * FROM orders", full_scan_rows=100_000)
+    check["ok"], check["issues"]
+    ```
+    """
+    check = explain_sql_query(connection, sql_query)
+    issues = []
+    issue_types = []
+    if max_rows is not None and check["estimated_rows"] is not None and check["estimated_rows"] > max_rows:
+        issues.append(f"estimated {check['estimated_rows']:,} result rows (limit {max_rows:,})")
+        issue_types.append("max_rows")
+    if max_cost is not None and check["estimated_cost"] is not None and check["estimated_cost"] > max_cost:
+        issues.append(f"estimated cost {check['estimated_cost']:,.0f} (limit {max_cost:,.0f})")
+        issue_types.append("max_cost")
+    bounded = full_scan_rows is not None and _has_bounded_output(sql_query, full_scan_rows)
+    if not bounded and full_scan_rows is not None and max_rows is not None and _has_group_by(sql_query):
+        # The number of groups is only known from the plan's estimate (not available on SQLite)
+        bounded = check["estimated_rows"] is not None and check["estimated_rows"] <= max_rows
+    if full_scan_rows is not None and not bounded:
+        for scan in check["full_scans"]:
+            if scan["estimated_rows"] is None or scan["estimated_rows"] <= full_scan_rows:
+                continue
+            if scan.get("output_rows") is not None and scan["output_rows"] <= full_scan_rows:
+                continue
+            issues.append(
+                f"full scan of table {scan['table']} (about {scan['estimated_rows']:,} rows, limit {full_scan_rows:,})"
+            )
+            issue_types.append("full_scan")
+    check["issues"] = issues
+    check["issue_types"] = issue_types
+    check["ok"] = not issues
+    return check
+
+
+def limit_sql_query(sql_query: str, n: int, dialect_name: str) -> str:
+    """Wraps a query so it returns at most `n` rows."""
+    sql_query = sql_query.strip().rstrip(";")
+    if "mssql" in dialect_name:
+        return f"SELECT TOP {n} * FROM (\n{sql_query}\n) AS limited_query"
+    if "oracle" in dialect_name:
+        return f"SELECT * FROM (\n{sql_query}\n) WHERE ROWNUM <= {n}"
+    return f"SELECT * FROM (\n{sql_query}\n) AS limited_query LIMIT {n}"
+
+
+# EXPLAIN runs the raw query text like pd.read_sql does, so ":name" in literals is not a bind parameter
+
+def _explain_sqlite(conn, sql_query, explanation) -> None:
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql_query}").fetchall()
+    aliases = _table_aliases(sql_query)
+    table_names = {name.lower(): name for name in inspect(conn).get_table_names()}
+    for row in rows:
+        detail = row[-1]
+        explanation["plan"].append(detail)
+        match = re.match(r"SCAN (?:TABLE )?([^\s(]+)", detail)
+        if match is None or match.group(1) == "CONSTANT":
+            continue
+        name = match.group(1).strip('"`[]')
+        table = table_names.get(name.lower()) or table_names.get(aliases.get(name.lower(), "").lower())
+        if table is None:
+            continue
+        explanation["full_scans"].append({"table": table, "estimated_rows": _estimate_row_count(conn, None, table, "sqlite")})
+
+
+def _explain_postgres(conn, sql_query, explanation) -> None:
+    plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql_query}").scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    root = plan[0]["Plan"]
+    explanation["estimated_rows"] = int(root.get("Plan Rows", 0))
+    explanation["estimated_cost"] = float(root.get("Total Cost", 0.0))
+
+    def walk(node, depth, output_rows):
+        # output_rows: the fewest estimated rows on the path from the root (e.g. a Limit or an Aggregate)
+        relation = node.get("Relation Name")
+        output_rows = min(output_rows, int(node.get("Plan Rows", 0)))
+        explanation["plan"].append(
+            "  " * depth + f"{node.get('Node Type')}{' on ' + relation if relation else ''} "
+            f"(rows={node.get('Plan Rows')}, cost={node.get('Total Cost')})"
+        )
+        if node.get("Node Type") == "Seq Scan" and relation:
+            schema_name = node.get("Schema") or conn.dialect.default_schema_name or "public"
+            estimated_rows = _estimate_row_count(conn, schema_name, relation, "postgresql")
+            explanation["full_scans"].append({
+                "table": f"{schema_name}.{relation}",
+                "estimated_rows": estimated_rows if estimated_rows is not None else int(node.get("Plan Rows", 0)),
+                "output_rows": output_rows,
+            })
+        for child in node.get("Plans", []):
+            walk(child, depth + 1, output_rows)
+
+    walk(root, 0, float("inf"))
+
+
+def _explain_mysql(conn, sql_query, explanation) -> None:
+    plan = json.loads(conn.exec_driver_sql(f"EXPLAIN FORMAT=JSON {sql_query}").scalar())
+    query_block = plan.get("query_block", {})
+    cost = query_block.get("cost_info", {}).get("query_cost")
+    explanation["estimated_cost"] = float(cost) if cost is not None else None
+
+    produced = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            table = node.get("table")
+            if isinstance(table, dict) and "table_name" in table:
+                examined = int(table.get("rows_examined_per_scan", 0))
+                produced.append(int(table.get("rows_produced_per_join", examined)))
+                explanation["plan"].append(
+                    f"{table.get('access_type')} on {table['table_name']} (rows examined={examined})"
+                )
+                if table.get("access_type") == "ALL":
+                    explanation["full_scans"].append({"table": table["table_name"], "estimated_rows": examined})
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(query_block)
+    explanation["estimated_rows"] = max(produced) if produced else None
+
+
+def _has_bounded_output(sql_query: str, max_rows: int) -> bool:
+    # Whether the query's top level returns at most max_rows rows (LIMIT / FETCH FIRST) or a single
+    # aggregate row. GROUP BY is not bounded by itself: grouping on a key returns one row per key.
+    top_level = _top_level_sql(sql_query)
+    limit = re.search(r"\bLIMIT\s+(\d+)(?:\s*,\s*(\d+))?", top_level, flags=re.IGNORECASE)
+    if limit is not None and int(limit.group(2) or limit.group(1)) <= max_rows:
+        return True
+    fetch = re.search(r"\bFETCH\s+(?:FIRST|NEXT)\s+(\d+)\s+ROWS?\s+ONLY\b", top_level, flags=re.IGNORECASE)
+    if fetch is not None and int(fetch.group(1)) <= max_rows:
+        return True
+    if re.search(r"\b(?:UNION|EXCEPT|INTERSECT)\b", top_level, flags=re.IGNORECASE):
+        return False
+    if _has_group_by(sql_query):
+        return False
+    select_list = re.search(r"\bSELECT\b(.*?)\bFROM\b", top_level, flags=re.IGNORECASE | re.DOTALL)
+    return select_list is not None and re.search(
+        rf"\b(?:{_SQL_AGGREGATE_FUNCTIONS})\s*\(\)(?!\s*OVER\b)", select_list.group(1), flags=re.IGNORECASE
+    ) is not None
+
+
+def _has_group_by(sql_query: str) -> bool:
+    return re.search(r"\bGROUP\s+BY\b", _top_level_sql(sql_query), flags=re.IGNORECASE) is not None
+
+
+def _top_level_sql(sql_query: str) -> str:
+    # The query without comments, string literals and the contents of parentheses (subqueries, arguments)
+    text = re.sub(r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'", " ", sql_query, flags=re.DOTALL)
+    depth = 0
+    top_level = []
+    for char in text:
+        if char == "(":
+            if depth == 0:
+                top_level.append(char)
+            depth += 1
+        elif char == ")":
+            depth = max(depth - 1, 0)
+            if depth == 0:
+                top_level.append(char)
+        elif depth == 0:
+            top_level.append(char)
+    return "".join(top_level)
+
+
+_SQL_AGGREGATE_FUNCTIONS = (
+    "COUNT|SUM|AVG|MIN|MAX|TOTAL|GROUP_CONCAT|STRING_AGG|ARRAY_AGG|BOOL_AND|BOOL_OR|"
+    "STDDEV|STDDEV_POP|STDDEV_SAMP|VARIANCE|VAR_POP|VAR_SAMP"
+)
+
+
+def _table_aliases(sql_query: str) -> dict:
+    # Maps the aliases in "FROM table [AS] alias" / "JOIN table [AS] alias" to table names
+    aliases = {}
+    pattern = r"\b(?:FROM|JOIN)\s+([\w.\"`\[\]]+)(?:\s+(?:AS\s+)?(\w+))?"
+    for table, alias in re.findall(pattern, sql_query, flags=re.IGNORECASE):
+        if alias and alias.upper() not in _SQL_CLAUSE_KEYWORDS:
+            aliases[alias.lower()] = table.split(".")[-1].strip('"`[]')
+    return aliases
+
+
+_SQL_CLAUSE_KEYWORDS = {
+    "WHERE", "JOIN", "INNER", "LEFT", "RIGHT", "FULL", "OUTER", "CROSS", "NATURAL", "ON", "USING",
+    "GROUP", "ORDER", "HAVING", "LIMIT", "OFFSET", "UNION", "EXCEPT", "INTERSECT", "WINDOW",
+}
+
+
+def is_async_connection(connection) -> bool:
+    """Returns True if `connection` is a SQLAlchemy `AsyncEngine` or `AsyncConnection`."""
+    try:
+        from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+    except ImportError:
+        # The asyncio extension needs greenlet; without it there are no async connections
+        return False
+    return isinstance(connection, (AsyncEngine, AsyncConnection))
+
+
+async def arun_sync(connection, function, *args, **kwargs):
+    """
+    Awaits a function that takes a synchronous SQLAlchemy connection as its first argument, such
+    as `get_database_metadata` or a generated SQL pipeline function.
+
+    With an `AsyncEngine` or `AsyncConnection`, the function runs through
+    `AsyncConnection.run_sync()`: its SQL is awaited on the event loop through the async driver
+    (e.g. aiosqlite, asyncpg), without a thread, and cancelling the awaiting task cancels the
+    statement in progress. With a synchronous engine or connection, the function runs in a worker
+    thread so the event loop is not blocked.
+
+    Parameters
+    ----------
+    connection : Union[AsyncEngine, AsyncConnection, sql.engine.base.Engine, sql.engine.base.Connection]
+        The database connection (or engine).
+    function : Callable
+        Called as `function(sync_connection, *args, **kwargs)`.
+
+    Examples
+    --------
+    ``` python
+    import asyncio
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from ai_data_science_team.tools.sql import arun_sync, get_database_metadata
+
+    engine = create_async_engine("sqlite+aiosqlite:///data/northwind.db")
+    metadata = asyncio.run(arun_sync(engine, get_database_metadata, n_samples=5))
+    ```
+    """
+    if not is_async_connection(connection):
+        return await asyncio.to_thread(function, connection, *args, **kwargs)
+
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+    if isinstance(connection, AsyncEngine):
+        async with connection.connect() as conn:
+            return await conn.run_sync(function, *args, **kwargs)
+    return await connection.run_sync(function, *args, **kwargs)
+
+
+async def aget_database_metadata(connection, n_samples=10, use_cache=False, refresh=False, max_workers=1, table_timeout=None) -> dict:
+    """
+    Async version of `get_database_metadata`. With an `AsyncEngine`, tables are collected on the
+    event loop through the async driver, concurrently (up to `max_workers`) on separate pooled
+    connections, and tables exceeding `table_timeout` are cancelled. See `arun_sync`.
+    """
+    return await arun_sync(
+        connection, get_database_metadata, n_samples=n_samples, use_cache=use_cache, refresh=refresh,
+        max_workers=max_workers, table_timeout=table_timeout,
+    )
+
+
+async def aget_database_table_names(connection) -> dict:
+    """Async version of `get_database_table_names`. See `arun_sync`."""
+    return await arun_sync(connection, get_database_table_names)
+
+
+async def aget_tables_metadata(connection, table_names, n_samples=10, use_cache=False, max_workers=1, table_timeout=None) -> dict:
+    """Async version of `get_tables_metadata`. See `aget_database_metadata`."""
+    return await arun_sync(
+        connection, get_tables_metadata, table_names, n_samples=n_samples, use_cache=use_cache,
+        max_workers=max_workers, table_timeout=table_timeout,
+    )
+
+
+def _resolve_table_names(inspector, table_names) -> list:
+    # Maps "schema.table" or "table" names to (schema, table) pairs, in request order, without duplicates
+    all_tables = [
+        (schema_name, table_name)
+        for schema_name in inspector.get_schema_names()
+        for table_name in inspector.get_table_names(schema=schema_name)
+    ]
+    resolved = []
+    for name in table_names:
+        name = str(name).strip().strip('"`[]')
+        matches = [table for table in all_tables if f"{table[0]}.{table[1]}" == name]
+        if not matches:
+            matches = [table for table in all_tables if table[1] == name]
+        if not matches:
+            matches = [table for table in all_tables if table[1].lower() == name.lower()]
+        for table in matches:
+            if table not in resolved:
+                resolved.append(table)
+    return resolved
+
+
+def _get_schema_metadata(conn, inspector, preparer, schema_name, dialect_name, n_samples) -> dict:
+    schema_obj = {
+        "schema_name": schema_name,
+        "tables": []
+    }
+
+    tables = inspector.get_table_names(schema=schema_name)
+    for table_name in tables:
+        table_info = _get_table_metadata(conn, inspector, preparer, schema_name, table_name, dialect_name, n_samples)
+        schema_obj["tables"].append(table_info)
+
+    return schema_obj
+
+
+def _get_table_metadata(conn, inspector, preparer, schema_name, table_name, dialect_name, n_samples) -> dict:
+    table_info = {
+        "table_name": table_name,
+        "columns": [],
+        "primary_key": [],
+        "foreign_keys": [],
+        "indexes": []
+    }
+    # Get columns
+    columns = inspector.get_columns(table_name, schema=schema_name)
+    col_names = [col["name"] for col in columns]
+
+    # Retrieve sample data for all columns from one sampled row set
+    column_samples = get_table_samples(conn, preparer, schema_name, table_name, col_names, n_samples, dialect_name)
+
+    for col, samples in zip(columns, column_samples):
+        column_info = {
+            "name": col["name"],
+            "type": str(col["type"]),
+            "sample_values": samples
+        }
+        if col.get("comment"):
+            column_info["comment"] = col["comment"]
+        table_info["columns"].append(column_info)
+
+    # Primary keys
+    pk_constraint = inspector.get_pk_constraint(table_name, schema=schema_name)
+    table_info["primary_key"] = pk_constraint.get("constrained_columns", [])
+
+    # Foreign keys
+    fks = inspector.get_foreign_keys(table_name, schema=schema_name)
+    table_info["foreign_keys"] = [
+        {
+            "local_cols": fk["constrained_columns"],
+            "referred_table": fk["referred_table"],
+            "referred_cols": fk["referred_columns"]
+        }
+        for fk in fks
+    ]
+
+    # Indexes
+    idxs = inspector.get_indexes(table_name, schema=schema_name)
+    table_info["indexes"] = idxs
+
+    return table_info
+
+
+def _get_schemas_metadata_concurrently(engine, inspector, schema_names, dialect_name, n_samples, max_workers, table_timeout) -> dict:
+    # Table names are listed serially (one cheap query per schema); the per-table work is fanned out
+    tables = [
+        (schema_name, table_name)
+        for schema_name in schema_names
+        for table_name in inspector.get_table_names(schema=schema_name)
+    ]
+    results = _get_tables_metadata_concurrently(engine, tables, dialect_name, n_samples, max_workers, table_timeout)
+
+    scanned = {schema_name: {"schema_name": schema_name, "tables": []} for schema_name in schema_names}
+    for schema_name, table_name in tables:
+        scanned[schema_name]["tables"].append(results[(schema_name, table_name)])
+    return scanned
+
+
+def _get_tables_metadata_concurrently(engine, tables, dialect_name, n_samples, max_workers, table_timeout) -> dict:
+    if engine.dialect.is_async:
+        return _get_tables_metadata_on_event_loop(engine, tables, dialect_name, n_samples, max_workers, table_timeout)
+
+    started = {}
+
+    def collect(schema_name, table_name):
+        started[(schema_name, table_name)] = time.monotonic()
+        with engine.connect() as conn:
+            return _get_table_metadata(
+                conn, inspect(conn), conn.dialect.identifier_preparer, schema_name, table_name, dialect_name, n_samples
+            )
+
+    results = {}
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, _pool_capacity(engine)))
+    try:
+        futures = {pool.submit(collect, *table): table for table in tables}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.05 if table_timeout else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                table = futures[future]
+                try:
+                    results[table] = future.result()
+                except Exception as e:
+                    results[table] = _table_error(table[1], f"Error retrieving metadata: {str(e)}")
+            if table_timeout is None:
+                continue
+            now = time.monotonic()
+            for future in list(pending):
+                table = futures[future]
+                if table in started and now - started[table] > table_timeout:
+                    # The worker thread cannot be interrupted; it returns its connection when done
+                    pending.discard(future)
+                    results[table] = _table_error(table[1], f"Timed out after {table_timeout} seconds.")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def _get_tables_metadata_on_event_loop(engine, tables, dialect_name, n_samples, max_workers, table_timeout) -> dict:
+    # Reached through AsyncConnection.run_sync(): fan the tables out as coroutines on the running
+    # event loop, each on its own pooled async connection; timed-out tables are cancelled
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlalchemy.util import await_only
+
+    async_engine = AsyncEngine(engine)
+    semaphore = asyncio.Semaphore(min(max_workers, _pool_capacity(engine)))
+
+    def collect(conn, schema_name, table_name):
+        return _get_table_metadata(
+            conn, inspect(conn), conn.dialect.identifier_preparer, schema_name, table_name, dialect_name, n_samples
+        )
+
+    async def acollect(schema_name, table_name):
+        async with async_engine.connect() as conn:
+            return await conn.run_sync(collect, schema_name, table_name)
+
+    async def acollect_with_timeout(schema_name, table_name):
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(acollect(schema_name, table_name), table_timeout)
+            except asyncio.TimeoutError:
+                return _table_error(table_name, f"Timed out after {table_timeout} seconds.")
+            except Exception as e:
+                return _table_error(table_name, f"Error retrieving metadata: {str(e)}")
+
+    async def gather():
+        return await asyncio.gather(*(acollect_with_timeout(*table) for table in tables))
+
+    return dict(zip(tables, await_only(gather())))
+
+
+def _table_error(table_name: str, message: str) -> dict:
+    return {
+        "table_name": table_name,
+        "columns": [],
+        "primary_key": [],
+        "foreign_keys": [],
+        "indexes": [],
+        "error": message,
+    }
+
+
+def _pool_capacity(engine) -> int:
+    # Concurrent connections the engine's pool can hand out without blocking; 1 for
+    # single-connection pools (StaticPool, SingletonThreadPool, e.g. in-memory SQLite)
+    pool = engine.pool
+    if not isinstance(pool, sql.pool.QueuePool):
+        return 1
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    if max_overflow < 0:
+        return 1_000_000
+    return pool.size() + max_overflow
+
+
+def _schema_signature(inspector, schema_name) -> str:
+    # Tables with their column names and types. SQLAlchemy 2.x reflects all tables of a schema
+    # in one query; older versions fall back to one query per table.
+    if hasattr(inspector, "get_multi_columns"):
+        multi_columns = inspector.get_multi_columns(schema=schema_name)
+        tables = sorted(
+            (table_name, [(col["name"], str(col["type"])) for col in cols])
+            for (_, table_name), cols in multi_columns.items()
+        )
+    else:
+        tables = [
+            (table_name, [(col["name"], str(col["type"])) for col in inspector.get_columns(table_name, schema=schema_name)])
+            for table_name in sorted(inspector.get_table_names(schema=schema_name))
+        ]
+    return hashlib.blake2b(repr(tables).encode(), digest_size=16).hexdigest()
+
+
+_DEFAULT_FETCH_CHUNKSIZE = 50_000
+
+
+def _accepts_chunksize(pipeline) -> bool:
+    try:
+        parameters = inspect_signature(pipeline).parameters
+    except (TypeError, ValueError):
+        return False
+    return "chunksize" in parameters or any(p.kind == p.VAR_KEYWORD for p in parameters.values())
+
+
+def _write_parquet_chunk(writer, output_path: str, chunk: pd.DataFrame):
+    from ai_data_science_team.utils.streaming import _import_parquet, _to_arrow_table
+
+    pq = _import_parquet()
+    table = _to_arrow_table(chunk, None if writer is None else writer.schema)
+    if writer is None:
+        writer = pq.ParquetWriter(output_path, table.schema)
+    writer.write_table(table)
+    return writer
+
+
+def _encode_frame(df: pd.DataFrame, compression: str) -> tuple:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not _arrow_roundtrips(df):
+            raise TypeError("Result has object columns Parquet would not round-trip.")
+        buffer = io.BytesIO()
+        pq.write_table(pa.Table.from_pandas(df), buffer, compression=compression)
+        return buffer.getvalue(), "parquet"
+    except Exception:
+        return pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL), "pickle"
+
+
+def _decode_frame(payload: bytes, encoding: str) -> pd.DataFrame:
+    if encoding == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_table(io.BytesIO(payload)).to_pandas()
+    return pickle.loads(payload)
+
+
+def _metadata_cache_url(connection) -> str:
+    if isinstance(connection, str):
+        url = sql.engine.make_url(connection)
+    else:
+        url = connection.engine.url if hasattr(connection, "engine") else connection.url
+    return url.render_as_string(hide_password=True)
+
+
+def _is_in_memory_sqlite(url: str) -> bool:
+    url = sql.engine.make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def get_table_samples(conn, preparer, schema_name, table_name, col_names, n_samples, dialect_name) -> list:
+    """
+    Retrieves sample values for all columns of a table with one query on a sampled row set,
+    instead of one sorted full-table query per column.
+
+    Large tables are sampled with the dialect's native cheap sampling: `TABLESAMPLE SYSTEM` on
+    PostgreSQL and SQL Server and `SAMPLE` on Oracle (sized from the catalog's row estimate), and a
+    random rowid range on SQLite. Small tables, tables without an estimate and other dialects use a
+    single random-order or plain limited query. If the sample returns fewer than `n_samples` rows
+    a plain `LIMIT` read is used instead, and if the batched query fails the columns are sampled
+    one by one as before, so a single unreadable column does not hide the others' samples.
+
+    Parameters
+    ----------
+    conn : sql.engine.base.Connection
+        An active SQLAlchemy connection.
+    preparer : sqlalchemy.sql.compiler.IdentifierPreparer
+        The dialect's identifier preparer, used for quoting.
+    schema_name : str
+        The table's schema.
+    table_name : str
+        The table name.
+    col_names : List[str]
+        The columns to sample.
+    n_samples : int
+        Number of sample values to retrieve for each column.
+    dialect_name : str
+        The lower-case dialect name.
+
+    Returns
+    -------
+    list
+        One list of sample values per column, in the order of `col_names`.
+    """
+    if not col_names:
+        return []
+    table_name_quoted = f"{preparer.quote_identifier(schema_name)}.{preparer.quote_identifier(table_name)}"
+    cols_quoted = ", ".join(preparer.quote_identifier(col_name) for col_name in col_names)
+
+    df = None
+    try:
+        query = build_table_sample_query(
+            conn, cols_quoted, table_name_quoted, schema_name, table_name, n_samples, dialect_name
+        )
+        df = pd.read_sql(query, conn)
+        if len(df) < n_samples:
+            limit_query = build_limit_query(cols_quoted, table_name_quoted, n_samples, dialect_name)
+            if limit_query != query:
+                df = pd.read_sql(limit_query, conn)
+    except Exception:
+        _reset_failed_transaction(conn)
+
+    if df is not None and df.shape[1] == len(col_names):
+        return [df.iloc[:, i].head(n_samples).tolist() for i in range(len(col_names))]
+
+    # Fall back to one query per column
+    column_samples = []
+    for col_name in col_names:
+        query = build_query(preparer.quote_identifier(col_name), table_name_quoted, n_samples, dialect_name)
+        try:
+            df = pd.read_sql(query, conn)
+            column_samples.append(df[col_name].head(n_samples).tolist())
+        except Exception as e:
+            _reset_failed_transaction(conn)
+            column_samples.append([f"Error retrieving data: {str(e)}"])
+    return column_samples
+
+
+# Tables with fewer estimated rows are sampled with a random-order query, which is cheap at that size
+_NATIVE_SAMPLING_MIN_ROWS = 10_000
+
+
+def build_table_sample_query(conn, cols_quoted, table_name_quoted, schema_name, table_name, n, dialect_name) -> str:
+    """
+    Builds a query returning about `n` sampled rows of the given (quoted) columns of a table, using
+    the dialect's native sampling for large tables. See `get_table_samples`.
+    """
+    if "sqlite" in dialect_name:
+        # Contiguous rows from a random rowid; max(rowid) is a single index lookup
+        return (
+            f"SELECT {cols_quoted} FROM {table_name_quoted} "
+            f"WHERE rowid >= (SELECT abs(random()) % (max(rowid) + 1) FROM {table_name_quoted}) LIMIT {n}"
+        )
+
+    if "mysql" in dialect_name or "mariadb" in dialect_name:
+        return f"SELECT {cols_quoted} FROM {table_name_quoted} ORDER BY RAND() LIMIT {n}"
+
+    if not any(name in dialect_name for name in ("postgres", "mssql", "oracle")):
+        return build_limit_query(cols_quoted, table_name_quoted, n, dialect_name)
+
+    estimated_rows = _estimate_row_count(conn, schema_name, table_name, dialect_name)
+    if estimated_rows is None or estimated_rows < _NATIVE_SAMPLING_MIN_ROWS:
+        if "postgres" in dialect_name:
+            return f"SELECT {cols_quoted} FROM {table_name_quoted} ORDER BY RANDOM() LIMIT {n}"
+        if "mssql" in dialect_name:
+            return f"SELECT TOP {n} {cols_quoted} FROM {table_name_quoted} ORDER BY NEWID()"
+        return build_limit_query(cols_quoted, table_name_quoted, n, dialect_name)
+
+    # Oversample so block sampling still yields n rows; short samples fall back to a plain LIMIT
+    percent = min(100.0, max(0.000001, 100.0 * n * 10 / estimated_rows))
+    if "postgres" in dialect_name:
+        return f"SELECT {cols_quoted} FROM {table_name_quoted} TABLESAMPLE SYSTEM ({percent:.6f}) LIMIT {n}"
+    if "mssql" in dialect_name:
+        return f"SELECT TOP {n} {cols_quoted} FROM {table_name_quoted} TABLESAMPLE SYSTEM ({percent:.6f} PERCENT)"
+    return f"SELECT {cols_quoted} FROM {table_name_quoted} SAMPLE ({percent:.6f}) WHERE ROWNUM <= {n}"
+
+
+def build_limit_query(cols_quoted: str, table_name_quoted: str, n: int, dialect_name: str) -> str:
+    """Builds a plain (unsorted) query for the first `n` rows of the given (quoted) columns."""
+    if "mssql" in dialect_name:
+        return f"SELECT TOP {n} {cols_quoted} FROM {table_name_quoted}"
+    if "oracle" in dialect_name:
+        return f"SELECT {cols_quoted} FROM {table_name_quoted} WHERE ROWNUM <= {n}"
+    return f"SELECT {cols_quoted} FROM {table_name_quoted} LIMIT {n}"
+
+
+def _estimate_row_count(conn, schema_name, table_name, dialect_name) -> Optional[int]:
+    # Row estimates maintained by the database's statistics; no table scan
+    if "postgres" in dialect_name:
+        query = (
+            "SELECT c.reltuples FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = :schema_name AND c.relname = :table_name"
+        )
+    elif "mssql" in dialect_name:
+        query = (
+            "SELECT SUM(p.rows) FROM sys.partitions p "
+            "JOIN sys.tables t ON p.object_id = t.object_id "
+            "JOIN sys.schemas s ON t.schema_id = s.schema_id "
+            "WHERE s.name = :schema_name AND t.name = :table_name AND p.index_id IN (0, 1)"
+        )
+    elif "oracle" in dialect_name:
+        query = "SELECT num_rows FROM all_tables WHERE owner = :schema_name AND table_name = :table_name"
+    elif "sqlite" in dialect_name:
+        # max(rowid) is a single index lookup; exact unless rows were deleted
+        preparer = conn.dialect.identifier_preparer
+        schema_prefix = f"{preparer.quote_schema(schema_name)}." if schema_name else ""
+        query = f"SELECT max(rowid) FROM {schema_prefix}{preparer.quote(table_name)}"
+    else:
+        return None
+    if "oracle" in dialect_name:
+        # The inspector reports Oracle names in lower case; the catalog stores them in upper case
+        schema_name = conn.dialect.denormalize_name(schema_name)
+        table_name = conn.dialect.denormalize_name(table_name)
+    try:
+        value = conn.execute(sql.text(query), {"schema_name": schema_name, "table_name": table_name}).scalar()
+    except Exception:
+        _reset_failed_transaction(conn)
+        return None
+    if value is None or value < 0:
+        return None
+    return int(value)
+
+
+def _reset_failed_transaction(conn) -> None:
+    # A failed statement aborts the transaction on some databases (e.g. PostgreSQL), which would
+    # make every following metadata query fail too
+    try:
+        if conn.in_transaction():
+            conn.rollback()
+    except Exception:
+        pass
+
+
 def build_query(col_name_quoted: str, table_name_quoted: str, n: int, dialect_name: str) -> str:
     # Example: expand your build_query to handle random sampling if possible
     if "postgres" in dialect_name:
@@ -0,0 +1,149 @@
+# BUSINESS SCIENCE UNIVERSITY
+# AI DATA SCIENCE TEAM
+# ***
+# Caching Utilities
+
+import threading
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """
+    A thread-safe least-recently-used cache bounded by number of entries and/or total size.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Maximum number of entries to keep. None means unbounded. Default is 128.
+    max_bytes : int, optional
+        Maximum total size of the cached values, as measured by `sizeof`. None means unbounded.
+    sizeof : Callable[[Any], int], optional
+        Function returning the size of a value in bytes. Required for `max_bytes` to have an effect.
+        Defaults to counting every value as 0 bytes.
+    on_evict : Callable[[Hashable, Any], None], optional
+        Called with (key, value) for every entry evicted to satisfy the bounds. It is called
+        outside the cache lock, so it may do slow work such as writing the value to disk.
+
+    Examples
+    --------
+    ``` python
+    from ai_data_science_team.utils.cache import LRUCache
+
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.stats()
+    ```
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 128,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._on_evict = on_evict
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value for `key` (marking it as recently used), or `default`."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Adds or replaces an entry, evicting least-recently-used entries as needed."""
+        size = int(self._sizeof(value))
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._sizes.pop(key)
+                del self._data[key]
+            self._data[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            evicted = self._evict()
+        self._notify(evicted)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Removes an entry without calling `on_evict` and returns its value, or `default`."""
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._bytes -= self._sizes.pop(key)
+            return self._data.pop(key)
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value without updating recency or hit/miss counters."""
+        with self._lock:
+            return self._data.get(key, default)
+
+    def keys(self) -> list:
+        """Returns the keys, from least to most recently used."""
+        with self._lock:
+            return list(self._data.keys())
+
+    def clear(self) -> None:
+        """Removes all entries and resets the counters."""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and current usage."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def _evict(self):
+        # Never evict the most recently added entry, even if it alone exceeds max_bytes.
+        evicted = []
+        while len(self._data) > 1 and (
+            (self.max_entries is not None and len(self._data) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key, value = self._data.popitem(last=False)
+            self._bytes -= self._sizes.pop(key)
+            self.evictions += 1
+            evicted.append((key, value))
+        return evicted
+
+    def _notify(self, evicted):
+        if self._on_evict is None:
+            return
+        for key, value in evicted:
+            self._on_evict(key, value)
@@ -0,0 +1,570 @@
+# BUSINESS SCIENCE UNIVERSITY
+# AI DATA SCIENCE TEAM
+# ***
+# Compact SQLite Checkpointer
+
+import asyncio
+import hashlib
+import os
+import random
+import sqlite3
+import threading
+import time
+import zlib
+
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+from langgraph.checkpoint.memory import MemorySaver
+
+try:
+    from langgraph.checkpoint.base import WRITES_IDX_MAP
+except ImportError:  # older langgraph-checkpoint
+    WRITES_IDX_MAP = {}
+
+try:
+    from langgraph.constants import TASKS
+except ImportError:
+    TASKS = "__pregel_tasks"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    created_at REAL NOT NULL,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS channel_values (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value BLOB,
+    blob_hash TEXT,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    blob_hash TEXT,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    blob_hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver):
+    """
+    A persistent LangGraph checkpointer for agent state that holds large datasets, such as the
+    `data_raw` / `data_cleaned` handles of the coding agents in human-in-the-loop mode.
+
+    Unlike `MemorySaver()`, which keeps a full copy of the state for every step in memory, this
+    checkpointer writes to a SQLite database and stores each step compactly:
+
+    - Only state deltas are written: a state value is stored once per version of its channel,
+      and each checkpoint only references the versions it uses. A dataset that does not change
+      during a review session is stored once, not once per step.
+    - Values larger than `inline_max_bytes` (e.g. `DatasetHandle`s, which serialize as Arrow IPC
+      streams) are stored out of line as zlib-compressed blobs referenced by a content hash, so
+      identical values are stored once across steps and threads.
+    - Old threads and checkpoints can be removed with `delete_thread()` and `prune()`; blobs no
+      longer referenced are deleted with them.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path of the SQLite database. Defaults to "logs/checkpoints.sqlite".
+    inline_max_bytes : int, optional
+        Serialized values up to this size are stored inline; larger ones as compressed blobs.
+        Defaults to 1024.
+    compression_level : int, optional
+        zlib compression level of the blobs, 0 (none) to 9. Defaults to 6.
+    serde : SerializerProtocol, optional
+        The LangGraph serializer. Defaults to LangGraph's default serializer.
+
+    Examples
+    --------
+    ``` python
+    from ai_data_science_team.agents import DataCleaningAgent
+    from ai_data_science_team.utils.checkpoint import SQLiteCheckpointSaver
+
+    checkpointer = SQLiteCheckpointSaver("logs/checkpoints.sqlite")
+    agent = DataCleaningAgent(model=llm, human_in_the_loop=True, checkpointer=checkpointer)
+
+    agent.invoke_agent(data_raw=df, config={"configurable": {"thread_id": "session-1"}})
+
+    checkpointer.stats()
+    checkpointer.prune(keep_last=5, max_age=7 * 24 * 3600)
+    ```
+    """
+
+    def __init__(
+        self,
+        path: str = "logs/checkpoints.sqlite",
+        inline_max_bytes: int = 1024,
+        compression_level: int = 6,
+        serde: Optional[Any] = None,
+    ):
+        super().__init__(serde=serde)
+        self.path = path
+        self.inline_max_bytes = inline_max_bytes
+        self.compression_level = compression_level
+        self._lock = threading.RLock()
+        self._connection = None
+
+    # Checkpointer interface
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Returns the checkpoint of `config` (the thread's latest if no checkpoint_id is given)."""
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        with self._lock:
+            connection = self._connect()
+            if checkpoint_id:
+                row = connection.execute(
+                    "SELECT * FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = connection.execute(
+                    "SELECT * FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            return self._checkpoint_tuple(connection, row) if row is not None else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """Lists checkpoints, newest first, optionally by thread, metadata and checkpoint ID."""
+        query = "SELECT * FROM checkpoints"
+        conditions, params = [], []
+        if config is not None:
+            configurable = config["configurable"]
+            conditions.append("thread_id = ?")
+            params.append(configurable["thread_id"])
+            if configurable.get("checkpoint_ns") is not None:
+                conditions.append("checkpoint_ns = ?")
+                params.append(configurable["checkpoint_ns"])
+            if get_checkpoint_id(config):
+                conditions.append("checkpoint_id = ?")
+                params.append(get_checkpoint_id(config))
+        if before is not None and get_checkpoint_id(before):
+            conditions.append("checkpoint_id < ?")
+            params.append(get_checkpoint_id(before))
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            connection = self._connect()
+            rows = connection.execute(query, params).fetchall()
+            results = []
+            for row in rows:
+                if filter and not self._metadata_matches(row, filter):
+                    continue
+                results.append(self._checkpoint_tuple(connection, row))
+                if limit is not None and len(results) >= limit:
+                    break
+        yield from results
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Stores a checkpoint and the channel values that changed since its parent."""
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint = checkpoint.copy()
+        checkpoint.pop("pending_sends", None)
+        values = checkpoint.pop("channel_values")
+
+        with self._lock:
+            connection = self._connect()
+            for channel, version in new_versions.items():
+                if channel in values:
+                    type_, value, blob_hash = self._dump(connection, values[channel])
+                else:
+                    type_, value, blob_hash = "empty", None, None
+                connection.execute(
+                    "INSERT OR REPLACE INTO channel_values "
+                    "(thread_id, checkpoint_ns, channel, version, type, value, blob_hash) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, channel, str(version), type_, value, blob_hash),
+                )
+            checkpoint_type, checkpoint_data = self.serde.dumps_typed(checkpoint)
+            metadata_type, metadata_data = self.serde.dumps_typed(metadata)
+            connection.execute(
+                "INSERT OR REPLACE INTO checkpoints "
+                "(thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, created_at, type, checkpoint, "
+                "metadata_type, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id, checkpoint_ns, checkpoint["id"], configurable.get("checkpoint_id"), time.time(),
+                    checkpoint_type, checkpoint_data, metadata_type, metadata_data,
+                ),
+            )
+            connection.commit()
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Stores the pending writes of a task for the checkpoint of `config`."""
+        configurable = config["configurable"]
+        key = (configurable["thread_id"], configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"])
+        with self._lock:
+            connection = self._connect()
+            for idx, (channel, value) in enumerate(writes):
+                idx = WRITES_IDX_MAP.get(channel, idx)
+                type_, data, blob_hash = self._dump(connection, value)
+                # Regular writes are kept from the first attempt; special writes (errors, interrupts) are replaced
+                connection.execute(
+                    f"INSERT OR {'REPLACE' if idx < 0 else 'IGNORE'} INTO writes "
+                    "(thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, blob_hash, task_path) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*key, task_id, idx, channel, type_, data, blob_hash, task_path),
+                )
+            connection.commit()
+
+    def get_next_version(self, current: Optional[Any], channel: Any) -> str:
+        """
+        Returns the next version of a channel. Versions carry a random suffix, so threads resumed
+        from an earlier checkpoint never reuse a version of the original branch.
+        """
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        results = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for result in results:
+            yield result
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    # Garbage collection
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Deletes all checkpoints and writes of a thread, and the blobs only it referenced."""
+        with self._lock:
+            connection = self._connect()
+            for table in ("checkpoints", "channel_values", "writes"):
+                connection.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            self._delete_unreferenced_blobs(connection)
+            connection.commit()
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def prune(self, keep_last: Optional[int] = None, max_age: Optional[float] = None) -> Dict[str, int]:
+        """
+        Removes old state.
+
+        Parameters
+        ----------
+        keep_last : int, optional
+            Keep only the newest `keep_last` checkpoints of each thread (and the values and
+            writes they reference). Older checkpoints can no longer be resumed from.
+        max_age : float, optional
+            Delete threads whose newest checkpoint is older than `max_age` seconds.
+
+        Returns
+        -------
+        dict
+            The number of "threads", "checkpoints" and "blobs" deleted.
+        """
+        if keep_last is not None and keep_last < 1:
+            raise ValueError("keep_last must be at least 1.")
+        deleted = {"threads": 0, "checkpoints": 0, "blobs": 0}
+        with self._lock:
+            connection = self._connect()
+
+            if max_age is not None:
+                threads = [
+                    row[0] for row in connection.execute(
+                        "SELECT thread_id FROM checkpoints GROUP BY thread_id HAVING MAX(created_at) < ?",
+                        (time.time() - max_age,),
+                    )
+                ]
+                for thread_id in threads:
+                    deleted["checkpoints"] += connection.execute(
+                        "DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,)
+                    ).rowcount
+                    connection.execute("DELETE FROM channel_values WHERE thread_id = ?", (thread_id,))
+                    connection.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+                deleted["threads"] = len(threads)
+
+            if keep_last is not None:
+                namespaces = connection.execute(
+                    "SELECT thread_id, checkpoint_ns FROM checkpoints GROUP BY thread_id, checkpoint_ns HAVING COUNT(*) > ?",
+                    (keep_last,),
+                ).fetchall()
+                for thread_id, checkpoint_ns in namespaces:
+                    deleted["checkpoints"] += self._prune_namespace(connection, thread_id, checkpoint_ns, keep_last)
+
+            deleted["blobs"] = self._delete_unreferenced_blobs(connection)
+            connection.commit()
+        return deleted
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the number of threads, checkpoints, stored channel values, pending writes and
+        blobs, and the bytes used by inline values and by (compressed) blobs.
+        """
+        with self._lock:
+            connection = self._connect()
+            return {
+                "threads": connection.execute("SELECT COUNT(DISTINCT thread_id) FROM checkpoints").fetchone()[0],
+                "checkpoints": connection.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0],
+                "channel_values": connection.execute("SELECT COUNT(*) FROM channel_values").fetchone()[0],
+                "writes": connection.execute("SELECT COUNT(*) FROM writes").fetchone()[0],
+                "blobs": connection.execute("SELECT COUNT(*) FROM blobs").fetchone()[0],
+                "inline_bytes": connection.execute(
+                    "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM channel_values"
+                ).fetchone()[0] + connection.execute(
+                    "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM writes"
+                ).fetchone()[0],
+                "blob_bytes": connection.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM blobs").fetchone()[0],
+                "blob_uncompressed_bytes": connection.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0],
+            }
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    # Internals
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_SCHEMA)
+            self._connection.commit()
+        return self._connection
+
+    def _dump(self, connection: sqlite3.Connection, value: Any) -> Tuple[str, Optional[bytes], Optional[str]]:
+        """Serializes a value; large ones go to the blob table. Returns (type, inline value, blob hash)."""
+        type_, data = self.serde.dumps_typed(value)
+        if len(data) <= self.inline_max_bytes:
+            return type_, data, None
+        blob_hash = hashlib.blake2b(type_.encode() + b"\x00" + data, digest_size=20).hexdigest()
+        exists = connection.execute("SELECT 1 FROM blobs WHERE blob_hash = ?", (blob_hash,)).fetchone()
+        if exists is None:
+            connection.execute(
+                "INSERT INTO blobs (blob_hash, size, data) VALUES (?, ?, ?)",
+                (blob_hash, len(data), zlib.compress(data, self.compression_level)),
+            )
+        return type_, None, blob_hash
+
+    def _load(self, connection: sqlite3.Connection, type_: str, value: Optional[bytes], blob_hash: Optional[str]) -> Any:
+        if blob_hash is not None:
+            row = connection.execute("SELECT data FROM blobs WHERE blob_hash = ?", (blob_hash,)).fetchone()
+            value = zlib.decompress(row[0])
+        return self.serde.loads_typed((type_, value))
+
+    def _checkpoint_tuple(self, connection: sqlite3.Connection, row: tuple) -> CheckpointTuple:
+        (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, _created_at,
+         checkpoint_type, checkpoint_data, metadata_type, metadata_data) = row
+        checkpoint = self.serde.loads_typed((checkpoint_type, checkpoint_data))
+
+        channel_values = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            value_row = connection.execute(
+                "SELECT type, value, blob_hash FROM channel_values "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ).fetchone()
+            if value_row is not None and value_row[0] != "empty":
+                channel_values[channel] = self._load(connection, *value_row)
+        checkpoint["channel_values"] = channel_values
+
+        # Checkpoint formats before v4 carry the Send packets of the parent step separately
+        if checkpoint.get("v", 0) < 4:
+            checkpoint["pending_sends"] = [
+                self._load(connection, *send) for send in connection.execute(
+                    "SELECT type, value, blob_hash FROM writes WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "AND checkpoint_id = ? AND channel = ? ORDER BY task_path, task_id, idx",
+                    (thread_id, checkpoint_ns, parent_checkpoint_id, TASKS),
+                )
+            ] if parent_checkpoint_id else []
+
+        pending_writes = [
+            (task_id, channel, self._load(connection, type_, value, blob_hash))
+            for task_id, channel, type_, value, blob_hash in connection.execute(
+                "SELECT task_id, channel, type, value, blob_hash FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+        ]
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=checkpoint,
+            metadata=self.serde.loads_typed((metadata_type, metadata_data)),
+            parent_config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": parent_checkpoint_id,
+                }
+            } if parent_checkpoint_id else None,
+            pending_writes=pending_writes,
+        )
+
+    def _metadata_matches(self, row: tuple, filter: Dict[str, Any]) -> bool:
+        metadata = self.serde.loads_typed((row[7], row[8]))
+        return all(metadata.get(key) == value for key, value in filter.items())
+
+    def _prune_namespace(self, connection: sqlite3.Connection, thread_id: str, checkpoint_ns: str, keep_last: int) -> int:
+        rows = connection.execute(
+            "SELECT checkpoint_id, type, checkpoint FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC",
+            (thread_id, checkpoint_ns),
+        ).fetchall()
+        kept, removed = rows[:keep_last], rows[keep_last:]
+
+        for checkpoint_id, _, _ in removed:
+            connection.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+            connection.execute(
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+
+        # Keep only the channel versions the remaining checkpoints reference
+        referenced = set()
+        for _, checkpoint_type, checkpoint_data in kept:
+            checkpoint = self.serde.loads_typed((checkpoint_type, checkpoint_data))
+            referenced.update((channel, str(version)) for channel, version in checkpoint["channel_versions"].items())
+        stored = connection.execute(
+            "SELECT channel, version FROM channel_values WHERE thread_id = ? AND checkpoint_ns = ?",
+            (thread_id, checkpoint_ns),
+        ).fetchall()
+        connection.executemany(
+            "DELETE FROM channel_values WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+            [(thread_id, checkpoint_ns, channel, version) for channel, version in stored if (channel, version) not in referenced],
+        )
+        return len(removed)
+
+    @staticmethod
+    def _delete_unreferenced_blobs(connection: sqlite3.Connection) -> int:
+        return connection.execute(
+            "DELETE FROM blobs WHERE blob_hash NOT IN ("
+            "SELECT blob_hash FROM channel_values WHERE blob_hash IS NOT NULL "
+            "UNION SELECT blob_hash FROM writes WHERE blob_hash IS NOT NULL)"
+        ).rowcount
+
+
+_default_checkpointer = None
+
+
+def get_default_checkpointer() -> BaseCheckpointSaver:
+    """
+    Returns the checkpointer the agents use when human in the loop is enabled and no
+    `checkpointer` is given: the one set with `set_default_checkpointer()`, else a new
+    `MemorySaver()`.
+    """
+    return _default_checkpointer if _default_checkpointer is not None else MemorySaver()
+
+
+def set_default_checkpointer(checkpointer: Optional[BaseCheckpointSaver]) -> None:
+    """
+    Sets the process-wide default checkpointer, e.g. a `SQLiteCheckpointSaver` so review sessions
+    survive restarts. Pass None to go back to a new `MemorySaver()` per agent.
+    """
+    global _default_checkpointer
+    _default_checkpointer = checkpointer
@@ -0,0 +1,158 @@
+# BUSINESS SCIENCE UNIVERSITY
+# AI DATA SCIENCE TEAM
+# ***
+# Compiled Code Cache
+
+import ast
+import hashlib
+
+from typing import Any, Callable, Dict
+
+from ai_data_science_team.utils.cache import LRUCache
+from ai_data_science_team.utils.dataset import is_dataset, to_dataframe
+
+
+# Keyed by source_key(); values are _CompiledSource entries, sized by their source length
+_CODE_CACHE = LRUCache(max_entries=256, max_bytes=32 * 1024 ** 2, sizeof=lambda entry: len(entry.source))
+
+
+class _CompiledSource:
+    def __init__(self, source: str, code, namespace: Dict[str, Any]):
+        self.source = source
+        self.code = code
+        self.namespace = namespace
+
+
+def source_key(code: str) -> str:
+    """
+    Returns the cache key for a code snippet.
+
+    The key is a hash of the parsed syntax tree, so snippets that differ only in comments,
+    blank lines or formatting (e.g. the timestamped header added by `add_comments_to_top`)
+    share a key. Code that does not parse is keyed by its raw text.
+
+    Parameters
+    ----------
+    code : str
+        The Python source.
+
+    Returns
+    -------
+    str
+        A hex digest identifying the normalized source.
+    """
+    try:
+        normalized = ast.dump(ast.parse(code))
+    except SyntaxError:
+        normalized = code
+    return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+def load_agent_function(code: str, function_name: str, use_cache: bool = True) -> Callable:
+    """
+    Compiles and executes a code snippet and returns the function it defines, reusing the
+    compiled code and the defined callables when the same normalized source was loaded before.
+
+    Parameters
+    ----------
+    code : str
+        Python source defining the function, e.g. the output of a coding agent.
+    function_name : str
+        The name of the function to return.
+    use_cache : bool, optional
+        Whether to look up and store the compiled source in the cache. Defaults to True.
+
+    Returns
+    -------
+    Callable
+        The agent function.
+
+    Raises
+    ------
+    ValueError
+        If the code does not define a callable named `function_name`.
+    Exception
+        Any error raised while compiling or executing the code (e.g. SyntaxError).
+
+    Examples
+    --------
+    ``` python
+    import pandas as pd
+    from ai_data_science_team.utils.code_cache import load_agent_function
+
+    code = "def data_cleaner(data_raw):\\n    return data_raw.dropna()"
+    data_cleaner = load_agent_function(code, "data_cleaner")
+    data_cleaner(pd.DataFrame({"x": [1, None, 3]}))
+    ```
+    """
+    key = source_key(code) if use_cache else None
+    entry = _CODE_CACHE.get(key) if use_cache else None
+    if entry is None:
+        entry = _compile_source(code)
+        if use_cache:
+            _CODE_CACHE.put(key, entry)
+    return _resolve_function(entry, function_name)
+
+
+def run_cached_function(key: str, function_name: str, data: Any) -> Any:
+    """
+    Runs a previously loaded agent function on new data, without the original source or any
+    LLM call.
+
+    Parameters
+    ----------
+    key : str
+        The `source_key()` of the code that defined the function.
+    function_name : str
+        The name of the function.
+    data : Any
+        The input. Datasets (DataFrames, DatasetHandles, DatasetRefs, dicts or lists of these)
+        are passed to the function as a pandas DataFrame copy; other values are passed as is.
+
+    Returns
+    -------
+    Any
+        The function's return value.
+
+    Raises
+    ------
+    KeyError
+        If no code with this key is cached (never loaded, or evicted).
+    """
+    entry = _CODE_CACHE.get(key)
+    if entry is None:
+        raise KeyError(f"No cached code for key '{key}'. Load it with load_agent_function() first.")
+    agent_function = _resolve_function(entry, function_name)
+    if is_dataset(data) or isinstance(data, list):
+        data = to_dataframe(data, copy=True)
+    return agent_function(data)
+
+
+def get_code_cache_info() -> Dict[str, int]:
+    """
+    Returns hit/miss counters and usage of the compiled code cache.
+    """
+    return _CODE_CACHE.stats()
+
+
+def clear_code_cache() -> None:
+    """
+    Clears the compiled code cache and resets its counters.
+    """
+    _CODE_CACHE.clear()
+
+
+def _compile_source(code: str) -> _CompiledSource:
+    # Same namespaces as the execute nodes' exec(agent_code, global_vars, local_vars)
+    compiled = compile(code, "<string>", "exec")
+    local_vars = {}
+    global_vars = {}
+    exec(compiled, global_vars, local_vars)
+    return _CompiledSource(code, compiled, local_vars)
+
+
+def _resolve_function(entry: _CompiledSource, function_name: str) -> Callable:
+    agent_function = entry.namespace.get(function_name, None)
+    if agent_function is None or not callable(agent_function):
+        raise ValueError(f"Agent function '{function_name}' not found or not callable in the provided code.")
+    return agent_function
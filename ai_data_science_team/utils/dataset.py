@@ -0,0 +1,511 @@
+# BUSINESS SCIENCE UNIVERSITY
+# AI DATA SCIENCE TEAM
+# ***
+# Dataset Handles
+
+import hashlib
+import io
+import os
+import pickle
+import threading
+
+import pandas as pd
+
+from typing import Any, List, NamedTuple, Optional, Union
+
+from ai_data_science_team.utils.cache import LRUCache
+
+
+class DatasetHandle:
+    """
+    A columnar handle for passing a dataset through agent graph state without converting it to
+    nested Python dictionaries.
+
+    The handle is backed by a pandas DataFrame and/or a pyarrow Table. Each representation is built
+    lazily on first use and then cached, so agent nodes can call `to_pandas()` repeatedly without
+    rebuilding the frame. When pyarrow is installed, conversions between the two representations are
+    zero-copy wherever the column types allow it, and checkpointers serialize the handle as a compact
+    Arrow IPC stream instead of a dict of dicts.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame, dict, pyarrow.Table, DatasetHandle or bytes
+        The dataset. Dictionaries are interpreted as the output of `DataFrame.to_dict()`.
+        Bytes are interpreted as the output of `to_bytes()` (used when restoring from a checkpoint).
+    encoding : str, optional
+        Only used when `data` is bytes. Either "arrow" or "pickle".
+
+    Examples
+    --------
+    ``` python
+    import pandas as pd
+    from ai_data_science_team.utils.dataset import DatasetHandle
+
+    df = pd.read_csv("data/churn_data.csv")
+
+    handle = DatasetHandle(df)
+    handle.shape
+    handle.to_pandas().head()
+    ```
+    """
+
+    def __init__(self, data: Any, encoding: Optional[str] = None):
+        self._df = None
+        self._table = None
+        self._dataset_id = None
+
+        if isinstance(data, DatasetHandle):
+            self._df = data._df
+            self._table = data._table
+            self._dataset_id = data._dataset_id
+        elif isinstance(data, pd.DataFrame):
+            self._df = data
+        elif isinstance(data, dict):
+            self._df = pd.DataFrame.from_dict(data)
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            self._load_bytes(bytes(data), encoding)
+        elif _is_arrow_table(data):
+            self._table = data
+        else:
+            raise TypeError(
+                "DatasetHandle expects a pandas DataFrame, a dict, a pyarrow Table or serialized bytes. "
+                f"Got: {type(data).__name__}"
+            )
+
+    # Representations
+
+    def to_pandas(self, copy: bool = False) -> pd.DataFrame:
+        """
+        Returns the dataset as a pandas DataFrame. The frame is cached on the handle.
+
+        Parameters
+        ----------
+        copy : bool, optional
+            If True, returns a deep copy that can be modified without affecting the handle.
+            Use this before passing the frame to code that may mutate it in place.
+        """
+        if self._df is None:
+            self._df = self._table.to_pandas()
+        return self._df.copy() if copy else self._df
+
+    def to_arrow(self):
+        """
+        Returns the dataset as a pyarrow Table. Requires pyarrow.
+        """
+        if self._table is None:
+            pa = _import_pyarrow()
+            self._table = pa.Table.from_pandas(self._df, preserve_index=None)
+        return self._table
+
+    def to_dict(self) -> dict:
+        """
+        Returns the dataset in `DataFrame.to_dict()` format, for backwards compatibility.
+        """
+        return self.to_pandas().to_dict()
+
+    # Metadata
+
+    @property
+    def shape(self):
+        return self.to_pandas().shape
+
+    @property
+    def num_rows(self) -> int:
+        if self._df is not None:
+            return len(self._df)
+        return self._table.num_rows
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.to_pandas().columns)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate in-memory size of the dataset in bytes."""
+        if self._df is not None:
+            return int(self._df.memory_usage(index=True, deep=False).sum())
+        return int(self._table.nbytes)
+
+    # Serialization
+
+    def to_bytes(self):
+        """
+        Serializes the dataset to bytes.
+
+        Returns
+        -------
+        tuple
+            (payload, encoding). The encoding is "arrow" when the dataset can be written as an
+            Arrow IPC stream and "pickle" otherwise (pyarrow missing, or object columns holding
+            values Arrow cannot represent, such as mixed types or dicts).
+        """
+        try:
+            pa = _import_pyarrow()
+            if self._table is None and not _arrow_roundtrips(self._df):
+                raise TypeError("Dataset has object columns Arrow would not round-trip.")
+            table = self.to_arrow()
+            sink = io.BytesIO()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return sink.getvalue(), "arrow"
+        except Exception:
+            return pickle.dumps(self.to_pandas(), protocol=pickle.HIGHEST_PROTOCOL), "pickle"
+
+    def _load_bytes(self, payload: bytes, encoding: Optional[str]):
+        if encoding == "pickle":
+            self._df = pickle.loads(payload)
+        elif encoding in (None, "arrow"):
+            pa = _import_pyarrow()
+            self._table = pa.ipc.open_stream(payload).read_all()
+        else:
+            raise ValueError(f"Unknown dataset encoding: {encoding}")
+
+    def _asdict(self) -> dict:
+        # Used by LangGraph's serializer (the same hook it uses for namedtuples), so that
+        # checkpointers store the compact binary payload instead of a dict of dicts.
+        payload, encoding = self.to_bytes()
+        return {"data": payload, "encoding": encoding}
+
+    def __reduce__(self):
+        payload, encoding = self.to_bytes()
+        return (DatasetHandle, (payload, encoding))
+
+    def __repr__(self):
+        rows, cols = self.to_pandas().shape
+        return f"DatasetHandle(rows={rows}, columns={cols})"
+
+
+class DatasetRef(NamedTuple):
+    """
+    A lightweight reference to a dataset held in a `DatasetStore`.
+
+    Multi-agent graphs pass references between sub-agents instead of the data itself. A reference
+    carries only the content-addressed ID and a small schema fingerprint, so it is cheap to copy
+    into every sub-agent state and to checkpoint.
+
+    Attributes
+    ----------
+    dataset_id : str
+        Content-addressed ID of the dataset in the store.
+    num_rows : int
+        Number of rows.
+    num_columns : int
+        Number of columns.
+    schema : str
+        Short hash of the column names and dtypes.
+    """
+    dataset_id: str
+    num_rows: int
+    num_columns: int
+    schema: str
+
+
+class DatasetStore:
+    """
+    A process-wide registry of datasets keyed by content-addressed IDs.
+
+    Adding the same data twice returns the same `DatasetRef` without storing a second copy.
+    The store keeps datasets in memory with least-recently-used eviction bounded by number of
+    entries and total size. When a `spill_dir` is given, evicted datasets are written to Parquet
+    (or pickle, for columns Parquet cannot represent) and transparently reloaded on access, so
+    references stay valid. Without a spill directory, accessing an evicted dataset raises KeyError.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Maximum number of datasets held in memory. Default is 64.
+    max_bytes : int, optional
+        Maximum total in-memory size of the datasets in bytes. Default is 2 GB.
+    spill_dir : str, optional
+        Directory where evicted datasets are written. Default is None (no spilling).
+
+    Examples
+    --------
+    ``` python
+    import pandas as pd
+    from ai_data_science_team.utils.dataset import DatasetStore
+
+    store = DatasetStore(max_bytes=500_000_000, spill_dir="data/.dataset_store")
+
+    ref = store.put(pd.read_csv("data/churn_data.csv"))
+    ref
+
+    store.get(ref).to_pandas().head()
+    ```
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 64,
+        max_bytes: Optional[int] = 2 * 1024 ** 3,
+        spill_dir: Optional[str] = None,
+    ):
+        self.spill_dir = spill_dir
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+        self._cache = LRUCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            sizeof=_dataset_nbytes,
+            on_evict=self._spill if spill_dir else None,
+        )
+        self._refs = {}
+        self._lock = threading.Lock()
+
+    def put(self, data: Any) -> DatasetRef:
+        """
+        Adds a dataset to the store and returns its reference.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame, DatasetHandle, DatasetRef, dict or pyarrow.Table
+            The dataset. References are returned unchanged.
+        """
+        if isinstance(data, DatasetRef):
+            return data
+        handle = data if isinstance(data, DatasetHandle) else DatasetHandle(data)
+        df = handle.to_pandas()
+        if handle._dataset_id is None:
+            handle._dataset_id = _content_id(df)
+        dataset_id = handle._dataset_id
+        with self._lock:
+            ref = self._refs.get(dataset_id)
+            if ref is None:
+                ref = DatasetRef(dataset_id, int(df.shape[0]), int(df.shape[1]), _schema_id(df))
+                self._refs[dataset_id] = ref
+        if self._cache.get(dataset_id) is None:
+            self._cache.put(dataset_id, handle)
+        return ref
+
+    def get(self, ref: Union[DatasetRef, str]) -> DatasetHandle:
+        """
+        Returns the dataset for a reference (or dataset ID) as a `DatasetHandle`.
+
+        Raises
+        ------
+        KeyError
+            If the dataset is not in memory and cannot be reloaded from the spill directory.
+        """
+        dataset_id = ref.dataset_id if isinstance(ref, DatasetRef) else ref
+        handle = self._cache.get(dataset_id)
+        if handle is not None:
+            return handle
+        handle = self._load_spilled(dataset_id)
+        if handle is None:
+            raise KeyError(
+                f"Dataset '{dataset_id}' is not in the DatasetStore. It may have been evicted; "
+                "configure the store with a spill_dir to keep evicted datasets available."
+            )
+        self._cache.put(dataset_id, handle)
+        return handle
+
+    def remove(self, ref: Union[DatasetRef, str]) -> None:
+        """Removes a dataset from memory and from the spill directory."""
+        dataset_id = ref.dataset_id if isinstance(ref, DatasetRef) else ref
+        self._cache.pop(dataset_id)
+        with self._lock:
+            self._refs.pop(dataset_id, None)
+        for path in self._spill_paths(dataset_id):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def clear(self) -> None:
+        """Removes all in-memory datasets. Spilled files are left on disk."""
+        self._cache.clear()
+        with self._lock:
+            self._refs.clear()
+
+    def stats(self) -> dict:
+        """Returns cache counters and memory usage of the store."""
+        return self._cache.stats()
+
+    def __contains__(self, ref: Union[DatasetRef, str]) -> bool:
+        dataset_id = ref.dataset_id if isinstance(ref, DatasetRef) else ref
+        if dataset_id in self._cache:
+            return True
+        return any(os.path.exists(path) for path in self._spill_paths(dataset_id))
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    # Spilling
+
+    def _spill_paths(self, dataset_id: str):
+        if not self.spill_dir:
+            return []
+        return [
+            os.path.join(self.spill_dir, f"{dataset_id}.parquet"),
+            os.path.join(self.spill_dir, f"{dataset_id}.pkl"),
+        ]
+
+    def _spill(self, dataset_id: str, handle: DatasetHandle) -> None:
+        parquet_path, pickle_path = self._spill_paths(dataset_id)
+        if os.path.exists(parquet_path) or os.path.exists(pickle_path):
+            return
+        df = handle.to_pandas()
+        try:
+            if not _arrow_roundtrips(df):
+                raise TypeError("Dataset has object columns Parquet would not round-trip.")
+            df.to_parquet(parquet_path)
+        except Exception:
+            if os.path.exists(parquet_path):
+                os.remove(parquet_path)
+            df.to_pickle(pickle_path)
+
+    def _load_spilled(self, dataset_id: str) -> Optional[DatasetHandle]:
+        for path in self._spill_paths(dataset_id):
+            if os.path.exists(path):
+                if path.endswith(".parquet"):
+                    return DatasetHandle(pd.read_parquet(path))
+                return DatasetHandle(pd.read_pickle(path))
+        return None
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_dataset_store() -> DatasetStore:
+    """
+    Returns the process-wide default `DatasetStore`, creating it on first use.
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = DatasetStore()
+        return _default_store
+
+
+def set_dataset_store(store: DatasetStore) -> None:
+    """
+    Replaces the process-wide default `DatasetStore`, e.g. to configure size bounds or a spill directory.
+    """
+    global _default_store
+    with _default_store_lock:
+        _default_store = store
+
+
+# Helpers
+
+def to_dataframe(data: Any, copy: bool = False) -> Union[pd.DataFrame, List[pd.DataFrame], None]:
+    """
+    Converts any supported dataset representation to a pandas DataFrame.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame, DatasetHandle, DatasetRef, dict, list or None
+        A single dataset, or a list of datasets (in which case a list of DataFrames is returned).
+        References are resolved against the default `DatasetStore`.
+    copy : bool, optional
+        If True, always return frames that are safe to mutate.
+
+    Returns
+    -------
+    pandas.DataFrame, list of pandas.DataFrame or None
+    """
+    if data is None:
+        return None
+    if isinstance(data, DatasetHandle):
+        return data.to_pandas(copy=copy)
+    if isinstance(data, DatasetRef):
+        return get_dataset_store().get(data).to_pandas(copy=copy)
+    if isinstance(data, pd.DataFrame):
+        return data.copy() if copy else data
+    if isinstance(data, dict):
+        return pd.DataFrame.from_dict(data)
+    if isinstance(data, list):
+        return [to_dataframe(item, copy=copy) for item in data]
+    if _is_arrow_table(data):
+        return data.to_pandas()
+    raise ValueError(
+        "Data must be a DataFrame, a DatasetHandle, a DatasetRef, a dict or a list of these. "
+        f"Got: {type(data).__name__}"
+    )
+
+
+def to_dataset(data: Any) -> Union[DatasetHandle, DatasetRef, List[DatasetHandle], None]:
+    """
+    Wraps a dataset (or a list of datasets) in a `DatasetHandle` for use in agent graph state.
+    Existing handles and `DatasetRef` references are returned unchanged.
+    """
+    if data is None or isinstance(data, (DatasetHandle, DatasetRef)):
+        return data
+    if isinstance(data, list):
+        return [to_dataset(item) for item in data]
+    return DatasetHandle(data)
+
+
+def is_dataset(data: Any) -> bool:
+    """
+    Returns True if `data` is a single dataset in any supported representation.
+    """
+    return isinstance(data, (DatasetHandle, DatasetRef, pd.DataFrame, dict)) or _is_arrow_table(data)
+
+
+def to_dataset_ref(data: Any, store: Optional[DatasetStore] = None) -> Union[DatasetRef, List[DatasetRef], None]:
+    """
+    Adds a dataset (or a list of datasets) to a `DatasetStore` and returns the reference(s).
+
+    Parameters
+    ----------
+    data : pandas.DataFrame, DatasetHandle, DatasetRef, dict, list or None
+        The dataset(s) to register. Values that are not datasets (e.g. an error result) are returned unchanged.
+    store : DatasetStore, optional
+        The store to use. Defaults to the process-wide store from `get_dataset_store()`.
+    """
+    if data is None:
+        return None
+    if isinstance(data, list):
+        return [to_dataset_ref(item, store=store) for item in data]
+    if not is_dataset(data):
+        return data
+    store = store or get_dataset_store()
+    return store.put(data)
+
+
+def _content_id(df: pd.DataFrame) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(_schema_id(df).encode())
+    try:
+        digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    except TypeError:
+        # Unhashable cell values (e.g. dicts or lists)
+        digest.update(pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL))
+    return digest.hexdigest()
+
+
+def _schema_id(df: pd.DataFrame) -> str:
+    schema = repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()])
+    return hashlib.blake2b(schema.encode(), digest_size=8).hexdigest()
+
+
+# Object columns Arrow converts back to the same Python values and dtype. Others (lists,
+# dicts, object columns of numbers) come back as arrays, structs or numeric dtypes.
+_ARROW_SAFE_OBJECT_TYPES = {"string", "bytes", "empty"}
+
+
+def _arrow_roundtrips(df: pd.DataFrame) -> bool:
+    arrays = [df.index] + [df.iloc[:, i] for i in range(df.shape[1])]
+    for values in arrays:
+        if values.dtype == object:
+            kind = pd.api.types.infer_dtype(values.to_numpy(dtype=object), skipna=True)
+            if kind not in _ARROW_SAFE_OBJECT_TYPES:
+                return False
+    return True
+
+
+def _dataset_nbytes(handle: DatasetHandle) -> int:
+    return int(handle.to_pandas().memory_usage(index=True, deep=True).sum())
+
+
+def _is_arrow_table(obj: Any) -> bool:
+    return type(obj).__module__.startswith("pyarrow") and type(obj).__name__ == "Table"
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        raise ImportError("Please install the 'pyarrow' package to use Arrow-backed datasets. pip install pyarrow")
+    return pa
@@ -0,0 +1,143 @@
+# BUSINESS SCIENCE UNIVERSITY
+# AI DATA SCIENCE TEAM
+# ***
+# Agent Streaming Events
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from langchain_core.messages import BaseMessageChunk
+
+
+# Event types
+NODE_START = "node_start"
+NODE_END = "node_end"
+TOKEN = "token"
+CODE_READY = "code_ready"
+EXECUTION_RESULT = "execution_result"
+RETRY = "retry"
+INTERRUPT = "interrupt"
+END = "end"
+
+# LangGraph stream modes the events are built from
+STREAM_MODES = ["debug", "messages", "updates", "values"]
+
+# Node metadata key set by create_coding_agent_graph() ("create_code", "execute_code" or "fix_code")
+AGENT_STEP_KEY = "agent_step"
+
+# Nodes of LangGraph's prebuilt react agents (used by the tool agents)
+_REACT_AGENT_STEPS = {"tools": "execute_code"}
+
+
+class AgentEvent(NamedTuple):
+    """
+    An event of an agent run, yielded by `BaseAgent.stream_agent_events()`.
+
+    Attributes
+    ----------
+    type : str
+        One of "node_start", "node_end", "token" (an LLM token delta), "code_ready" (generated
+        or fixed code), "execution_result" (generated code or tools ran), "retry" (a code fix
+        starts), "interrupt" (waiting for human review) or "end" (the final state).
+    node : str, optional
+        The graph node the event comes from.
+    data : Any, optional
+        The token text for "token" events, the node's state update for "node_end",
+        "code_ready" and "execution_result" events, the interrupts for "interrupt" and the
+        final state for "end".
+    namespace : tuple, optional
+        The path of parent graph nodes for events from sub-agents, e.g.
+        `("data_wrangling_agent:<task id>",)`. Empty for the agent's own nodes.
+    """
+    type: str
+    node: Optional[str] = None
+    data: Any = None
+    namespace: Tuple[str, ...] = ()
+
+
+def node_agent_steps(graph: Any) -> Dict[str, str]:
+    """
+    Returns the coding agent step ("create_code", "execute_code" or "fix_code") of each node of a
+    compiled graph that has one (see `create_coding_agent_graph()`).
+    """
+    builder = getattr(graph, "builder", None)
+    steps = {}
+    for name, spec in (getattr(builder, "nodes", None) or {}).items():
+        step = (getattr(spec, "metadata", None) or {}).get(AGENT_STEP_KEY)
+        if step:
+            steps[name] = step
+    return steps
+
+
+class AgentEventMapper:
+    """
+    Turns the chunks of a LangGraph `stream()` run with `stream_mode=STREAM_MODES` and
+    `subgraphs=True` into `AgentEvent`s, and keeps the last full state as `response`.
+    """
+
+    def __init__(self, graph: Any):
+        self.steps = node_agent_steps(graph)
+        self.response = None
+
+    def _step(self, node: str, namespace: Tuple[str, ...]) -> Optional[str]:
+        if namespace:
+            return _REACT_AGENT_STEPS.get(node)
+        return self.steps.get(node)
+
+    def map(self, chunk: Any) -> List[AgentEvent]:
+        """Returns the events of one stream chunk (`(namespace, mode, payload)`)."""
+        namespace, mode, payload = chunk
+        namespace = tuple(namespace)
+
+        if mode == "values":
+            if not namespace:
+                self.response = payload
+            return []
+
+        if mode == "messages":
+            message, metadata = payload
+            if not isinstance(message, BaseMessageChunk):
+                return []
+            text = _message_text(message)
+            if not text:
+                return []
+            return [AgentEvent(TOKEN, metadata.get("langgraph_node"), text, namespace)]
+
+        if mode == "debug":
+            if payload.get("type") != "task":
+                return []
+            node = payload.get("payload", {}).get("name")
+            events = [AgentEvent(NODE_START, node, None, namespace)]
+            if self._step(node, namespace) == "fix_code":
+                events.append(AgentEvent(RETRY, node, None, namespace))
+            return events
+
+        if mode == "updates":
+            events = []
+            for node, update in payload.items():
+                if node == "__interrupt__":
+                    events.append(AgentEvent(INTERRUPT, None, update, namespace))
+                    continue
+                events.append(AgentEvent(NODE_END, node, update, namespace))
+                step = self._step(node, namespace)
+                if step in ("create_code", "fix_code"):
+                    events.append(AgentEvent(CODE_READY, node, update, namespace))
+                elif step == "execute_code":
+                    events.append(AgentEvent(EXECUTION_RESULT, node, update, namespace))
+            return events
+
+        return []
+
+    def end(self) -> AgentEvent:
+        """Returns the "end" event with the final state."""
+        return AgentEvent(END, None, self.response)
+
+
+def _message_text(message: BaseMessageChunk) -> str:
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block if isinstance(block, str) else block.get("text", "")
+        for block in content
+        if isinstance(block, (str, dict))
+    )
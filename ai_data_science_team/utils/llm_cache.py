@@ -0,0 +1,225 @@
+# BUSINESS SCIENCE UNIVERSITY
+# AI DATA SCIENCE TEAM
+# ***
+# LLM Response Cache
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import warnings
+
+from typing import Any, Dict, Optional, Union
+
+from langchain_core.caches import BaseCache
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.load import dumps, loads
+
+from ai_data_science_team.utils.cache import LRUCache
+
+
+class LLMResponseCache(BaseCache):
+    """
+    A LangChain cache for chat model responses, so identical prompts (e.g. the same question on
+    the same dataset summary) are answered without calling the model.
+
+    Entries are keyed by a hash of the model configuration LangChain passes to the cache (model
+    name, temperature and other invocation parameters) and the rendered prompt. Responses are kept
+    in an in-memory LRU layer and, if `path` is given, in a SQLite database so they survive
+    restarts and can be shared by processes on the same machine.
+
+    Only deterministic settings should be cached: with a non-zero temperature a cached answer
+    replaces what would have been a fresh sample.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path of the SQLite database for persisted entries. Defaults to None (in memory only).
+    max_entries : int, optional
+        Maximum number of responses kept in memory. Defaults to 1024.
+    ttl : float, optional
+        Maximum age of an entry in seconds. None means entries never expire (the default).
+
+    Examples
+    --------
+    ``` python
+    from langchain_openai import ChatOpenAI
+    from ai_data_science_team.agents import DataCleaningAgent
+    from ai_data_science_team.utils.llm_cache import LLMResponseCache
+
+    cache = LLMResponseCache(path="logs/llm_cache.sqlite")
+    agent = DataCleaningAgent(model=ChatOpenAI(model="gpt-4o-mini", temperature=0), llm_cache=cache)
+
+    agent.invoke_agent(data_raw=df, user_instructions="Don't remove outliers.")
+    agent.invoke_agent(data_raw=df, user_instructions="Don't remove outliers.")  # no model calls
+    cache.stats()
+    ```
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 1024, ttl: Optional[float] = None):
+        self.path = path
+        self.ttl = ttl
+        self._cache = LRUCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self._connection = None
+        self.disk_hits = 0
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[list]:
+        """Returns the cached generations for the prompt and model configuration, or None."""
+        key = _cache_key(prompt, llm_string)
+        # Drop an expired entry before the lookup, so it is counted as a miss rather than a hit
+        entry = self._cache.peek(key)
+        if entry is not None and self._is_expired(entry):
+            self._remove(key)
+        entry = self._cache.get(key)
+        if entry is None:
+            entry = self._load(key)
+            if entry is not None and self._is_expired(entry):
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self.disk_hits += 1
+                self._cache.put(key, entry)
+        if entry is None:
+            return None
+        return entry[1]
+
+    def update(self, prompt: str, llm_string: str, return_val: list) -> None:
+        """Stores the generations for the prompt and model configuration."""
+        key = _cache_key(prompt, llm_string)
+        entry = (time.time(), return_val)
+        self._cache.put(key, entry)
+        connection = self._connect()
+        if connection is None:
+            return
+        with self._lock:
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, created_at, generations) VALUES (?, ?, ?)",
+                (key, entry[0], dumps(return_val)),
+            )
+            connection.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        """Removes all entries, in memory and on disk, and resets the counters."""
+        self._cache.clear()
+        self.disk_hits = 0
+        connection = self._connect()
+        if connection is not None:
+            with self._lock:
+                connection.execute("DELETE FROM llm_cache")
+                connection.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the number of lookups answered from memory ("hits", including entries loaded from
+        disk), from disk ("disk_hits"), and not at all ("misses"), the "hit_rate", and the
+        in-memory usage.
+        """
+        stats = self._cache.stats()
+        # Entries found on disk count as a memory miss followed by a hit once loaded
+        stats["misses"] -= self.disk_hits
+        stats["hits"] += self.disk_hits
+        stats["disk_hits"] = self.disk_hits
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else None
+        return stats
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        with self._lock:
+            if self._connection is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._connection = sqlite3.connect(self.path, check_same_thread=False)
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, created_at REAL, generations TEXT)"
+                )
+                self._connection.commit()
+            return self._connection
+
+    def _load(self, key: str) -> Optional[tuple]:
+        connection = self._connect()
+        if connection is None:
+            return None
+        with self._lock:
+            row = connection.execute(
+                "SELECT created_at, generations FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            # langchain_core.load is marked beta; the entries are the generations this cache wrote
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                return row[0], loads(row[1])
+        except Exception:
+            return None
+
+    def _is_expired(self, entry: tuple) -> bool:
+        return self.ttl is not None and time.time() - entry[0] > self.ttl
+
+    def _remove(self, key: str) -> None:
+        self._cache.pop(key)
+        connection = self._connect()
+        if connection is not None:
+            with self._lock:
+                connection.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                connection.commit()
+
+
+def _cache_key(prompt: str, llm_string: str) -> str:
+    return hashlib.blake2b(f"{llm_string}\x00{prompt}".encode(), digest_size=16).hexdigest()
+
+
+_default_llm_cache = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Returns the process-wide `LLMResponseCache` used by agents created with `llm_cache=True`,
+    creating an in-memory cache on first use.
+    """
+    global _default_llm_cache
+    if _default_llm_cache is None:
+        _default_llm_cache = LLMResponseCache()
+    return _default_llm_cache
+
+
+def set_llm_cache(cache: LLMResponseCache) -> None:
+    """
+    Replaces the process-wide `LLMResponseCache`, e.g. to persist responses to SQLite.
+    """
+    global _default_llm_cache
+    _default_llm_cache = cache
+
+
+def with_llm_cache(model: Any, llm_cache: Union[bool, BaseCache, None]) -> Any:
+    """
+    Returns a copy of a LangChain chat model (or LLM) that looks up and stores its responses in
+    `llm_cache`, leaving the original model unchanged. Every chain built from the copy (e.g.
+    `prompt | llm | JsonOutputParser()`) uses the cache.
+
+    Parameters
+    ----------
+    model : BaseLanguageModel
+        The model.
+    llm_cache : bool or BaseCache
+        True for the process-wide `get_llm_cache()`, a cache instance (e.g. an `LLMResponseCache`
+        or any LangChain `BaseCache`), or None / False for no caching (the model is returned as is).
+
+    Returns
+    -------
+    BaseLanguageModel
+        The model using the cache.
+    """
+    if llm_cache is None or llm_cache is False:
+        return model
+    if not isinstance(model, BaseLanguageModel):
+        raise TypeError(
+            f"llm_cache requires a LangChain chat model or LLM, got {type(model).__name__}."
+        )
+    cache = get_llm_cache() if llm_cache is True else llm_cache
+    return model.model_copy(update={"cache": cache})
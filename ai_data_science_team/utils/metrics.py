@@ -0,0 +1,396 @@
+# BUSINESS SCIENCE UNIVERSITY
+# AI DATA SCIENCE TEAM
+# ***
+# Agent Metrics and Tracing
+
+import contextlib
+import json
+import sys
+import threading
+import time
+
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+import pandas as pd
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.callbacks.manager import dispatch_custom_event
+
+from ai_data_science_team.utils.dataset import DatasetHandle
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Name of the custom callback event used by trace_span()
+SPAN_EVENT = "ai_ds_team_span"
+
+
+class AgentMetrics(BaseCallbackHandler):
+    """
+    A LangChain callback handler that records a trace of each agent run: one span per graph node
+    (including the nodes of sub-agents and react tool agents), per LLM call and per step timed
+    with `trace_span()` (e.g. running the generated code or collecting database metadata).
+
+    Node spans record wall time, peak RSS growth of the process, the size of the datasets
+    (`DatasetHandle` / DataFrame values) in the node's input and output, and whether the node is a
+    code fix (a retry). LLM spans record latency and the token counts the provider reports.
+
+    Every agent graph carries a handler (see `instrument_graph()`); its metrics are available from
+    `agent.get_metrics()` after a run.
+
+    Parameters
+    ----------
+    max_runs : int, optional
+        Number of finished runs kept. Defaults to 20.
+    """
+
+    # Start and end callbacks must be handled in order, also in async runs
+    run_inline = True
+
+    def __init__(self, max_runs: int = 20):
+        self._lock = threading.Lock()
+        self._runs = deque(maxlen=max_runs)
+        self._active = {}
+        self._spans = {}
+        self._run_of = {}
+        self._parent_of = {}
+
+    # Callbacks
+
+    def on_chain_start(self, serialized: Any, inputs: Any, *, run_id: UUID, parent_run_id: Optional[UUID] = None, metadata: Optional[dict] = None, **kwargs: Any) -> None:
+        metadata = metadata or {}
+        name = kwargs.get("name") or (serialized or {}).get("name")
+        with self._lock:
+            self._parent_of[run_id] = parent_run_id
+            root = self._run_of.get(parent_run_id) if parent_run_id is not None else None
+            if root is None:
+                # First run this handler sees in the tree: the agent graph itself
+                self._run_of[run_id] = run_id
+                self._active[run_id] = []
+                self._open_span(run_id, run_id, None, name or "agent", "agent", {})
+                return
+            self._run_of[run_id] = root
+            if name is not None and metadata.get("langgraph_node") == name:
+                self._open_span(run_id, root, self._span_parent(parent_run_id), name, "node", {
+                    "namespace": metadata.get("langgraph_checkpoint_ns", ""),
+                    "step": metadata.get("langgraph_step"),
+                    "retry": metadata.get("agent_step") == "fix_code",
+                    "data_in_bytes": _data_bytes(inputs),
+                    "peak_rss_start": _peak_rss(),
+                })
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._close(run_id, outputs=outputs)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._close(run_id, error=error)
+
+    def on_chat_model_start(self, serialized: Any, messages: Any, *, run_id: UUID, parent_run_id: Optional[UUID] = None, metadata: Optional[dict] = None, **kwargs: Any) -> None:
+        self._llm_start(serialized, run_id, parent_run_id, metadata, kwargs)
+
+    def on_llm_start(self, serialized: Any, prompts: Any, *, run_id: UUID, parent_run_id: Optional[UUID] = None, metadata: Optional[dict] = None, **kwargs: Any) -> None:
+        self._llm_start(serialized, run_id, parent_run_id, metadata, kwargs)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._close(run_id, **_token_usage(response))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._close(run_id, error=error)
+
+    def on_custom_event(self, name: str, data: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        if name != SPAN_EVENT:
+            return
+        with self._lock:
+            root = self._run_of.get(run_id)
+            if root is None:
+                return
+            self._active[root].append({
+                "span_id": f"{run_id}:{data['name']}:{data['start']}",
+                "parent_id": str(parent) if (parent := self._span_parent(run_id)) is not None else None,
+                "name": data["name"],
+                "kind": "step",
+                "start": data["start"],
+                "end": data["end"],
+                "duration": data["end"] - data["start"],
+                "attributes": data.get("attributes") or {},
+            })
+
+    # Results
+
+    def get_spans(self, run: int = -1) -> List[Dict[str, Any]]:
+        """Returns the spans of a finished run (the last one by default), in start order."""
+        with self._lock:
+            if not self._runs:
+                return []
+            return sorted(self._runs[run], key=lambda span: span["start"])
+
+    def summary(self, run: int = -1) -> Optional[Dict[str, Any]]:
+        """
+        Returns the metrics of a finished run (the last one by default): total wall time, LLM
+        calls, latency and tokens, retries, and per-node totals ("nodes") and timed steps ("steps").
+        """
+        spans = self.get_spans(run)
+        if not spans:
+            return None
+        agent = next(span for span in spans if span["kind"] == "agent")
+        llm_spans = [span for span in spans if span["kind"] == "llm"]
+        node_spans = [span for span in spans if span["kind"] == "node"]
+
+        nodes = {}
+        for span in node_spans:
+            attributes = span["attributes"]
+            node = nodes.setdefault(span["name"], {
+                "calls": 0, "wall_time": 0.0, "llm_time": 0.0, "llm_calls": 0,
+                "input_tokens": 0, "output_tokens": 0, "peak_rss_delta": 0,
+                "data_in_bytes": 0, "data_out_bytes": 0, "errors": 0,
+            })
+            node["calls"] += 1
+            node["wall_time"] += span["duration"]
+            node["peak_rss_delta"] += attributes.get("peak_rss_delta") or 0
+            node["data_in_bytes"] += attributes.get("data_in_bytes") or 0
+            node["data_out_bytes"] += attributes.get("data_out_bytes") or 0
+            node["errors"] += 1 if attributes.get("error") else 0
+        node_names = {span["span_id"]: span["name"] for span in node_spans}
+        for span in llm_spans:
+            node = nodes.get(node_names.get(span["parent_id"]))
+            if node is not None:
+                node["llm_calls"] += 1
+                node["llm_time"] += span["duration"]
+                node["input_tokens"] += span["attributes"].get("input_tokens") or 0
+                node["output_tokens"] += span["attributes"].get("output_tokens") or 0
+
+        steps = {}
+        for span in spans:
+            if span["kind"] == "step":
+                step = steps.setdefault(span["name"], {"calls": 0, "wall_time": 0.0})
+                step["calls"] += 1
+                step["wall_time"] += span["duration"]
+
+        return {
+            "agent": agent["name"],
+            "wall_time": agent["duration"],
+            "llm_calls": len(llm_spans),
+            "llm_time": sum(span["duration"] for span in llm_spans),
+            "input_tokens": sum(span["attributes"].get("input_tokens") or 0 for span in llm_spans),
+            "output_tokens": sum(span["attributes"].get("output_tokens") or 0 for span in llm_spans),
+            "retries": sum(1 for span in node_spans if span["attributes"].get("retry")),
+            "peak_rss_delta": agent["attributes"].get("peak_rss_delta"),
+            "nodes": nodes,
+            "steps": steps,
+        }
+
+    def to_jsonl(self, path: str, run: int = -1) -> None:
+        """Appends the spans of a finished run (the last one by default) to a JSON lines file."""
+        with open(path, "a") as file:
+            for span in self.get_spans(run):
+                file.write(json.dumps(span, default=str) + "\n")
+
+    def to_opentelemetry(self, tracer: Optional[Any] = None, run: int = -1) -> None:
+        """
+        Emits the spans of a finished run (the last one by default) as OpenTelemetry spans, with
+        their recorded start and end times and parent/child structure. Requires `opentelemetry-api`.
+
+        Parameters
+        ----------
+        tracer : opentelemetry.trace.Tracer, optional
+            The tracer. Defaults to `trace.get_tracer("ai_data_science_team")`.
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "The 'opentelemetry-api' library is not installed. Please install it using pip:\n\n"
+                "    pip install opentelemetry-api opentelemetry-sdk\n"
+            ) from e
+        tracer = tracer or trace.get_tracer("ai_data_science_team")
+        spans = self.get_spans(run)
+        children = {}
+        for span in spans:
+            children.setdefault(span["parent_id"], []).append(span)
+
+        def emit(span, context):
+            otel_span = tracer.start_span(
+                span["name"], context=context, start_time=int(span["start"] * 1e9),
+                attributes={"ai_ds_team.kind": span["kind"], **_otel_attributes(span["attributes"])},
+            )
+            if span["attributes"].get("error"):
+                otel_span.set_status(trace.Status(trace.StatusCode.ERROR, span["attributes"]["error"]))
+            child_context = trace.set_span_in_context(otel_span)
+            for child in children.get(span["span_id"], []):
+                emit(child, child_context)
+            otel_span.end(end_time=int(span["end"] * 1e9))
+
+        for span in children.get(None, []):
+            emit(span, None)
+
+    def reset(self) -> None:
+        """Removes the recorded runs."""
+        with self._lock:
+            self._runs.clear()
+
+    # Internals
+
+    def _llm_start(self, serialized: Any, run_id: UUID, parent_run_id: Optional[UUID], metadata: Optional[dict], kwargs: dict) -> None:
+        metadata = metadata or {}
+        invocation_params = kwargs.get("invocation_params") or {}
+        model = invocation_params.get("model") or invocation_params.get("model_name") or metadata.get("ls_model_name")
+        with self._lock:
+            root = self._run_of.get(parent_run_id)
+            if root is None:
+                return
+            self._run_of[run_id] = root
+            self._parent_of[run_id] = parent_run_id
+            self._open_span(run_id, root, self._span_parent(parent_run_id), "llm", "llm", {"model": model})
+
+    def _open_span(self, run_id: UUID, root: UUID, parent: Optional[UUID], name: str, kind: str, attributes: dict) -> None:
+        if kind == "agent":
+            attributes["peak_rss_start"] = _peak_rss()
+        self._spans[run_id] = {
+            "span_id": str(run_id),
+            "parent_id": str(parent) if parent is not None else None,
+            "name": name,
+            "kind": kind,
+            "start": time.time(),
+            "attributes": attributes,
+        }
+
+    def _span_parent(self, run_id: Optional[UUID]) -> Optional[UUID]:
+        # The nearest enclosing run that has a span (runs inside a node, e.g. chains, have none)
+        while run_id is not None and run_id not in self._spans:
+            run_id = self._parent_of.get(run_id)
+        return run_id
+
+    def _close(self, run_id: UUID, outputs: Any = None, error: Optional[BaseException] = None, **attributes: Any) -> None:
+        with self._lock:
+            root = self._run_of.pop(run_id, None)
+            span = self._spans.pop(run_id, None)
+            if span is None:
+                self._parent_of.pop(run_id, None)
+                return
+            span["end"] = time.time()
+            span["duration"] = span["end"] - span["start"]
+            span["attributes"].update(attributes)
+            if error is not None:
+                span["attributes"]["error"] = f"{type(error).__name__}: {error}"
+            start_rss = span["attributes"].pop("peak_rss_start", None)
+            if start_rss is not None:
+                span["attributes"]["peak_rss_delta"] = _peak_rss() - start_rss
+            if span["kind"] == "node":
+                span["attributes"]["data_out_bytes"] = _data_bytes(outputs)
+            if root is None or root not in self._active:
+                return
+            self._active[root].append(span)
+            if run_id == root:
+                self._runs.append(self._active.pop(root))
+                # Drop the bookkeeping of runs in this tree that never reported an end
+                for child, child_root in list(self._run_of.items()):
+                    if child_root == root:
+                        self._run_of.pop(child)
+                        self._spans.pop(child, None)
+                self._parent_of = {
+                    child: parent for child, parent in self._parent_of.items() if child in self._run_of
+                }
+
+
+@contextlib.contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[None]:
+    """
+    Times a block of work inside an agent node and records it as a "step" span of the run's
+    `AgentMetrics` (e.g. running the generated code). Outside an agent run this only runs the block.
+
+    Examples
+    --------
+    ``` python
+    with trace_span("agent_function"):
+        result = agent_function(df)
+    ```
+    """
+    start = time.time()
+    try:
+        yield
+    finally:
+        end = time.time()
+        try:
+            dispatch_custom_event(SPAN_EVENT, {"name": name, "start": start, "end": end, "attributes": attributes})
+        except Exception:
+            # No agent run in this context
+            pass
+
+
+def instrument_graph(app: Any) -> Any:
+    """
+    Attaches an `AgentMetrics` handler to a compiled agent graph, so every run of the graph is
+    traced, and returns the graph.
+    """
+    config = dict(app.config or {})
+    callbacks = list(config.get("callbacks") or [])
+    callbacks.append(AgentMetrics())
+    config["callbacks"] = callbacks
+    app.config = config
+    return app
+
+
+def get_graph_metrics(app: Any) -> Optional[AgentMetrics]:
+    """Returns the `AgentMetrics` handler attached to a compiled graph with `instrument_graph()`, or None."""
+    for callback in (getattr(app, "config", None) or {}).get("callbacks") or []:
+        if isinstance(callback, AgentMetrics):
+            return callback
+    return None
+
+
+def _token_usage(response: Any) -> Dict[str, int]:
+    input_tokens = output_tokens = 0
+    found = False
+    for generations in getattr(response, "generations", None) or []:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                found = True
+                input_tokens += usage.get("input_tokens") or 0
+                output_tokens += usage.get("output_tokens") or 0
+    if not found:
+        usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+        input_tokens = usage.get("prompt_tokens") or 0
+        output_tokens = usage.get("completion_tokens") or 0
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens}
+
+
+def _data_bytes(value: Any, depth: int = 0) -> int:
+    """
+    Approximate size of the datasets (DatasetHandles and DataFrames) in a node's input or output:
+    the state values and the items of list values. Deeper levels (e.g. datasets passed as nested
+    dicts) are not walked, to keep the cost per node small.
+    """
+    if isinstance(value, DatasetHandle):
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if depth >= 2:
+        return 0
+    if isinstance(value, dict):
+        return sum(_data_bytes(item, depth + 1) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_data_bytes(item, depth + 1) for item in value)
+    return 0
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of the process in bytes (0 where unavailable)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _otel_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        f"ai_ds_team.{key}": value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items()
+        if value is not None
+    }
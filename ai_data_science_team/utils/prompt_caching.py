@@ -0,0 +1,131 @@
+# BUSINESS SCIENCE UNIVERSITY
+# AI DATA SCIENCE TEAM
+# ***
+# Provider Prompt Caching
+
+import threading
+
+from typing import Any, Dict, List
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+
+# Anthropic accepts at most 4 cache breakpoints per request
+_MAX_CACHE_BREAKPOINTS = 4
+
+
+def supports_cache_control(llm: Any) -> bool:
+    """
+    Returns True if the chat model accepts explicit cache-control markers on message content
+    blocks (Anthropic models). Providers such as OpenAI cache repeated prompt prefixes
+    automatically and need no markers.
+    """
+    llm = getattr(llm, "bound", llm)
+    try:
+        llm_type = llm._llm_type
+    except Exception:
+        return False
+    return "anthropic" in str(llm_type).lower()
+
+
+def prefix_cached_messages(llm: Any, prefix: List[str], suffix: str) -> List[BaseMessage]:
+    """
+    Builds the messages of a prompt laid out for provider-side prefix caching: a system message
+    with the parts that stay the same across calls (`prefix`, e.g. the agent's instructions and
+    documentation, then the dataset summary), followed by a human message with the parts that
+    change between calls (`suffix`, e.g. the user instructions, the recommended steps or the
+    broken code and its error).
+
+    Providers reuse the cached prefix when consecutive requests start with identical content, so
+    the recommend, create and fix calls of an agent run, which share the prefix, are only billed
+    and processed once for it. For models that take explicit markers (see
+    `supports_cache_control()`), each prefix part is sent as a content block with an ephemeral
+    cache-control marker.
+
+    Parameters
+    ----------
+    llm : Any
+        The chat model the messages are sent to.
+    prefix : List[str]
+        The stable parts, most stable first. Empty parts are skipped.
+    suffix : str
+        The variable part.
+
+    Returns
+    -------
+    List[BaseMessage]
+        The system and human messages.
+    """
+    prefix = [part.strip() for part in prefix if part and part.strip()]
+    if supports_cache_control(llm):
+        blocks = [{"type": "text", "text": part} for part in prefix]
+        for block in blocks[-_MAX_CACHE_BREAKPOINTS:]:
+            block["cache_control"] = {"type": "ephemeral"}
+        system = SystemMessage(content=blocks)
+    else:
+        system = SystemMessage(content="\n\n".join(prefix))
+    return [system, HumanMessage(content=suffix.strip())]
+
+
+class PromptCacheUsage(BaseCallbackHandler):
+    """
+    A LangChain callback handler that adds up the prompt-cache usage the provider reports for
+    each model call, to measure how much of the agents' prompts is served from the cache.
+
+    The counts come from the `usage_metadata` of the model responses ("cache_read" and
+    "cache_creation" input token details), so they are only available for providers and
+    integrations that report them (e.g. OpenAI and Anthropic).
+
+    Examples
+    --------
+    ``` python
+    from ai_data_science_team.agents import DataCleaningAgent
+    from ai_data_science_team.utils.prompt_caching import PromptCacheUsage
+
+    usage = PromptCacheUsage()
+    agent = DataCleaningAgent(model=llm)
+    agent.invoke_agent(data_raw=df, config={"callbacks": [usage]})
+    usage.stats()
+    ```
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def on_llm_end(self, response: Any, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if not usage:
+                    continue
+                details = usage.get("input_token_details") or {}
+                with self._lock:
+                    self.calls += 1
+                    self.input_tokens += usage.get("input_tokens") or 0
+                    self.cache_read_tokens += details.get("cache_read") or 0
+                    self.cache_creation_tokens += details.get("cache_creation") or 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the number of model calls with usage data, their input tokens, the input tokens
+        read from and written to the prompt cache, and the share of input tokens read from the
+        cache ("cache_hit_rate").
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "input_tokens": self.input_tokens,
+                "cache_read_tokens": self.cache_read_tokens,
+                "cache_creation_tokens": self.cache_creation_tokens,
+                "cache_hit_rate": self.cache_read_tokens / self.input_tokens if self.input_tokens else None,
+            }
+
+    def reset(self) -> None:
+        """Resets the counters."""
+        with self._lock:
+            self.calls = 0
+            self.input_tokens = 0
+            self.cache_read_tokens = 0
+            self.cache_creation_tokens = 0
@@ -0,0 +1,467 @@
+# BUSINESS SCIENCE UNIVERSITY
+# AI DATA SCIENCE TEAM
+# ***
+# Sandboxed Code Execution
+
+import atexit
+import contextlib
+import contextvars
+import multiprocessing
+import os
+import pickle
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+import pandas as pd
+import psutil
+
+from typing import Any, Iterator, Optional
+
+from ai_data_science_team.utils.code_cache import load_agent_function
+from ai_data_science_team.utils.dataset import DatasetHandle, _arrow_roundtrips
+
+
+class SandboxExecutionError(Exception):
+    """
+    Raised when agent code fails inside a sandbox worker, including when the worker is stopped
+    for exceeding its time or memory limit.
+    """
+
+
+class SandboxExecutor:
+    """
+    A pool of pre-started worker processes that run LLM-generated agent functions out of process.
+
+    Each call sends the function source and a reference to the input data to an idle worker.
+    The worker defines the function, runs it, and sends the result back. Workers that exceed the
+    wall-clock or memory (RSS) limit are killed and replaced, so a runaway function cannot stall
+    the calling process. Workers are also recycled after a fixed number of tasks, so state leaked
+    by generated code (module globals, memory fragmentation) does not accumulate.
+
+    DataFrames are exchanged as Arrow IPC files in a memory-backed scratch directory (`/dev/shm`
+    when available), which both sides memory-map instead of pickling the data through a pipe.
+    DataFrame results can be returned as a `DatasetHandle` backed directly by the mapped file.
+    Frames Arrow cannot round-trip exactly (e.g. lists or dicts in cells), and pyarrow-less
+    installs, fall back to pickle files.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Number of worker processes. Defaults to the number of CPU cores.
+    timeout : float, optional
+        Wall-clock limit in seconds for a single call. None means no limit. Defaults to 60.
+    memory_limit_mb : int, optional
+        RSS limit in megabytes for a worker (including any processes it starts). None means no limit.
+    max_tasks_per_worker : int, optional
+        Number of calls after which a worker is replaced by a fresh process. Defaults to 50.
+    start_method : str, optional
+        The multiprocessing start method. Defaults to "forkserver" where available, else "spawn".
+        As with any multiprocessing code, scripts using these start methods must guard their entry
+        point with `if __name__ == "__main__":`.
+    scratch_dir : str, optional
+        Directory for data exchange files. Defaults to `/dev/shm` if it exists, else the system
+        temporary directory.
+
+    Examples
+    --------
+    ``` python
+    import pandas as pd
+    from ai_data_science_team.utils.sandbox import SandboxExecutor, set_default_executor
+
+    executor = SandboxExecutor(max_workers=4, timeout=120, memory_limit_mb=4096)
+
+    # Run all coding agents' generated functions in the sandbox
+    set_default_executor(executor)
+
+    # Or call it directly
+    code = "def data_cleaner(data_raw):\\n    return data_raw.dropna()"
+    executor.run(code, "data_cleaner", pd.DataFrame({"x": [1, None, 3]}))
+    ```
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = 60,
+        memory_limit_mb: Optional[int] = None,
+        max_tasks_per_worker: int = 50,
+        start_method: Optional[str] = None,
+        scratch_dir: Optional[str] = None,
+    ):
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        if scratch_dir is None:
+            scratch_dir = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self._context = multiprocessing.get_context(start_method)
+        self._scratch_dir = tempfile.mkdtemp(prefix="ai_ds_team_sandbox_", dir=scratch_dir)
+        self._idle = queue.Queue()
+        self._workers = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        for _ in range(self.max_workers):
+            self._idle.put(self._start_worker())
+        atexit.register(self.shutdown)
+
+    def run(self, code: str, function_name: str, data: Any, as_handle: bool = False) -> Any:
+        """
+        Defines `function_name` from `code` in a worker and calls it on `data`.
+
+        Parameters
+        ----------
+        code : str
+            Python source defining the function.
+        function_name : str
+            Name of the function to call.
+        data : Any
+            The argument. DataFrames (and lists of DataFrames) are passed through shared memory;
+            other values are pickled.
+        as_handle : bool, optional
+            If True, DataFrame results are returned as a `DatasetHandle` backed by the memory-mapped
+            result instead of being converted to pandas. Defaults to False.
+
+        Raises
+        ------
+        SandboxExecutionError
+            If the code fails to define the function, the function raises, or a limit is exceeded.
+        """
+        task = {"kind": "data", "code": code, "function_name": function_name}
+        task["data"], paths = _write_value(data, self._scratch_dir)
+        try:
+            return _read_value(self._submit(task), as_handle)
+        finally:
+            _remove_files(paths)
+
+    def run_sql(
+        self,
+        code: str,
+        function_name: str,
+        url: str,
+        as_handle: bool = False,
+        fetch_options: Optional[dict] = None,
+    ) -> Any:
+        """
+        Defines `function_name` from `code` in a worker and calls it on a SQLAlchemy connection
+        opened in the worker from the database `url`.
+
+        If `fetch_options` is given (keyword arguments of `ai_data_science_team.tools.sql.fetch_query_result`,
+        e.g. `{"chunksize": 10_000, "max_rows": 1_000_000}`), the result is fetched in chunks in
+        the worker and `(result, fetch_info)` is returned.
+
+        Raises
+        ------
+        SandboxExecutionError
+            If the code fails to define the function, the function raises, or a limit is exceeded.
+        """
+        task = {"kind": "sql", "code": code, "function_name": function_name, "url": url, "fetch_options": fetch_options}
+        return _read_value(self._submit(task), as_handle)
+
+    def shutdown(self) -> None:
+        """Stops all workers and removes the scratch directory."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        for worker in workers:
+            self._stop_worker(worker)
+        shutil.rmtree(self._scratch_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    # Workers
+
+    def _start_worker(self) -> "_Worker":
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main, args=(child_conn, self._scratch_dir), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        worker = _Worker(process, parent_conn)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _stop_worker(self, worker: "_Worker", kill: bool = False) -> None:
+        with self._lock:
+            self._workers.discard(worker)
+        if not kill:
+            try:
+                worker.conn.send(None)
+                worker.process.join(timeout=5)
+            except (OSError, EOFError, BrokenPipeError):
+                pass
+        if worker.process.is_alive():
+            _kill_process_tree(worker.process.pid)
+            worker.process.join(timeout=5)
+        worker.conn.close()
+
+    def _submit(self, task: dict) -> tuple:
+        if self._closed:
+            raise RuntimeError("The SandboxExecutor has been shut down.")
+        worker = self._idle.get()
+        try:
+            self._wait_ready(worker)
+            worker.conn.send(task)
+            response = self._wait(worker)
+        except BaseException:
+            # Timed out, over the memory limit, crashed or interrupted: replace the worker
+            self._stop_worker(worker, kill=True)
+            self._idle.put(self._start_worker())
+            raise
+
+        worker.tasks += 1
+        if worker.tasks >= self.max_tasks_per_worker:
+            self._stop_worker(worker)
+            worker = self._start_worker()
+        self._idle.put(worker)
+
+        if response[0] == "error":
+            raise SandboxExecutionError(response[1])
+        return response
+
+    def _wait_ready(self, worker: "_Worker") -> None:
+        # Workers import the package on startup; that time does not count against the task limits
+        if worker.ready:
+            return
+        if not worker.conn.poll(_WORKER_STARTUP_TIMEOUT) or worker.conn.recv() != "ready":
+            raise SandboxExecutionError("The sandbox worker failed to start.")
+        worker.ready = True
+
+    def _wait(self, worker: "_Worker") -> tuple:
+        start = time.monotonic()
+        memory_limit = self.memory_limit_mb * 1024 ** 2 if self.memory_limit_mb else None
+        while True:
+            if worker.conn.poll(0.05):
+                try:
+                    return worker.conn.recv()
+                except EOFError:
+                    raise SandboxExecutionError("The sandbox worker exited unexpectedly.")
+            if not worker.process.is_alive():
+                raise SandboxExecutionError(
+                    f"The sandbox worker exited unexpectedly (exit code {worker.process.exitcode})."
+                )
+            if self.timeout is not None and time.monotonic() - start > self.timeout:
+                raise SandboxExecutionError(f"Execution exceeded the time limit of {self.timeout} seconds.")
+            if memory_limit is not None and _process_tree_rss(worker.process.pid) > memory_limit:
+                raise SandboxExecutionError(f"Execution exceeded the memory limit of {self.memory_limit_mb} MB.")
+
+
+class _Worker:
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.tasks = 0
+        self.ready = False
+
+
+_WORKER_STARTUP_TIMEOUT = 120
+
+_default_executor = None
+
+# Set by use_executor(); takes precedence over the process-wide default in the current context
+_context_executor = contextvars.ContextVar("ai_ds_team_executor", default=None)
+
+
+def get_default_executor() -> Optional[SandboxExecutor]:
+    """
+    Returns the `SandboxExecutor` used by the agent execute nodes: the one set with
+    `use_executor()` in the current context, else the process-wide one, or None if agent code
+    runs in-process (the default).
+    """
+    return _context_executor.get() or _default_executor
+
+
+@contextlib.contextmanager
+def use_executor(executor: Optional[SandboxExecutor]) -> Iterator[Optional[SandboxExecutor]]:
+    """
+    Routes the agent execute nodes to `executor` within a `with` block, without changing the
+    process-wide default. The setting follows the context into asyncio tasks and into threads
+    started with `contextvars.copy_context()` (as LangGraph does for sync nodes), so concurrent
+    agent runs can each use a different executor.
+
+    Examples
+    --------
+    ``` python
+    from ai_data_science_team.utils.sandbox import SandboxExecutor, use_executor
+
+    with SandboxExecutor(max_workers=4) as executor, use_executor(executor):
+        data_cleaning_agent.invoke_agent(data_raw=df)
+    ```
+    """
+    token = _context_executor.set(executor)
+    try:
+        yield executor
+    finally:
+        _context_executor.reset(token)
+
+
+def set_default_executor(executor: Optional[SandboxExecutor]) -> None:
+    """
+    Sets the process-wide `SandboxExecutor` used by the agent execute nodes. Pass None to run
+    agent code in-process again.
+    """
+    global _default_executor
+    _default_executor = executor
+
+
+# Worker process
+
+def _worker_main(conn, scratch_dir: str) -> None:
+    conn.send("ready")
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        response = _run_task(task, scratch_dir)
+        try:
+            conn.send(response)
+        except Exception as e:
+            conn.send(("error", f"The result could not be returned from the sandbox: {e}"))
+
+
+def _run_task(task: dict, scratch_dir: str) -> tuple:
+    # Each worker keeps its own compiled code cache, so fix-loop retries of the same source skip exec
+    try:
+        agent_function = load_agent_function(task["code"], task["function_name"])
+    except Exception as e:
+        return ("error", f"{type(e).__name__}: {e}")
+
+    connection = None
+    try:
+        if task["kind"] == "sql":
+            import sqlalchemy as sql
+            connection = sql.create_engine(task["url"]).connect()
+            if task.get("fetch_options") is not None:
+                from ai_data_science_team.tools.sql import fetch_query_result
+
+                result, info = fetch_query_result(agent_function, connection, **task["fetch_options"])
+                value, _ = _write_value(result, scratch_dir)
+                return ("fetched", value, info)
+            result = agent_function(connection)
+        else:
+            result = agent_function(_read_value(task["data"], as_handle=False))
+        value, _ = _write_value(result, scratch_dir)
+        return value
+    except Exception as e:
+        return ("error", f"{type(e).__name__}: {e}")
+    finally:
+        if connection is not None:
+            connection.close()
+
+
+# Data exchange
+
+def _write_value(value: Any, directory: str):
+    """Returns a message describing `value` and the list of files written for it."""
+    if isinstance(value, DatasetHandle):
+        value = value.to_pandas()
+    if isinstance(value, pd.DataFrame):
+        path, encoding = _write_frame(value, directory)
+        return ("dataset", path, encoding), [path]
+    if isinstance(value, list) and value and all(isinstance(item, pd.DataFrame) for item in value):
+        files = [_write_frame(item, directory) for item in value]
+        return ("datasets", files), [path for path, _ in files]
+    return ("object", value), []
+
+
+def _read_value(message: tuple, as_handle: bool) -> Any:
+    kind = message[0]
+    if kind == "dataset":
+        handle = _read_frame(message[1], message[2])
+        return handle if as_handle else handle.to_pandas()
+    if kind == "datasets":
+        handles = [_read_frame(path, encoding) for path, encoding in message[1]]
+        return handles if as_handle else [handle.to_pandas() for handle in handles]
+    if kind == "fetched":
+        return _read_value(message[1], as_handle), message[2]
+    return message[1]
+
+
+def _write_frame(df: pd.DataFrame, directory: str):
+    path = os.path.join(directory, uuid.uuid4().hex)
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+
+        if not _arrow_roundtrips(df):
+            raise TypeError("Dataset has object columns Arrow would not round-trip.")
+        table = DatasetHandle(df).to_arrow()
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        return path, "arrow"
+    except Exception:
+        with open(path, "wb") as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path, "pickle"
+
+
+def _read_frame(path: str, encoding: str) -> DatasetHandle:
+    if encoding == "arrow":
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+
+        # The table references the mapped file directly; the mapping stays valid after the
+        # file is removed (on POSIX), and is released when the table is garbage collected.
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        handle = DatasetHandle(table)
+    else:
+        with open(path, "rb") as f:
+            handle = DatasetHandle(pickle.load(f))
+    _remove_files([path])
+    return handle
+
+
+def _remove_files(paths) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# Process monitoring
+
+def _process_tree_rss(pid: int) -> int:
+    try:
+        process = psutil.Process(pid)
+        rss = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return rss
+    except psutil.Error:
+        return 0
+
+
+def _kill_process_tree(pid: int) -> None:
+    try:
+        process = psutil.Process(pid)
+        children = process.children(recursive=True)
+    except psutil.Error:
+        return
+    for proc in children + [process]:
+        try:
+            proc.kill()
+        except psutil.Error:
+            pass
@@ -0,0 +1,351 @@
+# BUSINESS SCIENCE UNIVERSITY
+# AI DATA SCIENCE TEAM
+# ***
+# Chunked Execution Over Files
+
+import ast
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from typing import Any, Dict, Iterator, List, Optional
+
+from ai_data_science_team.utils.code_cache import load_agent_function
+from ai_data_science_team.utils.dataset import to_dataframe
+
+
+# Methods and functions whose result depends on rows outside the current chunk
+NON_ROW_LOCAL_OPERATIONS = {
+    # Deduplication
+    "drop_duplicates", "duplicated", "unique", "nunique", "value_counts",
+    # Aggregates (e.g. fillna(df.mean()), outlier bounds)
+    "mean", "median", "mode", "std", "var", "sem", "quantile", "sum", "prod", "min", "max",
+    "idxmin", "idxmax", "count", "describe", "corr", "cov", "skew", "kurt", "agg", "aggregate",
+    "nlargest", "nsmallest",
+    # Order- and neighbour-dependent steps
+    "sort_values", "sort_index", "rank", "shift", "diff", "pct_change", "cumsum", "cumprod",
+    "cummin", "cummax", "rolling", "expanding", "ewm", "interpolate", "ffill", "bfill",
+    "head", "tail", "sample", "iloc",
+    # Grouping, reshaping and encoders learned from the data
+    "groupby", "pivot", "pivot_table", "melt", "stack", "unstack", "transpose", "get_dummies",
+    "qcut", "fit", "fit_transform",
+}
+
+def detect_non_row_local_operations(code: str) -> List[str]:
+    """
+    Lists the operations in a code snippet whose result depends on rows outside the current
+    chunk (deduplication, aggregates used for imputation or scaling, sorting, shifting, grouping,
+    learned encoders), so applying the code chunk by chunk would change its result.
+
+    The check is a syntactic heuristic: it flags method calls and attribute accesses such as
+    `df.drop_duplicates()`, `df["x"].fillna(df["x"].mean())` or `pd.get_dummies(df)` by name.
+
+    Parameters
+    ----------
+    code : str
+        The Python source of the agent function.
+
+    Returns
+    -------
+    List[str]
+        The sorted names of the non-row-local operations found. Empty if the code looks row-local.
+    """
+    found = set()
+    for node in ast.walk(ast.parse(code)):
+        if isinstance(node, ast.Attribute) and node.attr in NON_ROW_LOCAL_OPERATIONS:
+            found.add(node.attr)
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in NON_ROW_LOCAL_OPERATIONS:
+            found.add(node.func.id)
+    return sorted(found)
+
+
+def read_file_sample(path: str, n_rows: int = 10_000, **read_kwargs) -> pd.DataFrame:
+    """
+    Reads the first `n_rows` rows of a CSV or Parquet file, e.g. to build the dataset summary an
+    agent's LLM sees without loading the full file.
+
+    Parameters
+    ----------
+    path : str
+        Path to a `.csv` or `.parquet` file.
+    n_rows : int, optional
+        Number of rows to read. Defaults to 10,000.
+    **read_kwargs
+        Passed to `pd.read_csv` for CSV files.
+
+    Returns
+    -------
+    pd.DataFrame
+        The sample.
+    """
+    return next(iter_file_chunks(path, chunk_size=n_rows, **read_kwargs), pd.DataFrame())
+
+
+def iter_file_chunks(path: str, chunk_size: int = 100_000, **read_kwargs) -> Iterator[pd.DataFrame]:
+    """
+    Iterates over a CSV or Parquet file in chunks of at most `chunk_size` rows.
+
+    Parquet files are read batch by batch within row groups, CSV files with `pd.read_csv(chunksize=...)`.
+    Each chunk has a RangeIndex continuing from the previous chunk, so row labels match the
+    labels the whole file would have.
+
+    Parameters
+    ----------
+    path : str
+        Path to a `.csv` or `.parquet` file.
+    chunk_size : int, optional
+        Maximum number of rows per chunk. Defaults to 100,000.
+    **read_kwargs
+        Passed to `pd.read_csv` for CSV files (e.g. `dtype=` to keep column types stable across
+        chunks).
+
+    Yields
+    ------
+    pd.DataFrame
+        The next chunk.
+    """
+    if _file_format(path) == "parquet":
+        pq = _import_parquet()
+        batches = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size))
+    else:
+        batches = pd.read_csv(path, chunksize=chunk_size, **read_kwargs)
+
+    offset = 0
+    for chunk in batches:
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+
+def stream_agent_function(
+    source: str,
+    output_path: str,
+    agent_code: str,
+    agent_function_name: str,
+    chunk_size: int = 100_000,
+    non_row_local: str = "raise",
+    executor: Optional[Any] = None,
+    **read_kwargs,
+) -> Dict[str, Any]:
+    """
+    Applies an agent function (e.g. a generated `data_cleaner` or `feature_engineer`) to a CSV or
+    Parquet file chunk by chunk, writing the results incrementally to a Parquet file, so inputs
+    larger than memory can be processed.
+
+    Chunked application is only equivalent to running the function on the whole file when the
+    function is row-local. The code is checked with `detect_non_row_local_operations()` first:
+
+    - If the only such operation is an argument-less `drop_duplicates()` whose result the
+      function returns (`return df.drop_duplicates()`, or `df = df.drop_duplicates()` followed by
+      `return df`), the file is streamed and result rows already written by earlier chunks are
+      dropped by tracking row hashes, so the output matches a global `drop_duplicates()`. One hash
+      per distinct output row is kept in memory. Any other `drop_duplicates` call (with `subset=`,
+      `keep=` or `inplace=`, or followed by more steps) is treated as not row-local.
+    - Otherwise `non_row_local` decides: "raise" (the default) raises a ValueError naming the
+      operations found, "fallback" warns and then loads the whole file to run the function once
+      in memory, and "stream" streams anyway, accepting per-chunk results (e.g. per-chunk means).
+
+    Parameters
+    ----------
+    source : str
+        Path to the input `.csv` or `.parquet` file.
+    output_path : str
+        Path of the Parquet file to write. The index is not written.
+    agent_code : str
+        The Python source defining the agent function.
+    agent_function_name : str
+        The name of the function to run. It must return a DataFrame.
+    chunk_size : int, optional
+        Rows per chunk. Defaults to 100,000.
+    non_row_local : str, optional
+        What to do when the code is not row-local: "raise" (default), "fallback" or "stream".
+    executor : SandboxExecutor, optional
+        Runs each chunk in a sandboxed worker process instead of in-process.
+    **read_kwargs
+        Passed to `pd.read_csv` for CSV sources.
+
+    Returns
+    -------
+    dict
+        Run statistics: "mode" ("streamed" or "in_memory"), "chunks", "rows_in", "rows_out",
+        "non_row_local_operations" and "output_path".
+
+    Raises
+    ------
+    ValueError
+        If the code is not row-local and `non_row_local="raise"`, or the function does not return
+        a DataFrame.
+
+    Warns
+    -----
+    UserWarning
+        If the code is not row-local and `non_row_local="fallback"`, before the whole file is
+        loaded into memory.
+
+    Examples
+    --------
+    ``` python
+    from ai_data_science_team.utils.streaming import stream_agent_function
+
+    code = open("logs/data_cleaner.py").read()
+    stream_agent_function("data/big.csv", "data/big_cleaned.parquet", code, "data_cleaner")
+    ```
+    """
+    if non_row_local not in ("fallback", "raise", "stream"):
+        raise ValueError("non_row_local must be one of 'fallback', 'raise' or 'stream'.")
+
+    operations = detect_non_row_local_operations(agent_code)
+    dedupe = "drop_duplicates" in operations and _returns_whole_row_dedupe(agent_code, agent_function_name)
+    blocking = [op for op in operations if not (dedupe and op == "drop_duplicates")]
+    stats = {
+        "mode": "streamed",
+        "chunks": 0,
+        "rows_in": 0,
+        "rows_out": 0,
+        "non_row_local_operations": operations,
+        "output_path": output_path,
+    }
+
+    if blocking and non_row_local == "raise":
+        raise ValueError(
+            f"The agent function is not row-local ({', '.join(blocking)}), so it cannot be applied chunk by chunk. "
+            "Pass non_row_local='fallback' to run it on the whole file in memory, or non_row_local='stream' "
+            "to accept per-chunk results."
+        )
+    if blocking and non_row_local == "fallback":
+        warnings.warn(
+            f"The agent function is not row-local ({', '.join(blocking)}); loading all of '{source}' "
+            "into memory to run it once.",
+            stacklevel=2,
+        )
+        chunks = list(iter_file_chunks(source, chunk_size=chunk_size, **read_kwargs))
+        df = pd.concat(chunks) if chunks else pd.DataFrame()
+        result = _apply(agent_code, agent_function_name, df, executor)
+        _write_parquet(result, output_path)
+        stats.update(mode="in_memory", chunks=1, rows_in=len(df), rows_out=len(result))
+        return stats
+
+    pq = _import_parquet()
+    seen_hashes = set()
+    writer = None
+    try:
+        for chunk in iter_file_chunks(source, chunk_size=chunk_size, **read_kwargs):
+            result = _apply(agent_code, agent_function_name, chunk, executor)
+            if dedupe and len(result):
+                hashes = pd.util.hash_pandas_object(result, index=False).to_numpy()
+                keep = ~pd.Series(hashes).isin(seen_hashes).to_numpy()
+                seen_hashes.update(np.unique(hashes[keep]).tolist())
+                result = result[keep]
+
+            table = _to_arrow_table(result, None if writer is None else writer.schema)
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, table.schema)
+            writer.write_table(table)
+            stats["chunks"] += 1
+            stats["rows_in"] += len(chunk)
+            stats["rows_out"] += len(result)
+    finally:
+        if writer is not None:
+            writer.close()
+    return stats
+
+
+def _returns_whole_row_dedupe(agent_code: str, agent_function_name: str) -> bool:
+    """
+    Whether the code's only `drop_duplicates` is an argument-less call whose result the agent
+    function returns. Only then does dropping rows already seen in earlier chunks reproduce a
+    global `drop_duplicates()`.
+    """
+    tree = ast.parse(agent_code)
+    calls = [
+        node for node in ast.walk(tree)
+        if isinstance(node, ast.Attribute) and node.attr == "drop_duplicates"
+    ]
+    if len(calls) != 1:
+        return False
+
+    def is_dedupe_call(node) -> bool:
+        return (
+            isinstance(node, ast.Call)
+            and node.func is calls[0]
+            and not node.args
+            and not node.keywords
+        )
+
+    functions = [
+        node for node in tree.body
+        if isinstance(node, ast.FunctionDef) and node.name == agent_function_name
+    ]
+    if not functions:
+        return False
+    body = functions[-1].body
+    if not body or not isinstance(body[-1], ast.Return) or body[-1].value is None:
+        return False
+
+    returned = body[-1].value
+    if is_dedupe_call(returned):
+        return True
+    # df = df.drop_duplicates(); return df
+    if isinstance(returned, ast.Name) and len(body) > 1:
+        previous = body[-2]
+        return (
+            isinstance(previous, ast.Assign)
+            and len(previous.targets) == 1
+            and isinstance(previous.targets[0], ast.Name)
+            and previous.targets[0].id == returned.id
+            and is_dedupe_call(previous.value)
+        )
+    return False
+
+
+def _apply(agent_code: str, agent_function_name: str, df: pd.DataFrame, executor: Optional[Any]) -> pd.DataFrame:
+    if executor is not None:
+        result = executor.run(agent_code, agent_function_name, df)
+    else:
+        result = load_agent_function(agent_code, agent_function_name)(df.copy())
+    if not isinstance(result, pd.DataFrame):
+        try:
+            result = to_dataframe(result)
+        except ValueError:
+            raise ValueError(f"The agent function '{agent_function_name}' must return a DataFrame to be written to Parquet.")
+    return result
+
+
+def _to_arrow_table(df: pd.DataFrame, schema=None):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if schema is None or table.schema.equals(schema):
+        return table
+    try:
+        return table.cast(schema)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError) as e:
+        raise ValueError(
+            "A chunk's result has different column types than the first chunk's. "
+            "For CSV sources, pass `dtype=` to fix the column types. "
+            f"Details: {e}"
+        )
+
+
+def _write_parquet(df: pd.DataFrame, output_path: str) -> None:
+    pq = _import_parquet()
+    pq.write_table(_to_arrow_table(df), output_path)
+
+
+def _file_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    if ext in (".csv", ".txt", ".gz", ".bz2", ".zip", ".xz"):
+        return "csv"
+    raise ValueError(f"Unsupported file type '{ext}'. Use a CSV or Parquet file.")
+
+
+def _import_parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Please install the 'pyarrow' package to stream Parquet files. pip install pyarrow")
+    return pq
@@ -20,6 +20,7 @@ from langchain_openai import ChatOpenAI
 from ai_data_science_team.ds_agents import EDAToolsAgent
 from ai_data_science_team.utils.matplotlib import matplotlib_from_base64
 from ai_data_science_team.utils.plotly import plotly_from_dict
+from ai_data_science_team.utils.dataset import to_dataset
 
 # =============================================================================
 # STREAMLIT APP SETUP (including data upload, API key, etc.)
@@ -217,9 +218,10 @@ def display_chat_history():
 # PROCESS AGENTS AND ARTIFACTS
 # =============================================================================
 
-def process_exploratory(question: str, llm, data: pd.DataFrame) -> dict:
+def process_exploratory(question: str, llm, data: pd.DataFrame, stream_placeholder=None) -> dict:
     """
     Initializes and calls the EDA agent using the provided question and data.
+    The agent's answer is streamed into `stream_placeholder` (if given) as it is generated.
     Processes any returned artifacts (plots, dataframes, etc.) and returns a result dict.
     """
     eda_agent = EDAToolsAgent(
@@ -229,10 +231,16 @@ def process_exploratory(question: str, llm, data: pd.DataFrame) -> dict:
     
     question += " Don't return hyperlinks to files in the response."
     
-    eda_agent.invoke_agent(
-        user_instructions=question,
-        data_raw=data,
-    )
+    streamed_text = ""
+    for event in eda_agent.stream_agent_events({
+        "user_instructions": question,
+        "data_raw": to_dataset(data),
+    }):
+        if stream_placeholder is not None and event.type == "token":
+            streamed_text += event.data
+            stream_placeholder.markdown(streamed_text)
+    if stream_placeholder is not None:
+        stream_placeholder.empty()
     
     tool_calls = eda_agent.get_tool_calls()
     ai_message = eda_agent.get_ai_message(markdown=False)
@@ -339,7 +347,8 @@ if st.session_state["DATA_RAW"] is not None:
             result = process_exploratory(
                 question, 
                 llm, 
-                st.session_state["DATA_RAW"]
+                st.session_state["DATA_RAW"],
+                stream_placeholder=st.empty(),
             )
             
             tool_name = None
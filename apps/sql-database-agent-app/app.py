@@ -135,11 +135,24 @@ sql_db_agent = SQLDatabaseAgent(
     bypass_recommended_steps=True,
 )
 
-# Handle the question async
-async def handle_question(question):
-    await sql_db_agent.ainvoke_agent(
-        user_instructions=question,
-    )
+# Handle the question async, streaming the agent's progress and the generated SQL as it is written
+async def handle_question(question, status_placeholder, stream_placeholder):
+    streamed_text = ""
+    async for event in sql_db_agent.astream_agent_events({
+        "user_instructions": question,
+        "max_retries": 3,
+        "retry_count": 0,
+    }):
+        if event.type == "node_start" and not event.namespace:
+            status_placeholder.caption(f"Running: {event.node}")
+        elif event.type == "retry":
+            streamed_text = ""
+            status_placeholder.caption("Fixing the generated code...")
+        elif event.type == "token":
+            streamed_text += event.data
+            stream_placeholder.markdown(streamed_text)
+    status_placeholder.empty()
+    stream_placeholder.empty()
     return sql_db_agent
 
 
@@ -158,7 +171,7 @@ if st.session_state["PATH_DB"] and (question := st.chat_input("Enter your questi
         error_occured = False
         try: 
             print(st.session_state["PATH_DB"])
-            result = asyncio.run(handle_question(question))
+            result = asyncio.run(handle_question(question, st.empty(), st.empty()))
         except Exception as e:
             error_occured = True
             print(e)
@@ -28,7 +28,8 @@ setup(
     extras_require={
         "machine_learning": ["h2o", "mlflow"],
         "data_science": ["pytimetk", "missingno", "sweetviz"],
-        "all": ["h2o", "mlflow", "pytimetk", "missingno","sweetviz"],
+        "async_sql": ["sqlalchemy[asyncio]", "aiosqlite"],
+        "all": ["h2o", "mlflow", "pytimetk", "missingno","sweetviz", "sqlalchemy[asyncio]", "aiosqlite"],
     },
     python_requires=">=3.9",
     classifiers=[
@@ -0,0 +1,41 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from ai_data_science_team.tools.dataframe import get_dataframe_summary
+
+
+def test_approximate_summary_counts_dict_cells():
+    # More than 100,000 rows, so the approximate (HyperLogLog) path is used
+    n_rows = 150_000
+    df = pd.DataFrame({
+        "id": np.arange(n_rows) % 7,
+        "payload": pd.Series([{"k": i % 5} for i in range(n_rows)], dtype=object),
+    })
+
+    summary = get_dataframe_summary(df, approximate=True)[0]
+
+    assert "payload: ~5" in summary
+    assert "{'k': " in summary
+
+
+def test_approximate_summary_is_not_slower_than_exact():
+    n_rows = 1_000_000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "timestamp": pd.date_range("2020-01-01", periods=n_rows, freq="s", tz="UTC"),
+        "segment": pd.Categorical(rng.choice(["a", "b", "c", "d"], n_rows)),
+        "label": pd.Series(rng.choice(["x", "y", "z"], n_rows), dtype=object),
+        "value": rng.random(n_rows),
+    })
+
+    def best_time(approximate):
+        times = []
+        for _ in range(3):
+            start = time.perf_counter()
+            get_dataframe_summary(df, approximate=approximate, use_cache=False)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    assert best_time(approximate=True) <= best_time(approximate=False)